@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
+from beta.timing import TimedSerializerMixin
 from characters.serializers import UserProfileCharacterSerializer
 
 User = get_user_model()
@@ -93,7 +94,7 @@ class DeactivateAccountSerializer(serializers.Serializer):
 
 
 # 타인 프로필 조회
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     profile_picture = serializers.ImageField(required=False)
     characters = serializers.SerializerMethodField()
 
@@ -0,0 +1,96 @@
+# Python Library
+import logging
+
+# Third-Party Packages
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+# Local Apps
+from .timing import RequestTimings, current_timings, install_query_recorder
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+# 요청마다 DB 쿼리 수/시간, LLM 호출 시간, 직렬화/렌더링 시간을 집계해 Server-Timing 헤더로 내보내고
+# 뷰별 쿼리 예산(QUERY_BUDGETS, 없으면 QUERY_BUDGET_DEFAULT)을 넘으면 경고를 남깁니다.
+# QUERY_BUDGET_STRICT 이면 경고 대신 QueryBudgetExceeded 를 발생시킵니다. (테스트용)
+# 스트리밍 응답은 본문을 보내기 전까지의 값만 헤더에 포함됩니다.
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+        # 미들웨어가 로드되기 전에 열린 연결에도 쿼리 기록기를 등록합니다.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.process_response(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.process_response(request, response, timings)
+
+    def get_view_name(self, request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return None
+
+        view = getattr(match.func, "view_class", match.func)
+        return f"{view.__module__}.{view.__name__}"
+
+    def get_budget(self, view_name):
+        return settings.QUERY_BUDGETS.get(view_name, settings.QUERY_BUDGET_DEFAULT)
+
+    def process_response(self, request, response, timings):
+        total = timings.elapsed()
+        queries = timings.counts.get("db", 0)
+
+        if settings.SERVER_TIMING:
+            entries = [
+                f'db;dur={timings.durations.get("db", 0) * 1000:.1f};desc="{queries} queries"'
+            ]
+            for name in ("llm", "serialize", "render"):
+                if name in timings.durations:
+                    entries.append(f"{name};dur={timings.durations[name] * 1000:.1f}")
+            entries.append(f"total;dur={total * 1000:.1f}")
+            response["Server-Timing"] = ", ".join(entries)
+
+        view_name = self.get_view_name(request)
+        budget = self.get_budget(view_name)
+
+        if budget and queries > budget:
+            message = (
+                f"쿼리 예산 초과: {request.method} {request.path} ({view_name}) "
+                f"{queries}개 쿼리 / 예산 {budget}개"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
@@ -89,6 +89,10 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "beta.timing.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 
@@ -102,6 +106,7 @@ SIMPLE_JWT = {
 
 
 MIDDLEWARE = [
+    "beta.middleware.QueryBudgetMiddleware",  # 쿼리 예산 + Server-Timing
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -148,6 +153,10 @@ DATABASES = {
     }
 }
 
+# Cache
+# 워커 프로세스가 여러 개라면 redis 등 공유 캐시를 CACHE_URL로 지정해야 합니다.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
 AUTH_USER_MODEL = "accounts.User"
 
 # Password validation
@@ -217,13 +226,118 @@ SPECTACULAR_SETTINGS = {
 }
 
 # LLM
+# gemini: Google Gemini API, fake: 부하/지연 테스트용 로컬 모델 (rooms.fake_llm)
+LLM_BACKEND = env("LLM_BACKEND", default="gemini")
+FAKE_LLM = {
+    # fixed | uniform | lognormal
+    "latency": env("FAKE_LLM_LATENCY", default="fixed"),
+    "latency_ms": env.float("FAKE_LLM_LATENCY_MS", default=200.0),
+    "jitter_ms": env.float("FAKE_LLM_JITTER_MS", default=0.0),
+    "tokens_per_second": env.float("FAKE_LLM_TOKENS_PER_SECOND", default=50.0),
+    "reply_tokens": env.int("FAKE_LLM_REPLY_TOKENS", default=40),
+    "error_rate": env.float("FAKE_LLM_ERROR_RATE", default=0.0),
+    "seed": env.int("FAKE_LLM_SEED", default=0),
+    # 캐시되지 않은 입력 토큰 1000개당 첫 토큰 지연(ms)
+    "prefill_ms_per_1k_tokens": env.float("FAKE_LLM_PREFILL_MS_PER_1K", default=0.0),
+}
 GOOGLE_API_KEY = env("GOOGLE_API_KEY")
 AI_MODEL = env("AI_MODEL")
 CONVERSATION_HISTORY_LIMIT = int(env("CONVERSATION_HISTORY_LIMIT"))
+# 0보다 크면 메시지 개수 대신 토큰 예산(시스템 프롬프트 포함)으로 대화 내역을 자릅니다.
+CONVERSATION_TOKEN_BUDGET = env.int("CONVERSATION_TOKEN_BUDGET", default=0)
 VERBOSE = env("VERBOSE")
+# lean: 대화 내역 메시지를 바로 만들어 모델 호출, langchain: ConversationBufferWindowMemory + LLMChain (VERBOSE 로그는 langchain 에서만 출력)
+PROMPT_ASSEMBLY = env("PROMPT_ASSEMBLY", default="lean")
 TEMPERATURE = env("TEMPERATURE")
 MAX_TOKENS = env("MAX_TOKENS")
 SUGGESTIONS = int(env("SUGGESTIONS"))
+# inline: 요청 안에서 응답 생성, queue: 작업을 등록하고 run_generation_worker가 생성
+CHAT_GENERATION_MODE = env("CHAT_GENERATION_MODE", default="inline")
+# 윈도우 밖으로 밀려난 대화를 요약해 프롬프트 앞에 추가
+CONVERSATION_SUMMARY = env.bool("CONVERSATION_SUMMARY", default=False)
+# 요약되지 않은 메시지가 이 개수 이상 쌓이면 백그라운드에서 요약을 갱신
+CONVERSATION_SUMMARY_MIN_MESSAGES = env.int(
+    "CONVERSATION_SUMMARY_MIN_MESSAGES", default=10
+)
+CONVERSATION_SUMMARY_MAX_TOKENS = env.int(
+    "CONVERSATION_SUMMARY_MAX_TOKENS", default=500
+)
+# 한 번의 요약 호출에 넣는 새 대화의 최대 토큰 수 (넘으면 오래된 메시지부터 나눠서 요약)
+CONVERSATION_SUMMARY_CHUNK_TOKENS = env.int(
+    "CONVERSATION_SUMMARY_CHUNK_TOKENS", default=4000
+)
+# 백그라운드 작업(요약 등) 스레드 수
+BACKGROUND_WORKERS = env.int("BACKGROUND_WORKERS", default=2)
+# 채팅방별 최근 대화 윈도우 캐시
+CONVERSATION_WINDOW_CACHE = env.bool("CONVERSATION_WINDOW_CACHE", default=True)
+CONVERSATION_WINDOW_CACHE_TIMEOUT = env.int(
+    "CONVERSATION_WINDOW_CACHE_TIMEOUT", default=60 * 60
+)
+# 캐릭터 프롬프트 LRU 캐시 크기 (프로세스 단위)
+PROMPT_CACHE_SIZE = env.int("PROMPT_CACHE_SIZE", default=256)
+# 긴 시스템 프롬프트를 모델 제공자의 컨텍스트 캐시(Gemini cached content)에 등록해 재사용 (lean 조립 방식에서만 사용)
+# Gemini는 버전이 명시된 모델(AI_MODEL)과 모델별 최소 토큰 수가 필요합니다.
+CONTEXT_CACHE = env.bool("CONTEXT_CACHE", default=False)
+# 시스템 프롬프트 추정 토큰 수가 이 값 이상인 캐릭터만 등록
+CONTEXT_CACHE_MIN_TOKENS = env.int("CONTEXT_CACHE_MIN_TOKENS", default=4096)
+# 마지막 사용(연장) 후 만료까지의 시간(초)
+CONTEXT_CACHE_TTL = env.int("CONTEXT_CACHE_TTL", default=10 * 60)
+# batch: 한 번의 호출로 추천 답변 N개 생성, concurrent: N번의 호출을 동시에 실행
+SUGGESTION_MODE = env("SUGGESTION_MODE", default="batch")
+# AI 응답 직후 추천 답변을 미리 생성 (추가 LLM 호출 발생), 저장 시간(초)
+SUGGESTION_PREFETCH = env.bool("SUGGESTION_PREFETCH", default=False)
+SUGGESTION_PREFETCH_TIMEOUT = env.int("SUGGESTION_PREFETCH_TIMEOUT", default=10 * 60)
+
+# 채팅방 상세 조회 시 한 번에 반환하는 메시지 개수 (기본/최대)
+ROOM_CHATS_PAGE_SIZE = env.int("ROOM_CHATS_PAGE_SIZE", default=50)
+ROOM_CHATS_MAX_PAGE_SIZE = env.int("ROOM_CHATS_MAX_PAGE_SIZE", default=200)
+
+# 채팅방 목록 조회 시 한 번에 반환하는 채팅방 개수 (기본/최대)
+ROOMS_PAGE_SIZE = env.int("ROOMS_PAGE_SIZE", default=30)
+ROOMS_MAX_PAGE_SIZE = env.int("ROOMS_MAX_PAGE_SIZE", default=100)
+
+# 대화 내역 불러오기 시 한 번의 INSERT 로 저장하는 메시지 개수
+HISTORY_LOAD_BATCH_SIZE = env.int("HISTORY_LOAD_BATCH_SIZE", default=1000)
+
+# 요청당 DB 쿼리 예산 (0이면 검사하지 않음)
+QUERY_BUDGET_DEFAULT = env.int("QUERY_BUDGET_DEFAULT", default=50)
+# 뷰별 예산, 예: {"rooms.views.RoomDetailAPIView": 10}
+QUERY_BUDGETS = {}
+# 예산 초과 시 경고 대신 예외 발생 (테스트용)
+QUERY_BUDGET_STRICT = env.bool("QUERY_BUDGET_STRICT", default=False)
+# 응답에 Server-Timing 헤더(db/llm/serialize/render/total) 추가
+SERVER_TIMING = env.bool("SERVER_TIMING", default=DEBUG)
+
+# LLM 호출 마감 시간(초), 0이면 제한 없음 (stream은 첫 응답 조각까지의 시간)
+LLM_DEADLINES = {
+    "chat": env.float("LLM_DEADLINE_CHAT", default=25.0),
+    "regenerate": env.float("LLM_DEADLINE_REGENERATE", default=25.0),
+    "suggestion": env.float("LLM_DEADLINE_SUGGESTION", default=15.0),
+    "stream": env.float("LLM_DEADLINE_STREAM", default=15.0),
+}
+# Gemini 클라이언트 요청 timeout/재시도 횟수
+LLM_REQUEST_TIMEOUT = env.float("LLM_REQUEST_TIMEOUT", default=60.0)
+LLM_MAX_RETRIES = env.int("LLM_MAX_RETRIES", default=2)
+# 응답이 최근 p95 지연보다 늦어지면 같은 요청을 한 번 더 보냄 (호출 비용 증가)
+LLM_HEDGING = env.bool("LLM_HEDGING", default=False)
+# p95를 계산할 표본이 LLM_HEDGE_MIN_SAMPLES 개보다 적을 때 사용할 헤징 지연(초)
+LLM_HEDGE_DELAY = env.float("LLM_HEDGE_DELAY", default=3.0)
+LLM_HEDGE_MIN_SAMPLES = env.int("LLM_HEDGE_MIN_SAMPLES", default=20)
+# 연속 실패가 이 횟수 이상이면 LLM_CIRCUIT_RESET 초 동안 바로 실패 (0이면 사용하지 않음)
+LLM_CIRCUIT_FAILURES = env.int("LLM_CIRCUIT_FAILURES", default=5)
+LLM_CIRCUIT_RESET = env.int("LLM_CIRCUIT_RESET", default=30)
+
+# LLM 엔드포인트 동시 요청 제한 (워커 프로세스 단위, 0이면 제한 없음)
+LLM_USER_CONCURRENCY = env.int("LLM_USER_CONCURRENCY", default=2)
+LLM_GLOBAL_CONCURRENCY = env.int("LLM_GLOBAL_CONCURRENCY", default=32)
+# 전체 한도가 찼을 때 기다릴 수 있는 요청 수와 대기 시간(초)
+LLM_ADMISSION_QUEUE = env.int("LLM_ADMISSION_QUEUE", default=64)
+LLM_ADMISSION_TIMEOUT = env.float("LLM_ADMISSION_TIMEOUT", default=10.0)
+# 대기 중인 요청이 빈 슬롯을 다시 확인하는 간격(초)
+# 다른 이벤트 루프(WSGI, async_to_sync)에서 반환된 슬롯은 알림을 받지 못하므로 이 간격마다 확인합니다.
+LLM_ADMISSION_POLL_INTERVAL = env.float("LLM_ADMISSION_POLL_INTERVAL", default=0.05)
+# 거절 응답의 Retry-After(초)
+LLM_ADMISSION_RETRY_AFTER = env.int("LLM_ADMISSION_RETRY_AFTER", default=2)
 
 # 소셜 로그인 설정
 SOCIALACCOUNT_PROVIDERS = {
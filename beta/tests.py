@@ -0,0 +1,94 @@
+# Third-Party Packages
+from django.test import TestCase, override_settings
+from django.urls import path
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+
+# Local Apps
+from accounts.models import User
+from characters.models import Character
+from rooms.models import Room
+from rooms.serializers import RoomSerializer
+from .middleware import QueryBudgetExceeded
+from .timing import RequestTimings, TimedListSerializer, current_timings
+
+
+# 채팅방마다 캐릭터를 따로 조회하는 (N+1) 뷰
+class RoomNPlusOneView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(RoomSerializer(Room.objects.all(), many=True).data)
+
+
+class RoomSelectRelatedView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        rooms = Room.objects.select_related("character")
+        return Response(RoomSerializer(rooms, many=True).data)
+
+
+urlpatterns = [
+    path("n-plus-one/", RoomNPlusOneView.as_view()),
+    path("select-related/", RoomSelectRelatedView.as_view()),
+]
+
+
+@override_settings(
+    ROOT_URLCONF="beta.tests",
+    QUERY_BUDGET_DEFAULT=3,
+    QUERY_BUDGETS={},
+    QUERY_BUDGET_STRICT=True,
+    SERVER_TIMING=True,
+)
+class QueryBudgetMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="tester")
+        for i in range(5):
+            character = Character.objects.create(
+                user=user, title=f"테스트{i}", name=f"테스터{i}", intro=[]
+            )
+            Room.objects.create(user=user, character=character)
+
+    def test_strict_mode_fails_n_plus_one_endpoint(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/n-plus-one/")
+
+    def test_strict_mode_passes_within_budget(self):
+        response = self.client.get("/select-related/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_server_timing_includes_serializer_and_render(self):
+        with override_settings(QUERY_BUDGET_STRICT=False):
+            response = self.client.get("/n-plus-one/")
+
+        timing = response["Server-Timing"]
+        self.assertIn('desc="6 queries"', timing)
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("render;dur=", timing)
+
+    def test_serializer_timing_does_not_patch_drf(self):
+        self.client.get("/select-related/")
+
+        self.assertEqual(
+            BaseSerializer.data.fget.__module__, "rest_framework.serializers"
+        )
+        self.assertIsInstance(
+            RoomSerializer(Room.objects.all(), many=True), TimedListSerializer
+        )
+
+    def test_nested_serializers_are_recorded_once(self):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        try:
+            RoomSerializer(Room.objects.select_related("character"), many=True).data
+        finally:
+            current_timings.reset(token)
+
+        self.assertEqual(timings.counts["serialize"], 1)
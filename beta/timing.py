@@ -0,0 +1,97 @@
+# Python Library
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Third-Party Packages
+from django.db.backends.signals import connection_created
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer
+
+# 현재 요청의 구간별 소요 시간 (QueryBudgetMiddleware 가 요청마다 설정합니다.)
+# sync_to_async 로 실행되는 ORM 호출에도 컨텍스트가 전달되므로 비동기 뷰의 쿼리도 함께 집계됩니다.
+current_timings = ContextVar("current_timings", default=None)
+# 시리얼라이저 평가 중인지 여부 (중첩된 serializer.data 는 바깥 구간에 포함되므로 따로 기록하지 않습니다.)
+serializing = ContextVar("serializing", default=False)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def record_timing(name, duration):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(name, duration)
+
+
+# 모든 DB 연결에 등록되는 execute wrapper
+def record_query(execute, sql, params, many, context):
+    if current_timings.get() is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_timing("db", time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+@contextmanager
+def timed(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - started)
+
+
+# serializer.data 평가 시간 (to_representation, 지연 로딩되는 관계 조회 포함)
+# N+1 쿼리는 대부분 여기서 실행되므로 렌더링과 따로 "serialize" 구간으로 기록합니다.
+# 응답을 만드는 시리얼라이저에 섞어서 사용하며, many=True 이면 TimedListSerializer 로 감쌉니다.
+class TimedSerializerMixin:
+    @property
+    def data(self):
+        if current_timings.get() is None or serializing.get():
+            return super().data
+
+        token = serializing.set(True)
+        try:
+            with timed("serialize"):
+                return super().data
+        finally:
+            serializing.reset(token)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs["child"] = cls()
+        return TimedListSerializer(*args, **kwargs)
+
+
+class TimedListSerializer(TimedSerializerMixin, ListSerializer):
+    pass
+
+
+# 응답 JSON 렌더링 시간을 기록하는 렌더러
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("render"):
+            return super().render(data, accepted_media_type, renderer_context)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from beta.timing import TimedSerializerMixin
 from .models import Character, Hashtag
 import json
 
@@ -30,7 +31,7 @@ class CharacterExSituation(serializers.Serializer):
 
 
 # 캐릭터 기본 정보
-class CharacterBaseSerializer(serializers.ModelSerializer):
+class CharacterBaseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     intro = serializers.ListField(
         child=CharacterIntroSerializer(),
         allow_empty=False,
@@ -1,8 +1,10 @@
 # 워커 수
 workers = 1
 
-# 워커 타입: 기본 sync (메모리 절약)
-worker_class = "sync"
+# 워커 타입: ASGI(uvicorn) 워커
+# LLM 호출을 기다리는 동안 이벤트 루프가 다른 요청을 처리하므로
+# 하나의 워커로 여러 대화를 동시에 처리할 수 있습니다. (beta.asgi:application 으로 실행)
+worker_class = "uvicorn_worker.UvicornWorker"
 
 # 한 워커당 처리할 최대 요청 수 (메모리 누수 방지, 너무 작게 하면 오버헤드 발생 위험험)
 max_requests = 1200
@@ -0,0 +1,205 @@
+# Python Library
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+
+# Third-Party Packages
+from django.conf import settings
+
+# Local Apps
+from .metrics import SECONDS_BUCKETS, metrics
+
+admission_decisions = metrics.counter(
+    "beta_llm_admission_total",
+    "LLM 엔드포인트 요청 허용/거절 횟수",
+    ("result",),
+)
+admission_wait = metrics.histogram(
+    "beta_llm_admission_wait_seconds",
+    "대기열에서 LLM 호출 슬롯을 기다린 시간",
+    SECONDS_BUCKETS,
+)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, message, status_code, retry_after):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# LLM을 호출하는 요청의 동시 실행 수를 사용자별(LLM_USER_CONCURRENCY), 전체(LLM_GLOBAL_CONCURRENCY)로 제한합니다.
+# 전체 한도가 차면 최대 LLM_ADMISSION_QUEUE 개까지 LLM_ADMISSION_TIMEOUT 초 동안 기다리고,
+# 사용자 한도를 넘으면 429, 대기열이 가득 차거나 대기 시간이 지나면 503으로 거절합니다.
+# 카운터는 워커 프로세스 단위입니다.
+# 대기 알림은 이벤트 루프마다 따로 보내므로, 다른 루프에서 반환된 슬롯은 LLM_ADMISSION_POLL_INTERVAL 마다 다시 확인합니다.
+class AdmissionController:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conditions = weakref.WeakKeyDictionary()
+        self.in_flight = 0
+        self.waiting = 0
+        self.per_user = {}
+
+    def get_condition(self):
+        # asyncio.Condition 은 이벤트 루프에 묶이므로 루프마다 따로 만듭니다.
+        loop = asyncio.get_running_loop()
+        condition = self._conditions.get(loop)
+        if condition is None:
+            condition = self._conditions[loop] = asyncio.Condition()
+        return condition
+
+    def reject(self, reason, message, status_code):
+        admission_decisions.inc(result=reason)
+        raise AdmissionRejected(
+            message, status_code, settings.LLM_ADMISSION_RETRY_AFTER
+        )
+
+    # 전체 한도보다 큰 요청도 한도만큼만 차지하도록 합니다.
+    def get_cost(self, cost):
+        limit = settings.LLM_GLOBAL_CONCURRENCY
+        return min(cost, limit) if limit else cost
+
+    def has_capacity(self, cost):
+        limit = settings.LLM_GLOBAL_CONCURRENCY
+        return not limit or self.in_flight + cost <= limit
+
+    async def acquire(self, user_id, cost=1):
+        cost = self.get_cost(cost)
+
+        with self._lock:
+            used = self.per_user.get(user_id, 0)
+            user_limit = settings.LLM_USER_CONCURRENCY
+            if user_limit and used + min(cost, user_limit) > user_limit:
+                self.reject(
+                    "user_limit",
+                    "동시에 처리할 수 있는 요청 수를 초과했습니다.",
+                    429,
+                )
+
+            # 대기 중인 요청도 사용자 한도에 포함합니다.
+            self.per_user[user_id] = used + cost
+
+            if self.has_capacity(cost):
+                self.in_flight += cost
+                admission_decisions.inc(result="admitted")
+                return
+
+            if self.waiting >= settings.LLM_ADMISSION_QUEUE:
+                self.decrement_user(user_id, cost)
+                self.reject("queue_full", "요청이 많아 처리할 수 없습니다.", 503)
+
+            self.waiting += 1
+
+        started = time.monotonic()
+        deadline = started + settings.LLM_ADMISSION_TIMEOUT
+        condition = self.get_condition()
+        reserve = self.try_reserve(cost)
+
+        try:
+            async with condition:
+                while not reserve():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+
+                    # 같은 루프의 release() 알림이나 확인 간격 중 먼저 오는 쪽에서 다시 확인합니다.
+                    try:
+                        await asyncio.wait_for(
+                            condition.wait(),
+                            min(remaining, settings.LLM_ADMISSION_POLL_INTERVAL),
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        except asyncio.TimeoutError:
+            self.release_user(user_id, cost)
+            self.reject("queue_timeout", "요청이 많아 처리할 수 없습니다.", 503)
+        except BaseException:
+            self.release_user(user_id, cost)
+            raise
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        admission_wait.observe(time.monotonic() - started)
+        admission_decisions.inc(result="admitted")
+
+    # 추측 실행(추천 답변 미리 생성 등)은 기다리지 않고 여유가 있을 때만 실행합니다.
+    # 사용자 한도에는 포함하지 않으며 release(None, cost) 로 반환합니다.
+    def try_acquire(self, cost=1):
+        cost = self.get_cost(cost)
+
+        with self._lock:
+            if self.waiting or not self.has_capacity(cost):
+                admission_decisions.inc(result="speculative_skipped")
+                return False
+            self.in_flight += cost
+
+        admission_decisions.inc(result="speculative")
+        return True
+
+    def try_reserve(self, cost):
+        def predicate():
+            with self._lock:
+                if not self.has_capacity(cost):
+                    return False
+                self.in_flight += cost
+                return True
+
+        return predicate
+
+    # self._lock 을 잡은 상태에서 호출합니다.
+    def decrement_user(self, user_id, cost):
+        remaining = self.per_user.get(user_id, 0) - cost
+        if remaining > 0:
+            self.per_user[user_id] = remaining
+        else:
+            self.per_user.pop(user_id, None)
+
+    def release_user(self, user_id, cost):
+        with self._lock:
+            self.decrement_user(user_id, cost)
+
+    async def release(self, user_id, cost=1):
+        cost = self.get_cost(cost)
+
+        with self._lock:
+            self.in_flight -= cost
+        self.release_user(user_id, cost)
+
+        condition = self.get_condition()
+        async with condition:
+            condition.notify_all()
+
+    @asynccontextmanager
+    async def admit(self, user_id, cost=1):
+        await self.acquire(user_id, cost)
+        try:
+            yield
+        finally:
+            await self.release(user_id, cost)
+
+
+admission = AdmissionController()
+
+
+def collect_admission_state():
+    return [
+        (
+            "beta_llm_admission_in_flight",
+            "현재 실행 중인 LLM 요청 수",
+            "gauge",
+            {(): admission.in_flight},
+        ),
+        (
+            "beta_llm_admission_waiting",
+            "대기열에서 기다리는 LLM 요청 수",
+            "gauge",
+            {(): admission.waiting},
+        ),
+    ]
+
+
+metrics.register_collector(collect_admission_state)
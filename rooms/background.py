@@ -0,0 +1,74 @@
+# Python Library
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-Party Packages
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+def get_executor():
+    global _executor, _executor_pid
+
+    # fork 된 자식 프로세스에서는 부모의 스레드 풀을 사용할 수 없으므로 새로 만듭니다.
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_WORKERS,
+                thread_name_prefix="rooms-background",
+            )
+            _executor_pid = os.getpid()
+
+        return _executor
+
+
+# 응답을 반환한 뒤에 처리해도 되는 작업(요약 등)을 프로세스 내 스레드 풀에서 실행합니다.
+def run_in_background(func, *args, **kwargs):
+    def task():
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"백그라운드 작업 오류 ({func.__name__}): {e}")
+        finally:
+            # 작업 스레드가 가진 DB 커넥션은 작업이 끝나면 바로 반환합니다.
+            connections.close_all()
+
+    return get_executor().submit(task)
+
+
+_tasks = set()
+
+
+# 요청 처리 중인 이벤트 루프에서 응답과 별개로 실행할 비동기 작업(추천 답변 미리 생성 등)을 시작합니다.
+# LLM 비동기 클라이언트가 같은 이벤트 루프를 사용하도록 스레드 풀 대신 현재 루프에서 실행합니다.
+# 실행 중인 이벤트 루프가 없으면 (동기 코드) 작업을 시작하지 않고 None 을 반환합니다.
+def create_background_task(coro):
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        logger.warning(
+            "실행 중인 이벤트 루프가 없어 백그라운드 작업을 시작하지 않습니다."
+        )
+        return None
+
+    task = loop.create_task(coro)
+    _tasks.add(task)
+
+    def done(task):
+        _tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"백그라운드 작업 오류: {task.exception()}")
+
+    task.add_done_callback(done)
+    return task
@@ -0,0 +1,257 @@
+# Python Library
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+# Third-Party Packages
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Local Apps
+from accounts.models import User
+from characters.models import Character, Hashtag
+from .models import Chat, Room
+from .tokens import estimate_tokens
+
+BENCH_PASSWORD = "benchmark-password"
+
+USER_LINES = [
+    "오늘 하루는 어땠어?",
+    "*창밖을 바라보며* 비가 오네.",
+    "그 이야기 더 해줘.",
+    "정말? 그 다음엔 어떻게 됐어?",
+    "나는 조금 피곤해.",
+]
+AI_LINES = [
+    "*미소를 지으며* 오늘은 꽤 괜찮은 하루였어. 너는 어땠는지 궁금하네.",
+    "비 오는 날엔 따뜻한 차 한 잔이 생각나. *찻잔을 건넨다*",
+    "좋아, 그럼 처음부터 천천히 이야기해줄게. 그날은 바람이 많이 불었거든.",
+    "그 다음엔... *잠시 고민하다가* 모두가 놀랄 만한 일이 벌어졌어.",
+    "피곤하면 잠깐 쉬어도 괜찮아. 내가 옆에 있을게.",
+]
+
+
+# 벤치마크용 데이터 생성
+# 사용자/해시태그가 달린 캐릭터/채팅방을 만들고, 기준 사용자(bench_0)에게 room_sizes 크기의 채팅방을 하나씩 만듭니다.
+def seed_benchmark_data(
+    users=2000, characters=200, room_sizes=(10, 100, 1000, 10000), seed=0
+):
+    rng = random.Random(seed)
+    password = make_password(BENCH_PASSWORD)
+
+    User.objects.bulk_create(
+        [
+            User(username=f"bench_{i}", nickname=f"bench_{i}", password=password)
+            for i in range(users)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    bench_users = list(User.objects.filter(username__startswith="bench_"))
+
+    Hashtag.objects.bulk_create(
+        [Hashtag(tag_name=f"태그{i}") for i in range(50)], ignore_conflicts=True
+    )
+    hashtags = list(Hashtag.objects.filter(tag_name__startswith="태그"))
+
+    new_characters = [
+        Character(
+            user=rng.choice(bench_users),
+            title=f"벤치마크 캐릭터 {i}",
+            name=f"캐릭터{i}",
+            intro=[{"id": "1", "role": "system", "message": rng.choice(AI_LINES)}],
+            description="넓은 세계관을 가진 판타지 세계에서 살아가는 캐릭터입니다. "
+            * 5,
+            character_info="차분하고 다정하지만 가끔 장난스러운 모습을 보입니다. " * 3,
+            example_situation=[
+                [
+                    {"id": "1", "role": "user", "message": rng.choice(USER_LINES)},
+                    {"id": "2", "role": "ai", "message": rng.choice(AI_LINES)},
+                ]
+            ],
+            presentation="다정한 말투",
+        )
+        for i in range(characters)
+    ]
+    Character.objects.bulk_create(new_characters, batch_size=500)
+
+    Through = Character.hashtags.through
+    Through.objects.bulk_create(
+        [
+            Through(character_id=character.pk, hashtag_id=hashtag.pk)
+            for character in new_characters
+            for hashtag in rng.sample(hashtags, rng.randint(1, 4))
+        ],
+        batch_size=2000,
+    )
+
+    # 기준 사용자는 room_sizes 크기의 채팅방 + 목록 조회용 작은 채팅방들을 가집니다.
+    bench_user = User.objects.get(username="bench_0")
+    rooms = {}
+    for index, size in enumerate(room_sizes):
+        room = Room.objects.create(user=bench_user, character=new_characters[index])
+        seed_chats(room, size, rng)
+        rooms[size] = room
+
+    for character in new_characters[len(room_sizes) : len(room_sizes) + 100]:
+        room = Room.objects.create(user=bench_user, character=character)
+        seed_chats(room, rng.randint(2, 20), rng)
+
+    # 다른 사용자들의 채팅방
+    other_rooms = [
+        Room(user=rng.choice(bench_users), character=rng.choice(new_characters))
+        for _ in range(users // 2)
+    ]
+    Room.objects.bulk_create(other_rooms, batch_size=1000)
+    for room in other_rooms:
+        seed_chats(room, rng.randint(2, 30), rng)
+
+    return bench_user, rooms
+
+
+# user/ai 메시지를 번갈아 생성하고, 일부 AI 메시지에는 재생성 그룹을 만듭니다.
+def seed_chats(room, size, rng):
+    now = timezone.now()
+    started_at = now - timedelta(seconds=size * 30)
+    chats = []
+
+    for i in range(size):
+        role = "user" if i % 2 == 0 else "ai"
+        content = rng.choice(USER_LINES if role == "user" else AI_LINES)
+        created_at = started_at + timedelta(seconds=i * 30)
+
+        if role == "ai" and i % 20 == 9:
+            group = uuid.uuid4()
+            for is_main in (False, True):
+                chats.append(
+                    Chat(
+                        room=room,
+                        content=content,
+                        role=role,
+                        is_main=is_main,
+                        regeneration_group=group,
+                        token_count=estimate_tokens(content),
+                        created_at=created_at,
+                    )
+                )
+                created_at += timedelta(seconds=1)
+            continue
+
+        chats.append(
+            Chat(
+                room=room,
+                content=content,
+                role=role,
+                token_count=estimate_tokens(content),
+                created_at=created_at,
+            )
+        )
+
+    Chat.objects.bulk_create(chats, batch_size=2000)
+    room.refresh_activity()
+
+
+def percentile(samples, percent):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def consume(response):
+    if not getattr(response, "streaming", False):
+        return response.content
+
+    if getattr(response, "is_async", False):
+        from asgiref.sync import async_to_sync
+
+        async def read():
+            return b"".join([part async for part in response.streaming_content])
+
+        return async_to_sync(read)()
+
+    return b"".join(response.streaming_content)
+
+
+def send(client, request):
+    method = getattr(request.get("client") or client, request["method"])
+    kwargs = {"format": request.get("format", "json")}
+    if request.get("data") is not None:
+        kwargs["data"] = request["data"]
+
+    response = method(request["path"], **kwargs)
+    consume(response)
+    return response
+
+
+# expect 가 없으면 2xx 응답만 정상으로 봅니다.
+def is_expected(request, response):
+    expected = request.get("expect")
+    if expected is None:
+        return 200 <= response.status_code < 300
+    return response.status_code in expected
+
+
+# scenario(i)는 {"method", "path", "data", "format", "client", "expect"} 를 반환합니다.
+# 준비 작업(삭제할 데이터 생성 등)은 scenario 안에서 수행되며 측정 시간에 포함되지 않습니다.
+# 예상하지 않은 상태 코드는 unexpected_status_codes 에 따로 기록합니다. (오류 응답의 지연 시간은 실제 비용이 아닙니다.)
+def run_scenario(client, scenario, iterations, warmup=2, profile_samples=3):
+    unexpected = {}
+
+    def record(request, response):
+        if not is_expected(request, response):
+            code = str(response.status_code)
+            unexpected[code] = unexpected.get(code, 0) + 1
+
+    for i in range(warmup):
+        request = scenario(-(i + 1))
+        record(request, send(client, request))
+
+    latencies = []
+    status_codes = {}
+    for i in range(iterations):
+        request = scenario(i)
+        started = time.perf_counter()
+        response = send(client, request)
+        latencies.append((time.perf_counter() - started) * 1000)
+        status_codes[response.status_code] = (
+            status_codes.get(response.status_code, 0) + 1
+        )
+        record(request, response)
+
+    # 쿼리 수와 메모리 할당은 측정 오버헤드가 커서 별도 샘플로 측정합니다.
+    queries = []
+    alloc_peaks = []
+    alloc_blocks = []
+    for i in range(profile_samples):
+        request = scenario(iterations + i)
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as context:
+            response = send(client, request)
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        queries.append(len(context.captured_queries))
+        alloc_peaks.append(peak / 1024)
+        alloc_blocks.append(sum(stat.count for stat in snapshot.statistics("filename")))
+        record(request, response)
+
+    return {
+        "iterations": iterations,
+        "status_codes": {str(code): count for code, count in status_codes.items()},
+        "unexpected_status_codes": unexpected,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries": max(queries) if queries else None,
+        "alloc_peak_kb": round(max(alloc_peaks), 1) if alloc_peaks else None,
+        "alloc_blocks": max(alloc_blocks) if alloc_blocks else None,
+    }
@@ -0,0 +1,282 @@
+# Python Library
+import threading
+import time
+from collections import OrderedDict
+
+# Third-Party Packages
+from django.conf import settings
+from django.core.cache import cache
+
+
+# 채팅방별 최근 대화(is_main) 윈도우 캐시
+# 항목은 (chat_id, role, content, token_count) 튜플이며 오래된 순으로 저장됩니다.
+# 메시지 저장 시 뒤에 추가하고, 수정/삭제/재생성/불러오기 시 무효화합니다.
+#
+# 웹/작업 워커가 같은 채팅방에 동시에 저장해도 대화가 빠진 윈도우를 반환하지 않도록 채팅방별 버전을 함께 저장합니다.
+# - 윈도우는 (버전, 항목) 으로 저장하고, 현재 버전과 다르면 캐시 미스로 처리합니다.
+# - 추가/무효화는 항상 버전을 올리므로, 그 전에 DB 에서 읽어 채우던 윈도우는 사용되지 않습니다.
+# - 추가는 잠금(cache.add) 안에서 읽은 버전 바로 다음 버전일 때만 저장하고,
+#   잠금을 얻지 못하거나 순서가 맞지 않으면 무효화해 다음 조회 시 DB 에서 다시 채웁니다.
+class ConversationWindowCache:
+    key_prefix = "rooms:window:v3"
+    lock_timeout = 5
+
+    def get_key(self, room_id):
+        return f"{self.key_prefix}:{room_id}"
+
+    def get_version_key(self, room_id):
+        return f"{self.get_key(room_id)}:version"
+
+    def get_lock_key(self, room_id):
+        return f"{self.get_key(room_id)}:lock"
+
+    @property
+    def enabled(self):
+        return settings.CONVERSATION_WINDOW_CACHE
+
+    @property
+    def timeout(self):
+        return settings.CONVERSATION_WINDOW_CACHE_TIMEOUT
+
+    # budget이 주어지면 토큰 합계가 예산 안에 들어올 때까지, 아니면 메시지 개수로 자릅니다.
+    def trim(self, entries, budget=None):
+        if budget is None:
+            limit = settings.CONVERSATION_HISTORY_LIMIT
+            return entries[-limit:] if limit else []
+
+        total = 0
+        for index in range(len(entries) - 1, -1, -1):
+            total += entries[index][3]
+            if total > budget:
+                return entries[index + 1 :]
+        return entries
+
+    # 버전 키는 만료되지 않으며, 처음 만들 때 현재 시각(ns)으로 시작해 이전에 저장된 윈도우의 버전과 겹치지 않습니다.
+    def init_version(self, room_id):
+        cache.add(self.get_version_key(room_id), time.time_ns(), None)
+        return cache.get(self.get_version_key(room_id))
+
+    def bump_version(self, room_id):
+        try:
+            return cache.incr(self.get_version_key(room_id))
+        except ValueError:
+            self.init_version(room_id)
+            return cache.incr(self.get_version_key(room_id))
+
+    # (윈도우 또는 None, 현재 버전)을 반환합니다.
+    # DB 에서 읽어 채울 때는 조회 전에 받은 버전을 set 에 전달합니다.
+    def get(self, room_id):
+        if not self.enabled:
+            return None, None
+
+        key, version_key = self.get_key(room_id), self.get_version_key(room_id)
+        values = cache.get_many([key, version_key])
+        version = values.get(version_key)
+        if version is None:
+            return None, self.init_version(room_id)
+
+        entry = values.get(key)
+        if entry is None or entry[0] != version:
+            return None, version
+        return entry[1], version
+
+    def set(self, room_id, entries, budget=None, version=None):
+        if self.enabled and version is not None:
+            cache.set(
+                self.get_key(room_id),
+                (version, self.trim(entries, budget)),
+                self.timeout,
+            )
+
+    def append(self, room_id, entry, budget=None):
+        if not self.enabled:
+            return
+
+        lock_key = self.get_lock_key(room_id)
+        if not cache.add(lock_key, 1, self.lock_timeout):
+            self.invalidate(room_id)
+            return
+
+        try:
+            entries, version = self.get(room_id)
+            new_version = self.bump_version(room_id)
+
+            # 캐시가 없으면 다음 조회 시 DB에서 다시 채우므로 새로 만들지 않습니다.
+            if entries is None or new_version != version + 1:
+                return
+            # 이미 포함되어 있거나 더 최근 메시지가 먼저 추가된 경우
+            if entries and entries[-1][0] >= entry[0]:
+                cache.delete(self.get_key(room_id))
+                return
+
+            self.set(room_id, entries + [entry], budget, new_version)
+        finally:
+            cache.delete(lock_key)
+
+    def invalidate(self, room_id):
+        if self.enabled:
+            self.bump_version(room_id)
+        cache.delete(self.get_key(room_id))
+
+    async def ainit_version(self, room_id):
+        await cache.aadd(self.get_version_key(room_id), time.time_ns(), None)
+        return await cache.aget(self.get_version_key(room_id))
+
+    async def abump_version(self, room_id):
+        try:
+            return await cache.aincr(self.get_version_key(room_id))
+        except ValueError:
+            await self.ainit_version(room_id)
+            return await cache.aincr(self.get_version_key(room_id))
+
+    async def aget(self, room_id):
+        if not self.enabled:
+            return None, None
+
+        key, version_key = self.get_key(room_id), self.get_version_key(room_id)
+        values = await cache.aget_many([key, version_key])
+        version = values.get(version_key)
+        if version is None:
+            return None, await self.ainit_version(room_id)
+
+        entry = values.get(key)
+        if entry is None or entry[0] != version:
+            return None, version
+        return entry[1], version
+
+    async def aset(self, room_id, entries, budget=None, version=None):
+        if self.enabled and version is not None:
+            await cache.aset(
+                self.get_key(room_id),
+                (version, self.trim(entries, budget)),
+                self.timeout,
+            )
+
+    async def aappend(self, room_id, entry, budget=None):
+        if not self.enabled:
+            return
+
+        lock_key = self.get_lock_key(room_id)
+        if not await cache.aadd(lock_key, 1, self.lock_timeout):
+            await self.ainvalidate(room_id)
+            return
+
+        try:
+            entries, version = await self.aget(room_id)
+            new_version = await self.abump_version(room_id)
+
+            if entries is None or new_version != version + 1:
+                return
+            if entries and entries[-1][0] >= entry[0]:
+                await cache.adelete(self.get_key(room_id))
+                return
+
+            await self.aset(room_id, entries + [entry], budget, new_version)
+        finally:
+            await cache.adelete(lock_key)
+
+    async def ainvalidate(self, room_id):
+        if self.enabled:
+            await self.abump_version(room_id)
+        await cache.adelete(self.get_key(room_id))
+
+
+window_cache = ConversationWindowCache()
+
+
+# 마지막 AI 응답 직후 채팅방별로 미리 생성한 추천 답변 (version, suggestions)
+# version 은 생성을 시작할 때의 Room.updated_at 이며, 메시지 저장/수정/삭제/재생성마다 바뀝니다.
+class SuggestionCache:
+    key_prefix = "rooms:suggestions:v2"
+    lock_timeout = 5
+
+    def get_key(self, room_id):
+        return f"{self.key_prefix}:{room_id}"
+
+    def get_lock_key(self, room_id):
+        return f"{self.get_key(room_id)}:lock"
+
+    # 이미 저장된 추천 답변보다 새로운 버전일 때만 저장합니다. (compare-and-set)
+    # is_current: 잠금을 얻은 뒤 채팅방이 아직 이 버전인지 확인하는 코루틴 함수
+    # 다른 작업이 저장 중이면 기다리지 않고 저장하지 않습니다. (요청 시 새로 생성)
+    async def aset(self, room_id, version, suggestions, is_current):
+        key = self.get_key(room_id)
+        lock_key = self.get_lock_key(room_id)
+
+        if not await cache.aadd(lock_key, 1, self.lock_timeout):
+            return False
+
+        try:
+            entry = await cache.aget(key)
+            if entry is not None and entry[0] >= version:
+                return False
+            if not await is_current():
+                return False
+
+            await cache.aset(
+                key, (version, suggestions), settings.SUGGESTION_PREFETCH_TIMEOUT
+            )
+            return True
+        finally:
+            await cache.adelete(lock_key)
+
+    # 한 번 반환한 추천 답변은 지우고, 다음 요청부터는 새로 생성합니다.
+    # 채팅방의 현재 버전과 다르면 (생성 후 메시지가 바뀐 경우) 반환하지 않습니다.
+    async def apop(self, room_id, version):
+        key = self.get_key(room_id)
+        entry = await cache.aget(key)
+        if entry is None:
+            return None
+
+        await cache.adelete(key)
+        stored_version, suggestions = entry
+        return suggestions if stored_version == version else None
+
+    def invalidate(self, room_id):
+        cache.delete(self.get_key(room_id))
+
+    async def ainvalidate(self, room_id):
+        await cache.adelete(self.get_key(room_id))
+
+
+suggestion_cache = SuggestionCache()
+
+
+# 캐릭터 프롬프트(텍스트 + ChatPromptTemplate) 프로세스 내 LRU 캐시
+# 키에 character.updated_at 을 포함하므로 캐릭터가 수정되면 자연스럽게 새로 만들어집니다.
+class PromptCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+
+        value = factory()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+prompt_cache = PromptCache(maxsize=settings.PROMPT_CACHE_SIZE)
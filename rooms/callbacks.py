@@ -0,0 +1,97 @@
+# Python Library
+import asyncio
+import time
+
+# Third-Party Packages
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import SystemMessage
+
+# Local Apps
+from beta.timing import record_timing
+from .metrics import (
+    llm_cached_input_tokens,
+    llm_duration,
+    llm_first_token,
+    llm_history_messages,
+    llm_input_tokens,
+    llm_output_tokens,
+    llm_system_prompt_tokens,
+)
+from .tokens import estimate_tokens
+
+
+# 모델 호출마다 소요 시간, 첫 토큰 시간, 입출력 토큰 수, 대화 내역 길이, 시스템 프롬프트 크기, 결과를 기록합니다.
+# chain.predict / llm.ainvoke / llm.astream 의 callbacks 로 전달합니다.
+class LLMMetricsCallback(BaseCallbackHandler):
+    # 비동기 호출에서도 스레드 풀로 넘기지 않고 바로 실행합니다.
+    run_inline = True
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._runs = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        prompt = messages[0] if messages else []
+
+        system_tokens = 0
+        if prompt and isinstance(prompt[0], SystemMessage):
+            system_tokens = estimate_tokens(str(prompt[0].content))
+
+        # 첫 시스템 프롬프트와 마지막 입력 메시지를 제외한 나머지가 대화 내역입니다.
+        history = len(prompt) - (1 if system_tokens else 0) - 1
+
+        self._runs[run_id] = {
+            "started": time.perf_counter(),
+            "first_token": None,
+            "input_tokens": sum(estimate_tokens(str(m.content)) for m in prompt),
+        }
+
+        llm_history_messages.observe(max(history, 0), kind=self.kind)
+        llm_system_prompt_tokens.observe(system_tokens, kind=self.kind)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run and run["first_token"] is None:
+            run["first_token"] = time.perf_counter()
+            llm_first_token.observe(run["first_token"] - run["started"], kind=self.kind)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        duration = time.perf_counter() - run["started"]
+        llm_duration.observe(duration, kind=self.kind, outcome="success")
+        record_timing("llm", duration)
+
+        # 모델이 사용량을 알려주면 그 값을, 아니면 추정값을 사용합니다.
+        input_tokens = run["input_tokens"]
+        cached_tokens = 0
+        output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    input_tokens = usage.get("input_tokens", input_tokens)
+                    output_tokens += usage.get("output_tokens", 0)
+                    details = usage.get("input_token_details") or {}
+                    cached_tokens += details.get("cache_read") or 0
+                else:
+                    output_tokens += estimate_tokens(generation.text)
+
+        llm_input_tokens.observe(input_tokens, kind=self.kind)
+        llm_cached_input_tokens.observe(cached_tokens, kind=self.kind)
+        llm_output_tokens.observe(output_tokens, kind=self.kind)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+
+        # 헤징/마감 시간으로 취소된 호출은 오류와 구분합니다.
+        outcome = "cancelled" if isinstance(error, asyncio.CancelledError) else "error"
+        duration = time.perf_counter() - run["started"]
+        llm_duration.observe(duration, kind=self.kind, outcome=outcome)
+        record_timing("llm", duration)
+        llm_input_tokens.observe(run["input_tokens"], kind=self.kind)
@@ -0,0 +1,153 @@
+# Python Library
+import hashlib
+import logging
+import time
+from datetime import timedelta
+
+# Third-Party Packages
+from django.conf import settings
+from django.core.cache import cache
+
+# Local Apps
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+context_cache_events = metrics.counter(
+    "beta_llm_context_cache_total",
+    "컨텍스트 캐시 사용/등록/연장/오류 횟수",
+    ("result",),
+)
+
+
+# Gemini cached content API (google.generativeai.caching)
+class GeminiCachedContentAPI:
+    def __init__(self):
+        self.configured = False
+
+    def configure(self):
+        import google.generativeai as genai
+
+        if not self.configured:
+            genai.configure(api_key=settings.GOOGLE_API_KEY)
+            self.configured = True
+
+    def create(self, model, system_prompt, ttl):
+        from google.generativeai import caching
+
+        self.configure()
+        return caching.CachedContent.create(
+            model=model,
+            display_name=f"beta-{hashlib.sha1(system_prompt.encode()).hexdigest()[:12]}",
+            system_instruction=system_prompt,
+            ttl=timedelta(seconds=ttl),
+        ).name
+
+    def update(self, name, ttl):
+        from google.generativeai import caching
+
+        self.configure()
+        caching.CachedContent.get(name).update(ttl=timedelta(seconds=ttl))
+
+    def delete(self, name):
+        from google.generativeai import caching
+
+        self.configure()
+        caching.CachedContent.get(name).delete()
+
+
+# 캐릭터의 시스템 프롬프트를 모델 제공자의 컨텍스트 캐시에 한 번 등록하고, 이후 호출에서는 이름(handle)만 전달합니다.
+# 등록 정보는 (프롬프트 버전, 이름, 마지막 연장 시각)으로 Django 캐시에 저장해 워커끼리 공유합니다.
+# - 캐릭터가 수정되어 시스템 프롬프트가 바뀌면 이전 캐시를 지우고 새로 등록합니다.
+# - 사용 중인 캐시는 TTL의 절반이 지나면 연장하고, 사용하지 않으면 CONTEXT_CACHE_TTL 뒤 만료됩니다.
+# 등록/연장에 실패하면 캐시 없이 전체 프롬프트를 보냅니다.
+class ContextCacheRegistry:
+    key_prefix = "rooms:context-cache:v1"
+
+    def __init__(self):
+        self._gemini = GeminiCachedContentAPI()
+
+    def get_api(self):
+        # 로컬 대체 구현 (LLM_BACKEND=fake)
+        if settings.LLM_BACKEND == "fake":
+            from .fake_llm import fake_cached_contents
+
+            return fake_cached_contents
+        return self._gemini
+
+    def get_key(self, character):
+        return (
+            f"{self.key_prefix}:{settings.LLM_BACKEND}:{settings.AI_MODEL}:"
+            f"{character.pk}"
+        )
+
+    def get_version(self, compiled):
+        return hashlib.sha1(compiled.text.encode()).hexdigest()
+
+    # 시스템 메시지를 미리 만들 수 있고 (템플릿 변수 없음) 최소 토큰 수 이상인 프롬프트만 등록합니다.
+    def is_eligible(self, character, compiled):
+        return (
+            settings.CONTEXT_CACHE
+            and character.pk is not None
+            and compiled.system_message is not None
+            and compiled.tokens >= settings.CONTEXT_CACHE_MIN_TOKENS
+        )
+
+    # 로컬 캐시는 제공자보다 조금 먼저 만료되도록 해 만료된 이름을 사용하지 않습니다.
+    def get_timeout(self):
+        ttl = settings.CONTEXT_CACHE_TTL
+        return max(ttl - min(30, ttl // 10), 1)
+
+    def get_handle(self, character, compiled):
+        if not self.is_eligible(character, compiled):
+            return None
+
+        key = self.get_key(character)
+        version = self.get_version(compiled)
+        ttl = settings.CONTEXT_CACHE_TTL
+        now = time.time()
+        api = self.get_api()
+
+        entry = cache.get(key)
+
+        try:
+            if entry is not None and entry[0] == version:
+                _, name, refreshed_at = entry
+                if now - refreshed_at >= ttl / 2:
+                    api.update(name, ttl)
+                    cache.set(key, (version, name, now), self.get_timeout())
+                    context_cache_events.inc(result="refreshed")
+                context_cache_events.inc(result="hit")
+                return name
+
+            # 캐릭터 수정 전 버전의 캐시는 만료를 기다리지 않고 지웁니다.
+            if entry is not None:
+                self.delete_quietly(api, entry[1])
+
+            name = api.create(settings.AI_MODEL, compiled.text, ttl)
+            cache.set(key, (version, name, now), self.get_timeout())
+            context_cache_events.inc(result="created")
+            return name
+
+        except Exception as e:
+            logger.warning(f"컨텍스트 캐시 등록/연장 실패: {e}")
+            cache.delete(key)
+            context_cache_events.inc(result="error")
+            return None
+
+    # 캐시를 사용한 호출이 실패하면 다음 호출에서 다시 등록하도록 지웁니다.
+    def discard(self, character, name):
+        key = self.get_key(character)
+        entry = cache.get(key)
+        if entry is not None and entry[1] == name:
+            cache.delete(key)
+            context_cache_events.inc(result="discarded")
+
+    def delete_quietly(self, api, name):
+        try:
+            api.delete(name)
+        except Exception as e:
+            logger.info(f"이전 컨텍스트 캐시 삭제 실패 (만료 시 정리됨): {e}")
+
+
+context_cache = ContextCacheRegistry()
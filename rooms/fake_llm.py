@@ -0,0 +1,241 @@
+# Python Library
+import asyncio
+import random
+import itertools
+import re
+import threading
+import time
+import zlib
+
+# Third-Party Packages
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+# Local Apps
+from .tokens import estimate_tokens
+
+WORD_POOL = [
+    "그래",
+    "정말",
+    "오늘은",
+    "조금",
+    "이야기를",
+    "더",
+    "들려줘",
+    "*미소를 짓는다*",
+    "괜찮아",
+    "그런데",
+    "너는",
+    "어떻게",
+    "생각해?",
+    "나도",
+    "궁금했어",
+    "*고개를 끄덕인다*",
+]
+
+
+# 부하/지연 테스트용 로컬 채팅 모델 (LLM_BACKEND=fake)
+# 같은 입력에는 항상 같은 응답을 반환하고, 지연 시간 분포/토큰 생성 속도/오류 비율을 설정할 수 있습니다.
+class FakeChatModel(BaseChatModel):
+    # fixed: latency_ms 고정, uniform: latency_ms ± jitter_ms, lognormal: 중앙값 latency_ms, sigma=jitter_ms/latency_ms
+    latency: str = "fixed"
+    latency_ms: float = 200.0
+    jitter_ms: float = 0.0
+    tokens_per_second: float = 50.0
+    reply_tokens: int = 40
+    error_rate: float = 0.0
+    seed: int = 0
+    # 캐시되지 않은 입력 토큰 1000개당 첫 토큰까지 추가되는 지연 (prefill)
+    prefill_ms_per_1k_tokens: float = 0.0
+
+    _rng: random.Random = PrivateAttr()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self):
+        return "beta-fake"
+
+    def sample_latency(self):
+        base = self.latency_ms / 1000
+
+        if self.latency == "uniform":
+            jitter = self.jitter_ms / 1000
+            return max(self._rng.uniform(base - jitter, base + jitter), 0)
+
+        if self.latency == "lognormal" and self.latency_ms > 0:
+            sigma = self.jitter_ms / self.latency_ms
+            return self._rng.lognormvariate(0, sigma) * base
+
+        return base
+
+    def prefill_latency(self, messages, cached_tokens):
+        input_tokens = sum(
+            estimate_tokens(str(message.content)) for message in messages
+        )
+        return (
+            max(input_tokens - cached_tokens, 0) / 1000 * self.prefill_ms_per_1k_tokens
+        ) / 1000
+
+    # cached_content 가 주어지면 캐시된 시스템 프롬프트를 앞에 붙여 응답을 만듭니다.
+    # Gemini 와 같이 cached_content 와 시스템 메시지(system_instruction)를 함께 보내면 오류가 발생합니다.
+    def resolve_cached_content(self, messages, cached_content):
+        if not cached_content:
+            return messages, 0
+
+        if any(isinstance(message, SystemMessage) for message in messages):
+            raise RuntimeError(
+                "FakeChatModel: cached_content can not be used with system_instruction"
+            )
+
+        system_prompt = fake_cached_contents.get(cached_content)
+        return [SystemMessage(content=system_prompt), *messages], estimate_tokens(
+            system_prompt
+        )
+
+    def check_error(self):
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise RuntimeError("FakeChatModel: injected error")
+
+    def build_reply(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        rng = random.Random(zlib.crc32(prompt.encode()) + self.seed)
+
+        # 추천 답변 배치 요청(JSON 배열)에는 요청한 개수만큼 배열로 응답합니다.
+        if "JSON" in prompt:
+            match = re.search(r"(\d+)개", prompt)
+            count = int(match.group(1)) if match else 1
+            items = [
+                " ".join(rng.choice(WORD_POOL) for _ in range(6)) for _ in range(count)
+            ]
+            return '["' + '", "'.join(items) + '"]'
+
+        return " ".join(rng.choice(WORD_POOL) for _ in range(self.reply_tokens))
+
+    def split_tokens(self, text):
+        return re.findall(r"\S+\s*", text) or [text]
+
+    # Gemini와 같이 input_tokens 에는 캐시된 토큰도 포함하고 cache_read 로 따로 알려줍니다.
+    def build_message(self, messages, content, cached_tokens=0):
+        input_tokens = sum(
+            estimate_tokens(str(message.content)) for message in messages
+        )
+        output_tokens = estimate_tokens(content)
+
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "input_token_details": {"cache_read": cached_tokens},
+            },
+        )
+
+    def _generate(
+        self, messages, stop=None, run_manager=None, cached_content=None, **kwargs
+    ):
+        messages, cached = self.resolve_cached_content(messages, cached_content)
+        reply = self.build_reply(messages)
+        tokens = self.split_tokens(reply)
+
+        time.sleep(
+            self.sample_latency()
+            + self.prefill_latency(messages, cached)
+            + len(tokens) / self.tokens_per_second
+        )
+        self.check_error()
+
+        message = self.build_message(messages, reply, cached)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, cached_content=None, **kwargs
+    ):
+        messages, cached = self.resolve_cached_content(messages, cached_content)
+        reply = self.build_reply(messages)
+        tokens = self.split_tokens(reply)
+
+        await asyncio.sleep(
+            self.sample_latency()
+            + self.prefill_latency(messages, cached)
+            + len(tokens) / self.tokens_per_second
+        )
+        self.check_error()
+
+        message = self.build_message(messages, reply, cached)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self, messages, stop=None, run_manager=None, cached_content=None, **kwargs
+    ):
+        messages, cached = self.resolve_cached_content(messages, cached_content)
+        time.sleep(self.sample_latency() + self.prefill_latency(messages, cached))
+        self.check_error()
+
+        for token in self.split_tokens(self.build_reply(messages)):
+            time.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, cached_content=None, **kwargs
+    ):
+        messages, cached = self.resolve_cached_content(messages, cached_content)
+        await asyncio.sleep(
+            self.sample_latency() + self.prefill_latency(messages, cached)
+        )
+        self.check_error()
+
+        for token in self.split_tokens(self.build_reply(messages)):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+# Gemini cached content API의 로컬 대체 구현 (프로세스 내 저장, TTL 만료)
+# 만료되었거나 없는 이름으로 호출하면 제공자와 같이 오류가 발생합니다.
+class FakeCachedContentAPI:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contents = {}
+        self._ids = itertools.count(1)
+
+    def create(self, model, system_prompt, ttl):
+        name = f"cachedContents/fake-{next(self._ids)}"
+        with self._lock:
+            self._contents[name] = (system_prompt, time.time() + ttl)
+        return name
+
+    def get(self, name):
+        with self._lock:
+            entry = self._contents.get(name)
+            if entry is None or entry[1] <= time.time():
+                self._contents.pop(name, None)
+                raise RuntimeError(f"FakeCachedContentAPI: {name} not found")
+            return entry[0]
+
+    def update(self, name, ttl):
+        system_prompt = self.get(name)
+        with self._lock:
+            self._contents[name] = (system_prompt, time.time() + ttl)
+
+    def delete(self, name):
+        with self._lock:
+            if self._contents.pop(name, None) is None:
+                raise RuntimeError(f"FakeCachedContentAPI: {name} not found")
+
+    def reset(self):
+        with self._lock:
+            self._contents.clear()
+
+
+fake_cached_contents = FakeCachedContentAPI()
@@ -0,0 +1,62 @@
+# Python Library
+import logging
+import time
+
+# Third-Party Packages
+from django.conf import settings
+from django.db import transaction
+
+# Local Apps
+from .metrics import metrics
+from .models import Chat
+from .tokens import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+history_load_duration = metrics.histogram(
+    "beta_history_load_seconds_per_1k_messages",
+    "대화 내역 불러오기 소요 시간 (메시지 1,000개당)",
+    (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+
+
+def build_chats(room, chat_history):
+    return [
+        Chat(
+            room=room,
+            content=chat_data["content"],
+            role=chat_data["role"],
+            is_main=chat_data.get("is_main", True),
+            regeneration_group=chat_data.get("regeneration_group", None),
+            # bulk_create 는 save()를 호출하지 않으므로 토큰 수를 직접 채웁니다.
+            token_count=estimate_tokens(chat_data["content"]),
+            created_at=chat_data["timestamp"],
+        )
+        for chat_data in chat_history
+    ]
+
+
+# 채팅방의 메시지를 저장된 대화 내역(ConversationHistory.chat_history)으로 교체합니다.
+# 삭제, 배치 INSERT(HISTORY_LOAD_BATCH_SIZE 개씩), 채팅방 카운터/요약 초기화를 한 트랜잭션에서 실행해
+# 중간에 실패하면 기존 메시지가 그대로 남습니다.
+# (삭제된 메시지 수, 불러온 메시지 수)를 반환합니다.
+def load_history(room, chat_history):
+    chats = build_chats(room, chat_history)
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        deleted_count, _ = Chat.objects.filter(room=room).delete()
+        Chat.objects.bulk_create(chats, batch_size=settings.HISTORY_LOAD_BATCH_SIZE)
+        room.refresh_activity()
+        room.reset_summary()
+
+    elapsed = time.perf_counter() - started
+    if chats:
+        per_1k = elapsed / len(chats) * 1000
+        history_load_duration.observe(per_1k)
+        logger.info(
+            f"대화 내역 불러오기: {len(chats)}개, {elapsed * 1000:.1f} ms "
+            f"(1,000개당 {per_1k * 1000:.1f} ms)"
+        )
+
+    return deleted_count, len(chats)
@@ -0,0 +1,68 @@
+# Python Library
+import logging
+from datetime import timedelta
+
+# Third-Party Packages
+from django.db import transaction
+from django.utils import timezone
+
+# Local Apps
+from .models import GenerationJob, Room
+from .serializers import ChatResponseSerializer
+from .services import ChatService
+
+logger = logging.getLogger(__name__)
+
+
+# 대기 중인 작업 하나를 가져와 running 상태로 변경합니다.
+# SKIP LOCKED 로 여러 워커가 같은 작업을 가져가지 않습니다.
+def claim_next_job():
+    with transaction.atomic():
+        job = (
+            GenerationJob.objects.select_for_update(skip_locked=True)
+            .filter(status="pending")
+            .order_by("created_at")
+            .first()
+        )
+
+        if job is None:
+            return None
+
+        job.status = "running"
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+
+    return job
+
+
+# 워커가 비정상 종료되어 running 상태로 남은 작업을 다시 대기열에 넣습니다.
+def requeue_stale_jobs(stale_after):
+    deadline = timezone.now() - timedelta(seconds=stale_after)
+    return GenerationJob.objects.filter(
+        status="running", started_at__lt=deadline
+    ).update(status="pending", started_at=None)
+
+
+def run_job(job):
+    try:
+        room = Room.objects.select_related("character", "user").get(pk=job.room_id)
+
+        chat_service = ChatService()
+        ai_response = chat_service.get_ai_response(room, job.user_message or None)
+        ai_chat_obj = chat_service.save_chat(room, ai_response, "ai")
+        chat_service.schedule_summary(room)
+
+        job.result = ChatResponseSerializer(
+            ai_chat_obj, context={"input_user_message": job.user_message}
+        ).data
+        job.status = "done"
+
+    except Exception as e:
+        logger.error(f"응답 생성 작업 오류 ({job.uuid}): {e}")
+        job.error = str(e)
+        job.status = "failed"
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=["result", "status", "error", "finished_at"])
+
+    return job
@@ -0,0 +1,144 @@
+# Python Library
+import asyncio
+import logging
+import os
+import threading
+import weakref
+
+# Third-Party Packages
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# 클라이언트의 채널/인증을 새로 만들어야 하는 오류 (연결 실패, 서비스 불가, 인증/권한 오류)
+# 프롬프트 오류(캐릭터 설정의 중괄호로 인한 KeyError 등), DB 오류, 잘못된 요청은 클라이언트와 무관하므로 제외합니다.
+def is_client_error(error):
+    if isinstance(error, ConnectionError):
+        return True
+
+    try:
+        import grpc
+        from google.api_core import exceptions
+    except ImportError:
+        return False
+
+    return isinstance(
+        error,
+        (
+            grpc.RpcError,
+            exceptions.ServiceUnavailable,
+            exceptions.Unauthenticated,
+            exceptions.PermissionDenied,
+            exceptions.RetryError,
+        ),
+    )
+
+
+# 워커 프로세스마다 (backend, model, temperature, max_tokens) 조합별로 클라이언트를 하나만 생성해 재사용
+# fork 이후에는 부모 프로세스의 채널을 물려받지 않도록 비운 뒤 새로 생성합니다.
+# 비동기 gRPC 채널은 처음 사용한 이벤트 루프에 묶이므로, 실행 중인 이벤트 루프가 있으면 루프별로 따로 생성합니다.
+# (ASGI 워커는 루프가 하나이므로 프로세스당 하나, async_to_sync/runserver 는 호출마다 새 루프)
+# 루프가 없는 동기 호출(작업 워커, 요약)은 같은 클라이언트를 공유합니다.
+class LLMClientRegistry:
+    def __init__(self):
+        self.reset()
+
+    def _build_key(self, model=None, temperature=None, max_tokens=None):
+        return (
+            settings.LLM_BACKEND,
+            model or settings.AI_MODEL,
+            temperature if temperature is not None else settings.TEMPERATURE,
+            max_tokens if max_tokens is not None else settings.MAX_TOKENS,
+        )
+
+    def _create_client(self, key):
+        backend, model, temperature, max_tokens = key
+
+        # 부하/지연 테스트용 로컬 모델 (실제 API를 호출하지 않음)
+        if backend == "fake":
+            from .fake_llm import FakeChatModel
+
+            return FakeChatModel(**settings.FAKE_LLM)
+
+        # langchain_google_genai 는 grpc/protobuf 까지 불러오므로 클라이언트를 처음 만들 때 불러옵니다.
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            google_api_key=settings.GOOGLE_API_KEY,
+            # 동기 호출(작업 워커, 요약)의 마감 시간 역할도 합니다.
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+
+    def _check_fork(self):
+        # gunicorn preload 등으로 fork 된 경우 부모의 gRPC 채널은 사용하지 않습니다.
+        if self._pid != os.getpid():
+            self.reset()
+
+    # 현재 이벤트 루프의 클라이언트 목록 (루프가 종료되어 사라지면 함께 정리됩니다.)
+    def _get_clients(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._clients
+
+        clients = self._loop_clients.get(loop)
+        if clients is None:
+            clients = self._loop_clients[loop] = {}
+        return clients
+
+    def get(self, model=None, temperature=None, max_tokens=None):
+        self._check_fork()
+        key = self._build_key(model, temperature, max_tokens)
+
+        with self._lock:
+            clients = self._get_clients()
+            client = clients.get(key)
+            if client is not None:
+                self._stats["reused"] += 1
+                return client
+
+            client = self._create_client(key)
+            clients[key] = client
+            self._stats["created"] += 1
+            logger.info(f"LLM 클라이언트 생성: {key}")
+            return client
+
+    def discard(self, client):
+        # 오류가 발생한 클라이언트는 버리고 다음 요청에서 새로 생성합니다.
+        with self._lock:
+            for clients in [self._clients, *self._loop_clients.values()]:
+                for key, cached in list(clients.items()):
+                    if cached is client:
+                        del clients[key]
+                        self._stats["discarded"] += 1
+                        logger.warning(f"LLM 클라이언트 폐기: {key}")
+
+    # 연결/인증 오류일 때만 버립니다. 다른 오류는 다른 사용자의 요청에 영향을 주지 않습니다.
+    def discard_on_error(self, client, error):
+        if is_client_error(error):
+            self.discard(client)
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._loop_clients = weakref.WeakKeyDictionary()
+        self._pid = os.getpid()
+        self._stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def stats(self):
+        with self._lock:
+            active = len(self._clients) + sum(
+                len(clients) for clients in self._loop_clients.values()
+            )
+            return {**self._stats, "active": active, "loops": len(self._loop_clients)}
+
+
+llm_registry = LLMClientRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=llm_registry.reset)
@@ -0,0 +1,586 @@
+# Python Library
+import json
+import logging
+import platform
+import random
+import subprocess
+import uuid
+from datetime import datetime
+
+# Third-Party Packages
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Local Apps
+from accounts.models import User
+from characters.models import Character, ConversationHistory
+from rooms.benchmarks import (
+    BENCH_PASSWORD,
+    run_scenario,
+    seed_benchmark_data,
+    seed_chats,
+)
+from rooms.llm import llm_registry
+from rooms.models import Chat, GenerationJob, Room
+
+ACCOUNTS = "/api/v1/accounts"
+CHARACTERS = "/api/v1/characters"
+ROOMS = "/api/v1/rooms"
+
+# 전체 대화를 저장/복원하는 느린 시나리오는 --heavy-iterations 만큼만 반복합니다.
+HEAVY_SCENARIOS = ("rooms.histories.save", "rooms.history.load")
+
+# 외부 OAuth 제공자가 필요해 로컬에서 측정할 수 없는 엔드포인트
+SKIPPED = {
+    "accounts.kakao_login": "카카오 OAuth 인가 코드가 필요합니다.",
+    "accounts.google_login": "구글 OAuth 인가 코드가 필요합니다.",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "시드 데이터를 만든 별도 테스트 DB에서 전체 API 엔드포인트를 호출해 "
+        "p50/p95/p99 지연 시간, 요청당 쿼리 수, 메모리 할당량을 JSON으로 기록합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument(
+            "--compare", help="이전 결과 JSON 파일과 비교해 변화율을 출력합니다."
+        )
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument(
+            "--heavy-iterations",
+            type=int,
+            default=5,
+            help="대용량 저장/불러오기처럼 느린 시나리오의 반복 횟수",
+        )
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--profile-samples", type=int, default=3)
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--characters", type=int, default=200)
+        parser.add_argument(
+            "--room-sizes",
+            default="10,100,1000,10000",
+            help="측정할 채팅방의 메시지 개수 목록 (쉼표 구분)",
+        )
+        parser.add_argument(
+            "--only", help="이름에 이 문자열이 포함된 시나리오만 실행합니다."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--llm-latency-ms",
+            type=float,
+            default=0.0,
+            help="가짜 LLM 응답 지연 (기본 0: 서버 자체 오버헤드만 측정)",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="테스트 DB와 시드 데이터를 지우지 않고 다음 실행에서 재사용합니다.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            room_sizes = [int(size) for size in options["room_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--room-sizes 는 쉼표로 구분된 정수여야 합니다.")
+
+        # 운영 DB를 건드리지 않도록 항상 test_ 접두사가 붙은 별도 DB에서 실행합니다.
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+
+        fake_llm = {
+            **settings.FAKE_LLM,
+            "latency": "fixed",
+            "latency_ms": options["llm_latency_ms"],
+            "tokens_per_second": 100000,
+            "error_rate": 0.0,
+        }
+
+        try:
+            with override_settings(
+                LLM_BACKEND="fake",
+                FAKE_LLM=fake_llm,
+                CONVERSATION_SUMMARY=False,
+            ):
+                llm_registry.reset()
+                bench_user, rooms = self.prepare_data(room_sizes, options)
+                results = self.run(bench_user, rooms, options)
+        finally:
+            llm_registry.reset()
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        report = {
+            "meta": self.get_meta(options, room_sizes),
+            "results": results,
+            "skipped": SKIPPED,
+        }
+
+        with open(options["output"], "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+        self.print_results(results)
+        if options["compare"]:
+            self.print_comparison(options["compare"], results)
+
+        self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+        failed = [
+            name
+            for name, result in results.items()
+            if result["unexpected_status_codes"]
+        ]
+        if failed:
+            raise CommandError(
+                f"예상하지 않은 상태 코드를 반환한 시나리오: {', '.join(failed)}"
+            )
+
+    def prepare_data(self, room_sizes, options):
+        bench_user = User.objects.filter(username="bench_0").first()
+
+        if bench_user is None:
+            self.stdout.write("시드 데이터를 생성합니다...")
+            return seed_benchmark_data(
+                users=options["users"],
+                characters=options["characters"],
+                room_sizes=room_sizes,
+                seed=options["seed"],
+            )
+
+        # --keepdb 로 재사용하는 경우 메시지 개수가 가장 가까운 채팅방을 다시 찾습니다.
+        owned = list(
+            Room.objects.filter(user=bench_user).annotate(chat_total=Count("chats"))
+        )
+        rooms = {
+            size: min(owned, key=lambda room: abs(room.chat_total - size))
+            for size in room_sizes
+        }
+        return bench_user, rooms
+
+    def authenticate(self, user):
+        # 서버 오류도 예외 대신 500 응답으로 기록합니다.
+        client = APIClient(raise_request_exception=False)
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        return client
+
+    def create_throwaway_user(self, prefix):
+        user = User(username=f"{prefix}_{uuid.uuid4().hex[:12]}")
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+        return user
+
+    def build_scenarios(self, bench_user, rooms, options):
+        rng = random.Random(options["seed"])
+        client = self.authenticate(bench_user)
+        characters = list(Character.objects.order_by("created_at")[:50])
+        smallest = rooms[min(rooms)]
+
+        # 상세 조회/수정은 본인이 만든 캐릭터만 가능합니다.
+        character = Character.objects.create(
+            user=bench_user,
+            title="벤치마크 캐릭터",
+            name="벤치",
+            intro=[{"id": "1", "role": "system", "message": "안녕"}],
+            description="벤치마크용 캐릭터입니다.",
+            character_info="차분한 성격",
+        )
+
+        def throwaway_room(size):
+            room = Room.objects.create(
+                user=bench_user, character=rng.choice(characters)
+            )
+            seed_chats(room, size, rng)
+            return room
+
+        def regenerated_chat(room):
+            return (
+                Chat.objects.filter(room=room, regeneration_group__isnull=False)
+                .order_by("-id")
+                .first()
+            )
+
+        def last_ai_chat(room):
+            return Chat.objects.filter(room=room, role="ai").order_by("-id").first()
+
+        def fresh_refresh(i):
+            return str(RefreshToken.for_user(bench_user))
+
+        def throwaway_history(room):
+            chats = Chat.objects.filter(room=room).order_by("created_at")
+            return ConversationHistory.objects.create(
+                character=room.character,
+                user=bench_user,
+                title="벤치마크 대화 내역",
+                chat_history=[
+                    {
+                        "content": chat.content,
+                        "role": chat.role,
+                        "is_main": chat.is_main,
+                        "regeneration_group": (
+                            str(chat.regeneration_group)
+                            if chat.regeneration_group
+                            else None
+                        ),
+                        "timestamp": chat.created_at.isoformat(),
+                    }
+                    for chat in chats
+                ],
+            )
+
+        def deactivate(i):
+            user = self.create_throwaway_user("bd")
+            return {
+                "method": "delete",
+                "path": f"{ACCOUNTS}/delete/",
+                "data": {"password": BENCH_PASSWORD},
+                "client": self.authenticate(user),
+            }
+
+        def delete_character(i):
+            target = Character.objects.create(
+                user=bench_user,
+                title="삭제용 캐릭터",
+                name="삭제용",
+                intro=[{"id": "1", "role": "system", "message": "안녕"}],
+                description="삭제용",
+                character_info="삭제용",
+            )
+            return {"method": "delete", "path": f"{CHARACTERS}/{target.pk}/"}
+
+        def delete_message(i):
+            room = throwaway_room(100)
+            chat = Chat.objects.filter(room=room).order_by("id")[50]
+            return {
+                "method": "delete",
+                "path": f"{ROOMS}/{room.uuid}/messages/{chat.pk}/",
+            }
+
+        def job_status(i):
+            job = GenerationJob.objects.create(room=smallest, user_message="안녕")
+            return {
+                "method": "get",
+                "path": f"{ROOMS}/{smallest.uuid}/jobs/{job.pk}/",
+            }
+
+        scenarios = {
+            # accounts
+            "accounts.signup": lambda i: {
+                "method": "post",
+                "path": f"{ACCOUNTS}/signup/",
+                "data": {
+                    "username": f"bs_{uuid.uuid4().hex[:12]}",
+                    "password": BENCH_PASSWORD,
+                    "password_confirm": BENCH_PASSWORD,
+                },
+            },
+            "accounts.signin": lambda i: {
+                "method": "post",
+                "path": f"{ACCOUNTS}/signin/",
+                "data": {"username": bench_user.username, "password": BENCH_PASSWORD},
+            },
+            "accounts.signout": lambda i: {
+                "method": "post",
+                "path": f"{ACCOUNTS}/signout/",
+                "data": {"refresh": fresh_refresh(i)},
+            },
+            "accounts.token_refresh": lambda i: {
+                "method": "post",
+                "path": f"{ACCOUNTS}/token/refresh/",
+                "data": {"refresh": fresh_refresh(i)},
+            },
+            "accounts.password": lambda i: {
+                "method": "put",
+                "path": f"{ACCOUNTS}/password/",
+                "data": {
+                    "old_password": BENCH_PASSWORD,
+                    "new_password": BENCH_PASSWORD,
+                },
+            },
+            "accounts.delete": deactivate,
+            "accounts.profile.get": lambda i: {
+                "method": "get",
+                "path": f"{ACCOUNTS}/{bench_user.nickname}/",
+            },
+            "accounts.profile.put": lambda i: {
+                "method": "put",
+                "path": f"{ACCOUNTS}/{bench_user.nickname}/",
+                "data": {"introduce": f"벤치마크 {i}"},
+                "format": "multipart",
+            },
+            "accounts.kakao_redirect": lambda i: {
+                "method": "get",
+                "path": f"{ACCOUNTS}/kakao/redirect/?code=benchmark",
+            },
+            # characters
+            "characters.list": lambda i: {"method": "get", "path": f"{CHARACTERS}/"},
+            "characters.create": lambda i: {
+                "method": "post",
+                "path": f"{CHARACTERS}/",
+                "data": {
+                    "title": "벤치마크 캐릭터",
+                    "name": "벤치",
+                    "intro": [{"id": "1", "role": "system", "message": "안녕"}],
+                    "description": "벤치마크용 캐릭터입니다.",
+                    "character_info": "차분한 성격",
+                    "is_character_public": True,
+                    "is_description_public": True,
+                    "is_example_public": True,
+                    "hashtags": [{"tag_name": "태그1"}, {"tag_name": "태그2"}],
+                },
+            },
+            "characters.detail.get": lambda i: {
+                "method": "get",
+                "path": f"{CHARACTERS}/{character.pk}/",
+            },
+            "characters.detail.put": lambda i: {
+                "method": "put",
+                "path": f"{CHARACTERS}/{character.pk}/",
+                "data": {"creator_comment": f"벤치마크 {i}"},
+            },
+            "characters.detail.delete": delete_character,
+            "characters.search.name": lambda i: {
+                "method": "get",
+                "path": f"{CHARACTERS}/search/?name=캐릭터1",
+            },
+            "characters.search.hashtag": lambda i: {
+                "method": "get",
+                "path": f"{CHARACTERS}/search/?name=%23태그1 %23태그2",
+            },
+            "characters.scrap": lambda i: {
+                "method": "post",
+                "path": f"{CHARACTERS}/scrap/{characters[i % len(characters)].pk}/",
+            },
+            "characters.my_scrap": lambda i: {
+                "method": "get",
+                "path": f"{CHARACTERS}/my_scrap_characters/",
+            },
+            "characters.my_created": lambda i: {
+                "method": "get",
+                "path": f"{CHARACTERS}/my_created_chracters/",
+            },
+            # rooms
+            "rooms.list": lambda i: {"method": "get", "path": f"{ROOMS}/"},
+            "rooms.create": lambda i: {
+                "method": "post",
+                "path": f"{ROOMS}/",
+                "data": {"character_id": str(rng.choice(characters).pk)},
+            },
+            "rooms.fixation": lambda i: {
+                "method": "patch",
+                "path": f"{ROOMS}/{smallest.uuid}/",
+            },
+            "rooms.delete": lambda i: {
+                "method": "delete",
+                "path": f"{ROOMS}/{throwaway_room(100).uuid}/",
+            },
+            "rooms.job_status": job_status,
+            "rooms.message.delete": delete_message,
+        }
+
+        # 채팅방 크기별로 측정하는 시나리오
+        for size, room in rooms.items():
+            base = f"{ROOMS}/{room.uuid}"
+            # 재생성은 마지막 메시지가 AI 응답이어야 하므로, 대기열 시나리오가 사용자 메시지를 남기는
+            # 채팅방 대신 같은 크기(짝수)의 AI 응답으로 끝나는 채팅방을 따로 사용합니다.
+            regenerate_base = f"{ROOMS}/{throwaway_room(size + size % 2).uuid}"
+            scenarios.update(
+                {
+                    f"rooms.detail[{size}]": lambda i, base=base: {
+                        "method": "get",
+                        "path": f"{base}/",
+                    },
+                    f"rooms.messages[{size}]": lambda i, base=base: {
+                        "method": "post",
+                        "path": f"{base}/messages/",
+                        "data": {"message": f"벤치마크 메시지 {i}"},
+                    },
+                    f"rooms.messages.stream[{size}]": lambda i, base=base: {
+                        "method": "post",
+                        "path": f"{base}/messages/stream/",
+                        "data": {"message": f"스트리밍 메시지 {i}"},
+                    },
+                    f"rooms.messages.queue[{size}]": lambda i, base=base: {
+                        "method": "post",
+                        "path": f"{base}/messages/?mode=queue",
+                        "data": {"message": f"대기열 메시지 {i}"},
+                    },
+                    f"rooms.message.put[{size}]": lambda i, base=base, room=room: {
+                        "method": "put",
+                        "path": f"{base}/messages/{last_ai_chat(room).pk}/",
+                        "data": {"message": f"수정된 메시지 {i}"},
+                    },
+                    f"rooms.message.main[{size}]": lambda i, base=base, room=room: {
+                        "method": "patch",
+                        "path": f"{base}/messages/{regenerated_chat(room).pk}/",
+                    },
+                    f"rooms.suggestions[{size}]": lambda i, base=base: {
+                        "method": "post",
+                        "path": f"{base}/suggestions/",
+                    },
+                    f"rooms.regenerate[{size}]": lambda i, base=regenerate_base: {
+                        "method": "post",
+                        "path": f"{base}/regenerate/",
+                    },
+                    f"rooms.histories.get[{size}]": lambda i, base=base: {
+                        "method": "get",
+                        "path": f"{base}/histories/",
+                    },
+                    f"rooms.histories.save[{size}]": lambda i, base=base: {
+                        "method": "post",
+                        "path": f"{base}/histories/",
+                        "data": {"title": f"벤치마크 {i}"},
+                    },
+                }
+            )
+
+        # 대화 내역 상세 조회/수정/삭제/불러오기
+        history_room = rooms[max(size for size in rooms if size <= 1000)]
+        history = throwaway_history(history_room)
+        history_base = f"{ROOMS}/{history_room.uuid}/histories"
+
+        def load_history(i):
+            room = Room.objects.create(
+                user=bench_user, character=history_room.character
+            )
+            return {
+                "method": "patch",
+                "path": f"{ROOMS}/{room.uuid}/histories/{history.pk}/",
+            }
+
+        scenarios.update(
+            {
+                "rooms.history.get": lambda i: {
+                    "method": "get",
+                    "path": f"{history_base}/{history.pk}/",
+                },
+                "rooms.history.put": lambda i: {
+                    "method": "put",
+                    "path": f"{history_base}/{history.pk}/",
+                    "data": {"title": f"제목 {i}"},
+                },
+                "rooms.history.delete": lambda i: {
+                    "method": "delete",
+                    "path": (f"{history_base}/{throwaway_history(smallest).pk}/"),
+                },
+                "rooms.history.load": load_history,
+            }
+        )
+
+        return client, scenarios
+
+    def run(self, bench_user, rooms, options):
+        client, scenarios = self.build_scenarios(bench_user, rooms, options)
+        results = {}
+
+        # 500 응답과 쿼리 수는 결과에 기록되므로 요청마다 traceback/예산 경고를 출력하지 않습니다.
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        logging.getLogger("beta.middleware").setLevel(logging.ERROR)
+
+        for name, scenario in scenarios.items():
+            if options["only"] and options["only"] not in name:
+                continue
+
+            iterations = options["iterations"]
+            if name.startswith(HEAVY_SCENARIOS):
+                iterations = min(iterations, options["heavy_iterations"])
+
+            self.stdout.write(f"{name} ...", ending="")
+            self.stdout.flush()
+            results[name] = run_scenario(
+                client,
+                scenario,
+                iterations,
+                warmup=options["warmup"],
+                profile_samples=options["profile_samples"],
+            )
+            self.stdout.write(f" p50={results[name]['p50_ms']}ms")
+
+            unexpected = results[name]["unexpected_status_codes"]
+            if unexpected:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"  {name}: 예상하지 않은 응답 상태 코드 {unexpected} "
+                        "(오류 응답의 지연 시간이 기록되었습니다.)"
+                    )
+                )
+
+        return results
+
+    def get_meta(self, options, room_sizes):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "llm_backend": "fake",
+            "llm_latency_ms": options["llm_latency_ms"],
+            "iterations": options["iterations"],
+            "users": options["users"],
+            "characters": options["characters"],
+            "room_sizes": room_sizes,
+            "seed": options["seed"],
+        }
+
+    def print_results(self, results):
+        header = f"{'scenario':<36}{'p50':>10}{'p95':>10}{'p99':>10}{'queries':>9}{'alloc KB':>11}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<36}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+                f"{result['p99_ms']:>10}{result['queries']!s:>9}"
+                f"{result['alloc_peak_kb']!s:>11}"
+            )
+
+    # 이전 실행 대비 p50/p95/쿼리 수 변화를 출력합니다.
+    def print_comparison(self, path, results):
+        with open(path, encoding="utf-8") as file:
+            previous = json.load(file)["results"]
+
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'scenario':<36}{'p50 Δ%':>10}{'p95 Δ%':>10}{'queries':>14}"
+        )
+        for name, result in results.items():
+            before = previous.get(name)
+            if not before:
+                continue
+
+            def change(key):
+                if not before[key]:
+                    return "-"
+                return f"{(result[key] - before[key]) / before[key] * 100:+.1f}"
+
+            self.stdout.write(
+                f"{name:<36}{change('p50_ms'):>10}{change('p95_ms'):>10}"
+                f"{str(before['queries']) + '→' + str(result['queries']):>14}"
+            )
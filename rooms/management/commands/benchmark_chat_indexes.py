@@ -0,0 +1,163 @@
+# Python Library
+import json
+import statistics
+import time
+
+# Third-Party Packages
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+from django.db.models import Q
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+# Local Apps
+from rooms.benchmarks import seed_benchmark_data
+from rooms.models import Chat
+from rooms.services import ChatService
+
+# 0014_chat_indexes 이전 상태 (room FK 인덱스만 있음)
+BASELINE_INDEXES = [models.Index(fields=["room"], name="chat_room_fk_bench_idx")]
+
+
+class Command(BaseCommand):
+    help = (
+        "메시지가 많은 채팅방을 만든 별도 테스트 DB에서 Chat 조회 쿼리의 실행 계획(EXPLAIN)과 "
+        "소요 시간을 복합/부분 인덱스 적용 전(room FK 인덱스만)과 후로 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, default=50000, help="측정할 채팅방의 메시지 개수"
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--show-plans", action="store_true", help="전체 실행 계획을 출력합니다."
+        )
+        parser.add_argument("--output", help="결과를 JSON 파일로 저장합니다.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        try:
+            self.stdout.write("시드 데이터를 생성합니다...")
+            _, rooms = seed_benchmark_data(
+                users=options["users"], characters=20, room_sizes=[options["size"]]
+            )
+            queries = self.build_queries(rooms[options["size"]])
+
+            self.use_indexes(Chat._meta.indexes, BASELINE_INDEXES)
+            before = self.measure(queries, options["iterations"])
+
+            self.use_indexes(BASELINE_INDEXES, Chat._meta.indexes)
+            after = self.measure(queries, options["iterations"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.print_results(before, after, options["show_plans"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(
+                    {"size": options["size"], "before": before, "after": after},
+                    file,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+    # 뷰/서비스에서 실행하는 쿼리와 같은 조건의 쿼리
+    def build_queries(self, room):
+        chats = Chat.objects.filter(room=room)
+        ids = list(chats.order_by("id").values_list("id", flat=True))
+        group = (
+            chats.filter(regeneration_group__isnull=False)
+            .values_list("regeneration_group", flat=True)
+            .last()
+        )
+        service = ChatService()
+
+        return {
+            "history.window": service.get_history_queryset(room),
+            "history.window_budget": service.get_history_queryset(room, budget=2000),
+            "regenerate.last_message": chats.order_by("-created_at")[:1],
+            "regenerate.last_user_message": chats.filter(role="user").order_by(
+                "-created_at"
+            )[:1],
+            "regenerate.group": chats.filter(regeneration_group=group),
+            "delete.range": chats.filter(
+                Q(id__gte=ids[-100]) | Q(regeneration_group=group)
+            ).values_list("id", flat=True),
+            "room.chats": chats.order_by("created_at"),
+            "room.chats_page": chats.order_by("-created_at", "-id")[:51],
+        }
+
+    def use_indexes(self, removed, added):
+        with connection.schema_editor() as editor:
+            for index in removed:
+                editor.remove_index(Chat, index)
+            for index in added:
+                editor.add_index(Chat, index)
+
+        # 인덱스를 바꾼 뒤 통계를 갱신해 실행 계획에 반영합니다.
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Chat._meta.db_table}")
+
+    # 윈도우 함수로 거르는 쿼리는 QuerySet.explain() 이 감싼 SQL을 만들지 못해 직접 실행합니다.
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        prefix = (
+            "EXPLAIN (ANALYZE, BUFFERS)"
+            if connection.vendor == "postgresql"
+            else "EXPLAIN QUERY PLAN"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            return "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+
+    def measure(self, queries, iterations):
+        results = {}
+
+        for name, queryset in queries.items():
+            list(queryset.all())
+
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                list(queryset.all())
+                samples.append((time.perf_counter() - started) * 1000)
+
+            results[name] = {
+                "median_ms": round(statistics.median(samples), 3),
+                "plan": self.explain(queryset.all()),
+            }
+
+        return results
+
+    def print_results(self, before, after, show_plans):
+        header = f"{'query':<32}{'before ms':>12}{'after ms':>12}{'speedup':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for name in before:
+            old, new = before[name]["median_ms"], after[name]["median_ms"]
+            speedup = f"{old / new:.1f}x" if new else "-"
+            self.stdout.write(f"{name:<32}{old:>12}{new:>12}{speedup:>10}")
+
+        for name in before:
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for label, result in (("before", before[name]), ("after", after[name])):
+                lines = result["plan"].splitlines()
+                if show_plans:
+                    self.stdout.write(f"  [{label}]")
+                    for line in lines:
+                        self.stdout.write(f"    {line}")
+                else:
+                    # 최상위 노드와 테이블/인덱스 스캔 노드만 출력합니다.
+                    self.stdout.write(f"  [{label}] {lines[0].strip()}")
+                    for line in lines[1:]:
+                        if "Scan" in line:
+                            self.stdout.write(f"           {line.strip()}")
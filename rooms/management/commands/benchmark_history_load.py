@@ -0,0 +1,148 @@
+# Python Library
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+
+# Third-Party Packages
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.utils import timezone
+
+# Local Apps
+from accounts.models import User
+from characters.models import Character
+from rooms.benchmarks import AI_LINES, USER_LINES
+from rooms.history import load_history
+from rooms.models import Chat, Room
+
+
+# 이전 구현: 트랜잭션 없이 개수 조회, 삭제 후 메시지마다 INSERT
+def load_history_per_row(room, chat_history):
+    deleted_count = Chat.objects.filter(room=room).count()
+    Chat.objects.filter(room=room).delete()
+
+    for chat_data in chat_history:
+        Chat.objects.create(
+            room=room,
+            content=chat_data["content"],
+            role=chat_data["role"],
+            is_main=chat_data.get("is_main", True),
+            regeneration_group=chat_data.get("regeneration_group", None),
+            created_at=chat_data["timestamp"],
+        )
+
+    room.refresh_activity()
+    room.reset_summary()
+    return deleted_count, len(chat_history)
+
+
+LOADERS = {"per_row": load_history_per_row, "bulk": load_history}
+
+
+class Command(BaseCommand):
+    help = (
+        "별도 테스트 DB에서 저장된 대화 내역을 채팅방에 불러오는 시간을 "
+        "메시지마다 INSERT 하는 이전 구현과 배치 INSERT 구현으로 비교합니다 (메시지 1,000개당 ms)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="100,1000,2000,10000",
+            help="불러올 대화 내역의 메시지 개수 목록 (쉼표 구분)",
+        )
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--output", help="결과를 JSON 파일로 저장합니다.")
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+        try:
+            user = User.objects.create_user(username="bench_history")
+            character = Character.objects.create(
+                user=user, title="bench", name="bench", intro=[]
+            )
+            room = Room.objects.create(user=user, character=character)
+
+            results = {}
+            for size in sizes:
+                chat_history = self.build_history(size)
+                results[size] = {
+                    name: self.measure(loader, room, chat_history, options)
+                    for name, loader in LOADERS.items()
+                }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.print_results(results)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+    # HistoryAPIView.post 가 저장하는 형식과 같은 대화 내역
+    def build_history(self, size):
+        rng = random.Random(size)
+        started_at = timezone.now() - timedelta(seconds=size * 30)
+        return [
+            {
+                "content": rng.choice(USER_LINES if i % 2 == 0 else AI_LINES),
+                "role": "user" if i % 2 == 0 else "ai",
+                "is_main": True,
+                "regeneration_group": None,
+                "timestamp": (started_at + timedelta(seconds=i * 30)).isoformat(),
+            }
+            for i in range(size)
+        ]
+
+    def measure(self, loader, room, chat_history, options):
+        # 불러오기 전에 채팅방에 같은 크기의 대화가 있는 상태 (기존 메시지 삭제 비용 포함)
+        loader(room, chat_history)
+
+        samples = []
+        for _ in range(options["iterations"]):
+            started = time.perf_counter()
+            loader(room, chat_history)
+            samples.append((time.perf_counter() - started) * 1000)
+
+        # 쿼리 로그가 가득 차 있으면 새 쿼리를 셀 수 없으므로 비웁니다.
+        reset_queries()
+        with CaptureQueriesContext(connection) as context:
+            loader(room, chat_history)
+
+        median = statistics.median(samples)
+        return {
+            "median_ms": round(median, 1),
+            "ms_per_1k": round(median / len(chat_history) * 1000, 1),
+            "queries": len(context.captured_queries),
+        }
+
+    def print_results(self, results):
+        header = (
+            f"{'messages':>10}{'loader':>10}{'median ms':>12}"
+            f"{'ms / 1k':>10}{'queries':>10}"
+        )
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for size, loaders in results.items():
+            for name, result in loaders.items():
+                self.stdout.write(
+                    f"{size:>10}{name:>10}{result['median_ms']:>12}"
+                    f"{result['ms_per_1k']:>10}{result['queries']:>10}"
+                )
+
+            speedup = loaders["per_row"]["median_ms"] / loaders["bulk"]["median_ms"]
+            self.stdout.write(f"{'':>10}{'speedup':>10}{speedup:>11.1f}x")
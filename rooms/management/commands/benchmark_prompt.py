@@ -0,0 +1,171 @@
+# Python Library
+import time
+import tracemalloc
+
+# Third-Party Packages
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Local Apps
+from characters.models import Character
+from rooms.benchmarks import percentile
+from rooms.llm import llm_registry
+from rooms.services import ChatService
+
+
+# 모델에 전달된 메시지 목록을 기록합니다.
+class PromptRecorder(BaseCallbackHandler):
+    def __init__(self):
+        self.prompts = []
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.prompts.append([(m.type, m.content) for m in messages[0]])
+
+
+class Command(BaseCommand):
+    help = (
+        "지연 없는 가짜 LLM으로 AI 응답 1회당 프롬프트 조립 + 모델 호출 오버헤드를 "
+        "PROMPT_ASSEMBLY=langchain(메모리 + LLMChain)과 lean(메시지 직접 조립)으로 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument(
+            "--history-sizes",
+            default="0,10,20,50",
+            help="대화 내역 메시지 개수 목록 (쉼표 구분)",
+        )
+        parser.add_argument(
+            "--summary", action="store_true", help="대화 요약 메시지를 포함합니다."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["history_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--history-sizes 는 쉼표로 구분된 정수여야 합니다.")
+
+        fake_llm = {
+            **settings.FAKE_LLM,
+            "latency": "fixed",
+            "latency_ms": 0.0,
+            "tokens_per_second": 10**9,
+            "error_rate": 0.0,
+        }
+
+        with override_settings(
+            LLM_BACKEND="fake",
+            FAKE_LLM=fake_llm,
+            CONVERSATION_HISTORY_LIMIT=max(sizes + [1]),
+        ):
+            llm_registry.reset()
+            try:
+                self.run(sizes, options)
+            finally:
+                llm_registry.reset()
+
+    def build_character(self):
+        # DB에 저장하지 않은 캐릭터 (프롬프트 캐시 키만 사용합니다.)
+        return Character(
+            name="벤치",
+            title="프롬프트 벤치마크",
+            intro=[{"id": "1", "role": "system", "message": "안녕하세요."}],
+            description="프롬프트 조립 비용 측정용 캐릭터입니다. " * 5,
+            character_info="성격: 차분함",
+            example_situation=[
+                [
+                    {"role": "user", "message": "안녕?"},
+                    {"role": "ai", "message": "*손을 흔든다* 안녕!"},
+                ]
+            ],
+            presentation="존댓말",
+        )
+
+    def build_entries(self, size):
+        return [
+            (
+                index,
+                "user" if index % 2 == 0 else "ai",
+                f"{index}번째 메시지입니다. " * 8,
+                40,
+            )
+            for index in range(size)
+        ]
+
+    def langchain_call(self, service, character, entries, summary, recorder):
+        memory = service.build_memory(entries, summary)
+        chain = service.create_conversation_chain(character, memory)
+        return chain.predict(input="다음 이야기를 들려줘", callbacks=[recorder])
+
+    def lean_call(self, service, character, entries, summary, recorder):
+        messages = service.build_chat_messages(
+            character,
+            service.build_history_messages(entries, summary),
+            "다음 이야기를 들려줘",
+        )
+        return service.llm.invoke(messages, config={"callbacks": [recorder]}).content
+
+    def measure(self, call, iterations, warmup):
+        for _ in range(warmup):
+            call()
+
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - started) * 1_000_000)
+
+        tracemalloc.start()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "p50_us": round(percentile(samples, 50), 1),
+            "p95_us": round(percentile(samples, 95), 1),
+            "mean_us": round(sum(samples) / len(samples), 1),
+            "alloc_peak_kb": round(peak / 1024, 1),
+        }
+
+    def run(self, sizes, options):
+        service = ChatService()
+        character = self.build_character()
+        summary = "이전에 나눈 대화의 요약입니다. " * 10 if options["summary"] else ""
+
+        header = f"{'history':>8}{'path':>11}{'p50 µs':>10}{'p95 µs':>10}{'mean µs':>10}{'alloc KB':>10}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for size in sizes:
+            entries = self.build_entries(size)
+            results = {}
+
+            for name, method in (
+                ("langchain", self.langchain_call),
+                ("lean", self.lean_call),
+            ):
+                recorder = PromptRecorder()
+                reply = method(service, character, entries, summary, recorder)
+                results[name] = (recorder.prompts[0], reply)
+
+                result = self.measure(
+                    lambda: method(service, character, entries, summary, recorder),
+                    options["iterations"],
+                    options["warmup"],
+                )
+                recorder.prompts.clear()
+                self.stdout.write(
+                    f"{size:>8}{name:>11}{result['p50_us']:>10}{result['p95_us']:>10}"
+                    f"{result['mean_us']:>10}{result['alloc_peak_kb']:>10}"
+                )
+
+            # 두 경로가 같은 프롬프트를 모델에 전달하고 같은 응답을 받는지 확인합니다.
+            if results["langchain"] != results["lean"]:
+                raise CommandError(
+                    f"대화 내역 {size}개: 두 경로의 프롬프트가 다릅니다."
+                )
+
+        self.stdout.write(self.style.SUCCESS("두 경로의 프롬프트가 동일합니다."))
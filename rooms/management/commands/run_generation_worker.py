@@ -0,0 +1,76 @@
+# Python Library
+import time
+
+# Third-Party Packages
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+# Local Apps
+from rooms.jobs import claim_next_job, requeue_stale_jobs, run_job
+
+# 프로세스마다 따로 저장되는 캐시 백엔드
+LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+class Command(BaseCommand):
+    help = "대기 중인 AI 응답 생성 작업(GenerationJob)을 처리하는 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="대기 중인 작업이 없을 때 다시 확인하기까지 기다리는 시간(초)",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="running 상태로 이 시간(초) 이상 남은 작업은 다시 대기열에 넣습니다.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 중인 작업을 모두 처리한 뒤 종료합니다.",
+        )
+
+    # 워커는 웹 프로세스와 다른 프로세스이므로, 대화 창 캐시가 프로세스마다 따로 저장되면
+    # 웹에서 메시지를 저장/수정/삭제해도 워커의 캐시는 무효화되지 않아 오래된 대화로 응답을 생성합니다.
+    def check_shared_cache(self):
+        if not settings.CONVERSATION_WINDOW_CACHE:
+            return
+
+        backend = settings.CACHES["default"]["BACKEND"]
+        if backend in LOCAL_CACHE_BACKENDS:
+            raise CommandError(
+                f"응답 생성 워커는 웹 프로세스와 공유하는 캐시가 필요합니다 (현재: {backend}). "
+                "CACHE_URL 에 redis 등 공유 캐시를 지정하거나 CONVERSATION_WINDOW_CACHE=False 로 실행하세요."
+            )
+
+    def handle(self, *args, **options):
+        self.check_shared_cache()
+        self.stdout.write("응답 생성 워커를 시작합니다.")
+
+        while True:
+            close_old_connections()
+
+            requeued = requeue_stale_jobs(options["stale_after"])
+            if requeued:
+                self.stdout.write(
+                    f"중단된 작업 {requeued}개를 다시 대기열에 넣었습니다."
+                )
+
+            job = claim_next_job()
+
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = run_job(job)
+            self.stdout.write(f"[{job.status}] {job.uuid}")
@@ -0,0 +1,156 @@
+# Python Library
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Third-Party Packages
+from django.core.management.base import BaseCommand, CommandError
+
+# 워커 시작 시 불러오면 안 되는 (LLM을 처음 호출할 때 불러오는) 패키지
+HEAVY_PACKAGES = (
+    "langchain",
+    "langchain_core",
+    "langchain_google_genai",
+    "google.generativeai",
+    "grpc",
+    "google.protobuf",
+)
+
+# 새 프로세스에서 실행할 코드 (manage.py 명령과 ASGI 워커가 첫 요청 전까지 하는 일)
+SCENARIOS = {
+    # django.setup() + URLconf (migrate/check 등 시스템 체크, 워커의 첫 요청 처리 전)
+    "worker": "",
+    # 첫 LLM 호출 시 추가로 불러오는 모듈
+    "worker+llm": (
+        "import langchain.chains, langchain.memory, langchain.prompts\n"
+        "import langchain_google_genai\n"
+        "import rooms.callbacks, rooms.fake_llm\n"
+    ),
+}
+
+SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+{extra}
+print(json.dumps({{
+    "ms": (time.perf_counter() - started) * 1000,
+    # Linux 기준 KB 단위
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "새 프로세스에서 Django 설정과 URLconf를 불러오는 데 걸리는 시간(cold start)과 최대 RSS를 측정하고, "
+        "-X importtime 결과로 오래 걸리는 최상위 모듈을 출력합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--output", help="결과를 JSON 파일로 저장합니다.")
+        parser.add_argument(
+            "--compare", help="이전 결과 JSON 파일과 비교해 변화를 출력합니다."
+        )
+
+    def handle(self, *args, **options):
+        results = {}
+
+        for name, extra in SCENARIOS.items():
+            script = SCRIPT.format(extra=extra, heavy=HEAVY_PACKAGES)
+            runs = [self.run_script(script) for _ in range(options["repeat"])]
+
+            results[name] = {
+                "ms": round(statistics.median(run["ms"] for run in runs), 1),
+                "rss_mb": round(
+                    statistics.median(run["rss_kb"] for run in runs) / 1024, 1
+                ),
+                "modules": runs[-1]["modules"],
+                "loaded": runs[-1]["loaded"],
+                "imports": self.profile_imports(script, options["top"]),
+            }
+
+        self.print_results(results)
+
+        if options["compare"]:
+            self.print_comparison(options["compare"], results)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+
+    def execute_script(self, script, *flags):
+        process = subprocess.run(
+            [sys.executable, *flags, "-c", script],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        if process.returncode != 0:
+            raise CommandError(process.stderr.strip().splitlines()[-1])
+        return process
+
+    def run_script(self, script):
+        process = self.execute_script(script)
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    # -X importtime 출력에서 최상위(들여쓰기 없는) 모듈의 누적 시간을 모읍니다.
+    def profile_imports(self, script, top):
+        process = self.execute_script(script, "-X", "importtime")
+        imports = []
+
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+
+            _, cumulative, module = line[len("import time:") :].split("|")
+            if module.startswith("  ") or not cumulative.strip().isdigit():
+                continue
+
+            imports.append((module.strip(), int(cumulative) / 1000))
+
+        imports.sort(key=lambda item: item[1], reverse=True)
+        return [
+            {"module": module, "cumulative_ms": round(ms, 1)}
+            for module, ms in imports[:top]
+        ]
+
+    def print_results(self, results):
+        for name, result in results.items():
+            self.stdout.write(
+                f"[{name}] {result['ms']} ms, 최대 RSS {result['rss_mb']} MB, "
+                f"모듈 {result['modules']}개"
+            )
+            self.stdout.write(
+                f"  불러온 LLM 패키지: {', '.join(result['loaded']) or '없음'}"
+            )
+            for item in result["imports"]:
+                self.stdout.write(
+                    f"  {item['cumulative_ms']:>9.1f} ms  {item['module']}"
+                )
+            self.stdout.write("")
+
+    def print_comparison(self, path, results):
+        with open(path, encoding="utf-8") as file:
+            previous = json.load(file)
+
+        for name, result in results.items():
+            before = previous.get(name)
+            if not before:
+                continue
+
+            self.stdout.write(
+                f"[{name}] {before['ms']} → {result['ms']} ms "
+                f"({(result['ms'] - before['ms']) / before['ms'] * 100:+.1f}%), "
+                f"RSS {before['rss_mb']} → {result['rss_mb']} MB"
+            )
@@ -0,0 +1,218 @@
+# Python Library
+import threading
+from bisect import bisect_left
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+MESSAGE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, name, description, buckets, labelnames=()):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "buckets": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def format_labels(self, key, **extra):
+        pairs = list(zip(self.labelnames, key)) + list(extra.items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+
+        with self._lock:
+            series = {key: dict(value) for key, value in self._series.items()}
+
+        for key, value in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, value["buckets"]):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{self.format_labels(key, le=bound)} {cumulative}"
+                )
+            lines.append(
+                f"{self.name}_bucket{self.format_labels(key, le='+Inf')} {value['count']}"
+            )
+            lines.append(f"{self.name}_sum{self.format_labels(key)} {value['sum']}")
+            lines.append(f"{self.name}_count{self.format_labels(key)} {value['count']}")
+
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    def __init__(self, name, description, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+
+        with self._lock:
+            values = dict(self._values)
+
+        for key, value in sorted(values.items()):
+            pairs = ",".join(
+                f'{name}="{label}"' for name, label in zip(self.labelnames, key)
+            )
+            lines.append(
+                f"{self.name}{{{pairs}}} {value}" if pairs else f"{self.name} {value}"
+            )
+
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+# 프로세스 내에서 집계되는 메트릭 모음 (워커 프로세스마다 따로 집계됩니다.)
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def histogram(self, name, description, buckets, labelnames=()):
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, description, buckets, labelnames)
+        return self._metrics[name]
+
+    def counter(self, name, description, labelnames=()):
+        if name not in self._metrics:
+            self._metrics[name] = Counter(name, description, labelnames)
+        return self._metrics[name]
+
+    # collector()는 (이름, 설명, 타입, {라벨 딕셔너리 튜플: 값}) 목록을 반환합니다.
+    def register_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+
+        for collector in self._collectors:
+            for name, description, kind, samples in collector():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples.items():
+                    label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                    label_text = f"{{{label_text}}}" if label_text else ""
+                    lines.append(f"{name}{label_text} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+metrics = MetricsRegistry()
+
+llm_duration = metrics.histogram(
+    "beta_llm_request_duration_seconds",
+    "LLM 호출 전체 소요 시간",
+    SECONDS_BUCKETS,
+    ("kind", "outcome"),
+)
+llm_first_token = metrics.histogram(
+    "beta_llm_time_to_first_token_seconds",
+    "스트리밍 호출에서 첫 토큰까지 걸린 시간",
+    SECONDS_BUCKETS,
+    ("kind",),
+)
+llm_input_tokens = metrics.histogram(
+    "beta_llm_input_tokens", "LLM 입력 토큰 수", TOKEN_BUCKETS, ("kind",)
+)
+llm_output_tokens = metrics.histogram(
+    "beta_llm_output_tokens", "LLM 출력 토큰 수", TOKEN_BUCKETS, ("kind",)
+)
+llm_cached_input_tokens = metrics.histogram(
+    "beta_llm_cached_input_tokens",
+    "입력 토큰 중 컨텍스트 캐시에서 읽은 토큰 수",
+    TOKEN_BUCKETS,
+    ("kind",),
+)
+llm_history_messages = metrics.histogram(
+    "beta_llm_history_messages",
+    "프롬프트에 포함된 대화 내역 메시지 수",
+    MESSAGE_BUCKETS,
+    ("kind",),
+)
+llm_system_prompt_tokens = metrics.histogram(
+    "beta_llm_system_prompt_tokens",
+    "첫 번째 시스템 프롬프트의 추정 토큰 수",
+    TOKEN_BUCKETS,
+    ("kind",),
+)
+
+
+def llm_callbacks(kind):
+    # LangChain 은 LLM을 처음 호출할 때 불러옵니다.
+    from .callbacks import LLMMetricsCallback
+
+    return [LLMMetricsCallback(kind)]
+
+
+# LLM 클라이언트 레지스트리와 프롬프트 캐시의 현재 상태
+def collect_cache_stats():
+    from .caches import prompt_cache
+    from .llm import llm_registry
+
+    return [
+        (
+            "beta_llm_clients",
+            "LLM 클라이언트 생성/재사용/폐기 횟수, 현재 개수와 이벤트 루프 수",
+            "gauge",
+            {(("state", key),): value for key, value in llm_registry.stats().items()},
+        ),
+        (
+            "beta_prompt_cache",
+            "프롬프트 캐시 적중/실패/제거 횟수와 크기",
+            "gauge",
+            {(("stat", key),): value for key, value in prompt_cache.stats().items()},
+        ),
+    ]
+
+
+metrics.register_collector(collect_cache_stats)
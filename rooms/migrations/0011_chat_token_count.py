@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:01
+
+from django.db import migrations, models
+
+from rooms.tokens import estimate_tokens
+
+
+def fill_token_count(apps, schema_editor):
+    Chat = apps.get_model("rooms", "Chat")
+
+    batch = []
+    for chat in Chat.objects.only("id", "content").iterator(chunk_size=1000):
+        chat.token_count = estimate_tokens(chat.content)
+        batch.append(chat)
+
+        if len(batch) >= 1000:
+            Chat.objects.bulk_update(batch, ["token_count"])
+            batch = []
+
+    if batch:
+        Chat.objects.bulk_update(batch, ["token_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0010_merge_20250703_1555"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chat",
+            name="token_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_token_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0011_chat_token_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="summarized_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="summary",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
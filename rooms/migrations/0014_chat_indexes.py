@@ -0,0 +1,97 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:29
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# room FK 의 단일 컬럼 인덱스를 CONCURRENTLY 로 삭제합니다. (room 으로 시작하는 복합 인덱스가 대신합니다.)
+# AlterField(db_index=False)는 외래 키 제약 조건을 삭제 후 다시 만들면서 테이블 전체를 검사하므로 DB 에는 적용하지 않습니다.
+def drop_room_fk_index(apps, schema_editor):
+    table = apps.get_model("rooms", "Chat")._meta.db_table
+    connection = schema_editor.connection
+
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+
+    for name, info in constraints.items():
+        if (
+            info["index"]
+            and not info["unique"]
+            and not info["primary_key"]
+            and info["columns"] == ["room_id"]
+        ):
+            schema_editor.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}"
+            )
+
+
+def create_room_fk_index(apps, schema_editor):
+    table = apps.get_model("rooms", "Chat")._meta.db_table
+    name = schema_editor._create_index_name(table, ["room_id"])
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {schema_editor.quote_name(name)} "
+        f"ON {schema_editor.quote_name(table)} ({schema_editor.quote_name('room_id')})"
+    )
+
+
+class Migration(migrations.Migration):
+    # 인덱스를 CONCURRENTLY 로 생성해 배포 중에도 rooms_chat 쓰기를 막지 않습니다.
+    # (트랜잭션 안에서는 실행할 수 없으므로 atomic = False)
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0013_generationjob"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="chat",
+            index=models.Index(
+                fields=["room", "created_at", "id"], name="chat_room_created_id_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="chat",
+            index=models.Index(
+                fields=["room", "role", "created_at"], name="chat_room_role_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("is_main", True)),
+                fields=["room", "created_at", "id"],
+                name="chat_room_main_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="chat",
+            index=models.Index(
+                condition=models.Q(("regeneration_group__isnull", False)),
+                fields=["room", "regeneration_group"],
+                name="chat_room_regen_group_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="chat",
+            index=models.Index(fields=["room", "id"], name="chat_room_id_idx"),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chat",
+                    name="room",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chats",
+                        to="rooms.room",
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_room_fk_index, create_room_fk_index),
+            ],
+        ),
+    ]
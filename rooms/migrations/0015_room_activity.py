@@ -0,0 +1,69 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:35
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+
+# 기존 채팅방의 메시지 수, 마지막 메시지 시각/미리보기를 한 번의 UPDATE 로 채웁니다.
+def fill_room_activity(apps, schema_editor):
+    Room = apps.get_model("rooms", "Room")
+    Chat = apps.get_model("rooms", "Chat")
+
+    chats = Chat.objects.filter(room=OuterRef("pk")).order_by()
+    Room.objects.update(
+        chat_count=Coalesce(
+            Subquery(
+                chats.values("room").annotate(count=Count("id")).values("count"),
+                output_field=IntegerField(),
+            ),
+            Value(0),
+        ),
+        last_chat_at=Coalesce(
+            Subquery(
+                chats.values("room")
+                .annotate(last_chat_at=Max("created_at"))
+                .values("last_chat_at")
+            ),
+            F("created_at"),
+        ),
+        last_message_preview=Coalesce(
+            Substr(
+                Subquery(
+                    chats.filter(is_main=True)
+                    .order_by("-created_at", "-id")
+                    .values("content")[:1]
+                ),
+                1,
+                100,
+            ),
+            Value(""),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("rooms", "0014_chat_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="chat_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="last_chat_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="last_message_preview",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.RunPython(fill_room_activity, migrations.RunPython.noop),
+    ]
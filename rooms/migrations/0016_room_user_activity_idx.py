@@ -0,0 +1,77 @@
+# Generated by Django 5.1.7 on 2026-10-17 06:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+# user FK 의 단일 컬럼 인덱스를 CONCURRENTLY 로 삭제합니다. (room_user_activity_uuid_idx 가 user 로 시작해 대신합니다.)
+# AlterField(db_index=False)는 외래 키 제약 조건을 삭제 후 다시 만들면서 테이블 전체를 검사하므로 DB 에는 적용하지 않습니다.
+def drop_user_fk_index(apps, schema_editor):
+    table = apps.get_model("rooms", "Room")._meta.db_table
+    connection = schema_editor.connection
+
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+
+    for name, info in constraints.items():
+        if (
+            info["index"]
+            and not info["unique"]
+            and not info["primary_key"]
+            and info["columns"] == ["user_id"]
+        ):
+            schema_editor.execute(
+                f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}"
+            )
+
+
+def create_user_fk_index(apps, schema_editor):
+    table = apps.get_model("rooms", "Room")._meta.db_table
+    name = schema_editor._create_index_name(table, ["user_id"])
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {schema_editor.quote_name(name)} "
+        f"ON {schema_editor.quote_name(table)} ({schema_editor.quote_name('user_id')})"
+    )
+
+
+class Migration(migrations.Migration):
+    # 인덱스를 CONCURRENTLY 로 생성해 배포 중에도 rooms_room 쓰기를 막지 않습니다.
+    # (트랜잭션 안에서는 실행할 수 없으므로 0015_room_activity 와 나눈 마이그레이션)
+    atomic = False
+
+    dependencies = [
+        ("rooms", "0015_room_activity"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="room",
+            index=models.Index(
+                models.F("user"),
+                models.OrderBy(models.F("fixation"), descending=True),
+                models.OrderBy(models.F("last_chat_at"), descending=True),
+                models.OrderBy(models.F("uuid"), descending=True),
+                name="room_user_activity_uuid_idx",
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="room",
+                    name="user",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rooms",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_user_fk_index, create_user_fk_index),
+            ],
+        ),
+    ]
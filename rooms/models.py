@@ -2,32 +2,113 @@
 import uuid
 
 # Third-Party Package
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Count, Max
 from django.utils import timezone
 
 # Local Apps
 from accounts.models import User
 from characters.models import Character
+from .tokens import estimate_tokens
+
+
+# 채팅방 목록에 보여주는 마지막 메시지 길이
+LAST_MESSAGE_PREVIEW_LENGTH = 100
 
 
 class Room(models.Model):
     uuid = models.UUIDField(primary_key=True, default=uuid.uuid4)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="rooms")
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="rooms", db_index=False
+    )
     character = models.ForeignKey(
         Character, on_delete=models.CASCADE, related_name="rooms"
     )
     fixation = models.BooleanField(default=False)
 
+    # 대화 윈도우 밖으로 밀려난 메시지들의 요약
+    summary = models.TextField(blank=True, default="")
+    summarized_until = models.DateTimeField(null=True, blank=True)
+
+    # 채팅방 목록용 비정규화 컬럼 (메시지 저장/수정/삭제/불러오기 시 갱신)
+    # last_chat_at 은 메시지가 없으면 채팅방 생성 시각입니다.
+    last_message_preview = models.CharField(
+        max_length=LAST_MESSAGE_PREVIEW_LENGTH, blank=True, default=""
+    )
+    last_chat_at = models.DateTimeField(default=timezone.now)
+    chat_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "채팅방"
         verbose_name_plural = "채팅방들"
+        # user 로 시작하는 복합 인덱스가 user FK 인덱스를 대신합니다.
+        indexes = [
+            # 채팅방 목록 (고정된 채팅방 먼저, 최근 대화 순), 키셋 페이지네이션 (uuid)
+            models.Index(
+                "user",
+                models.F("fixation").desc(),
+                models.F("last_chat_at").desc(),
+                models.F("uuid").desc(),
+                name="room_user_activity_uuid_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.uuid} ({self.character})"
 
+    @staticmethod
+    def make_preview(content):
+        return content[:LAST_MESSAGE_PREVIEW_LENGTH]
+
+    # 새 메시지 하나가 저장되었을 때 (전송, 재생성) 다시 세지 않고 갱신합니다.
+    def get_chat_added_values(self, chat):
+        return {
+            "chat_count": models.F("chat_count") + 1,
+            "last_chat_at": chat.created_at,
+            "last_message_preview": self.make_preview(chat.content),
+            "updated_at": timezone.now(),
+        }
+
+    def record_chat(self, chat):
+        Room.objects.filter(pk=self.pk).update(**self.get_chat_added_values(chat))
+
+    async def arecord_chat(self, chat):
+        await Room.objects.filter(pk=self.pk).aupdate(
+            **self.get_chat_added_values(chat)
+        )
+
+    # 메시지 수정/삭제/main 변경/대화 내역 불러오기 후 채팅방의 메시지로 다시 계산합니다.
+    def refresh_activity(self):
+        chats = Chat.objects.filter(room=self)
+        stats = chats.aggregate(count=Count("id"), last_chat_at=Max("created_at"))
+        last_chat = (
+            chats.filter(is_main=True)
+            .order_by("-created_at", "-id")
+            .only("content")
+            .first()
+        )
+
+        self.chat_count = stats["count"]
+        self.last_chat_at = stats["last_chat_at"] or self.created_at
+        self.last_message_preview = (
+            self.make_preview(last_chat.content) if last_chat else ""
+        )
+        Room.objects.filter(pk=self.pk).update(
+            chat_count=self.chat_count,
+            last_chat_at=self.last_chat_at,
+            last_message_preview=self.last_message_preview,
+            updated_at=timezone.now(),
+        )
+
+    def reset_summary(self):
+        self.summary = ""
+        self.summarized_until = None
+        Room.objects.filter(pk=self.pk).update(summary="", summarized_until=None)
+
 
 class Chat(models.Model):
     ROLE_CHOICES = [
@@ -36,13 +117,18 @@ class Chat(models.Model):
     ]
 
     id = models.AutoField(primary_key=True)
-    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="chats")
+    room = models.ForeignKey(
+        Room, on_delete=models.CASCADE, related_name="chats", db_index=False
+    )
     content = models.TextField()
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
 
     is_main = models.BooleanField(default=True)
     regeneration_group = models.UUIDField(null=True, blank=True)
 
+    # 대화 윈도우를 토큰 예산으로 자를 때 사용하는 추정 토큰 수
+    token_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -50,6 +136,67 @@ class Chat(models.Model):
         ordering = ["created_at"]
         verbose_name = "채팅 메시지"
         verbose_name_plural = "채팅 메시지들"
+        # room 으로 시작하는 복합 인덱스가 room FK 인덱스를 대신합니다.
+        indexes = [
+            # 채팅방 메시지 목록, 마지막 메시지 (created_at 순), 상세 조회 키셋 페이지네이션 (created_at, id)
+            models.Index(
+                fields=["room", "created_at", "id"], name="chat_room_created_id_idx"
+            ),
+            # 재생성 기준이 되는 마지막 사용자/AI 메시지
+            models.Index(
+                fields=["room", "role", "created_at"], name="chat_room_role_created_idx"
+            ),
+            # 프롬프트 대화 내역 윈도우 (is_main 메시지만, 최신순)
+            models.Index(
+                fields=["room", "created_at", "id"],
+                condition=models.Q(is_main=True),
+                name="chat_room_main_created_idx",
+            ),
+            # 재생성 그룹 조회 (재생성된 메시지만)
+            models.Index(
+                fields=["room", "regeneration_group"],
+                condition=models.Q(regeneration_group__isnull=False),
+                name="chat_room_regen_group_idx",
+            ),
+            # 특정 메시지 이후 삭제, 마지막 chat_id
+            models.Index(fields=["room", "id"], name="chat_room_id_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.token_count = estimate_tokens(self.content)
+
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"[{self.room.title}] {self.role}: {self.content[:30]}..."
+
+
+# 비동기 모드에서 요청 대신 워커(run_generation_worker)가 처리하는 AI 응답 생성 작업
+class GenerationJob(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    uuid = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="jobs")
+    user_message = models.TextField(blank=True, default="")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+
+    # 완료 시 채팅 메시지 전송 API와 같은 형식의 응답
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "응답 생성 작업"
+        verbose_name_plural = "응답 생성 작업들"
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.uuid} ({self.status})"
@@ -0,0 +1,128 @@
+# Python Library
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+# Third-Party Packages
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+
+# 정렬 키 값으로 다음 페이지 위치를 가리키는 키셋 페이지네이션
+# OFFSET 없이 정렬 순서와 같은 인덱스를 따라 읽으므로 앞쪽/뒤쪽 페이지의 비용이 같습니다.
+# 커서는 마지막 항목의 정렬 키 값을 JSON 으로 직렬화한 뒤 URL-safe base64 로 인코딩한 값입니다.
+class KeysetPaginator:
+    cursor_param = "cursor"
+    ordering = ()
+    page_size_setting = None
+    max_page_size_setting = None
+
+    # 커서에 담을 정렬 키 값 (JSON 직렬화 가능한 값)
+    def get_cursor_values(self, obj):
+        raise NotImplementedError
+
+    # 커서에서 꺼낸 값을 비교 가능한 값으로 변환합니다.
+    def parse_cursor_values(self, values):
+        raise NotImplementedError
+
+    # 커서 위치 다음 (정렬 순서상 뒤쪽) 항목만 남깁니다.
+    def filter_after(self, queryset, values):
+        raise NotImplementedError
+
+    def encode_cursor(self, obj):
+        payload = json.dumps(self.get_cursor_values(obj))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            return self.parse_cursor_values(
+                json.loads(base64.urlsafe_b64decode(padded))
+            )
+        except (binascii.Error, ValueError, TypeError, AttributeError):
+            raise ValidationError({self.cursor_param: "잘못된 커서입니다."})
+
+    def get_limit(self, value):
+        page_size = getattr(settings, self.page_size_setting)
+        if value is None:
+            return page_size
+
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValidationError({"limit": "정수여야 합니다."})
+
+        return min(max(limit, 1), getattr(settings, self.max_page_size_setting))
+
+    # (정렬 순서대로의 항목 목록, 다음 페이지 커서 또는 None)을 반환합니다.
+    def paginate(self, queryset, cursor=None, limit=None):
+        limit = self.get_limit(limit)
+
+        if cursor:
+            queryset = self.filter_after(queryset, self.decode_cursor(cursor))
+
+        items = list(queryset.order_by(*self.ordering)[: limit + 1])
+        has_more = len(items) > limit
+        items = items[:limit]
+
+        return items, self.encode_cursor(items[-1]) if has_more else None
+
+
+# 채팅 메시지 (created_at, id) 키셋 페이지네이션
+# 최신 메시지부터 limit 개를 오래된 순으로 반환하고, 더 오래된 메시지는 before 커서로 이어서 조회합니다.
+class ChatKeysetPaginator(KeysetPaginator):
+    cursor_param = "before"
+    ordering = ("-created_at", "-id")
+    page_size_setting = "ROOM_CHATS_PAGE_SIZE"
+    max_page_size_setting = "ROOM_CHATS_MAX_PAGE_SIZE"
+
+    def get_cursor_values(self, chat):
+        return [chat.created_at.isoformat(), chat.id]
+
+    def parse_cursor_values(self, values):
+        created_at, chat_id = values
+        return datetime.fromisoformat(created_at), int(chat_id)
+
+    def filter_after(self, queryset, values):
+        created_at, chat_id = values
+        return queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=chat_id)
+        )
+
+    # 화면에 출력하는 순서 (오래된 순)로 뒤집고, 이전 페이지 커서는 가장 오래된 메시지를 가리킵니다.
+    def paginate(self, queryset, before=None, limit=None):
+        chats, before = super().paginate(queryset, before, limit)
+        chats.reverse()
+        return chats, before
+
+
+# 채팅방 목록 (fixation, last_chat_at, uuid) 키셋 페이지네이션
+# 고정된 채팅방, 최근 대화한 채팅방 순으로 반환하고, 다음 페이지는 cursor 로 이어서 조회합니다.
+class RoomKeysetPaginator(KeysetPaginator):
+    ordering = ("-fixation", "-last_chat_at", "-uuid")
+    page_size_setting = "ROOMS_PAGE_SIZE"
+    max_page_size_setting = "ROOMS_MAX_PAGE_SIZE"
+
+    def get_cursor_values(self, room):
+        return [room.fixation, room.last_chat_at.isoformat(), str(room.uuid)]
+
+    def parse_cursor_values(self, values):
+        fixation, last_chat_at, room_uuid = values
+        if not isinstance(fixation, bool):
+            raise ValueError("fixation")
+        return fixation, datetime.fromisoformat(last_chat_at), uuid.UUID(room_uuid)
+
+    def filter_after(self, queryset, values):
+        fixation, last_chat_at, room_uuid = values
+        return queryset.filter(
+            Q(fixation__lt=fixation)
+            | Q(fixation=fixation, last_chat_at__lt=last_chat_at)
+            | Q(fixation=fixation, last_chat_at=last_chat_at, uuid__lt=room_uuid)
+        )
+
+
+chat_paginator = ChatKeysetPaginator()
+room_paginator = RoomKeysetPaginator()
@@ -0,0 +1,269 @@
+# Python Library
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+
+# Third-Party Packages
+from django.conf import settings
+
+# Local Apps
+from .metrics import metrics
+
+llm_hedges = metrics.counter(
+    "beta_llm_hedges_total", "지연으로 인해 보조 요청을 보낸 횟수", ("kind",)
+)
+llm_hedge_wins = metrics.counter(
+    "beta_llm_hedge_wins_total", "보조 요청이 먼저 응답한 횟수", ("kind",)
+)
+llm_calls = metrics.counter(
+    "beta_llm_calls_total", "마감 시간/헤징이 적용된 LLM 호출 수", ("kind", "outcome")
+)
+
+# 헤징은 응답 전체를 한 번에 받는 호출에만 적용합니다. (스트리밍 제외)
+HEDGED_KINDS = ("chat", "regenerate", "suggestion")
+
+
+class LLMUnavailable(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMUnavailable):
+    pass
+
+
+class DeadlineExceeded(LLMUnavailable):
+    pass
+
+
+# 연속 실패가 LLM_CIRCUIT_FAILURES 번 쌓이면 LLM_CIRCUIT_RESET 초 동안 호출하지 않고 바로 실패합니다.
+# 이후 한 번의 시험 호출(half-open)이 성공하면 다시 닫힙니다.
+class CircuitBreaker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+
+    def before_call(self):
+        if not settings.LLM_CIRCUIT_FAILURES:
+            return
+
+        reset_timeout = settings.LLM_CIRCUIT_RESET
+        now = time.monotonic()
+
+        with self._lock:
+            if self.state == "open":
+                remaining = self.opened_at + reset_timeout - now
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        "LLM 호출이 일시적으로 차단되었습니다.",
+                        retry_after=math.ceil(remaining),
+                    )
+                self.state = "half_open"
+                self.probe_started = now
+                return
+
+            # 시험 호출이 끝나지 않았으면 다른 호출은 기다리지 않고 실패합니다.
+            if self.state == "half_open":
+                if now - self.probe_started < reset_timeout:
+                    raise CircuitOpenError(
+                        "LLM 호출 상태를 확인하는 중입니다.",
+                        retry_after=math.ceil(reset_timeout),
+                    )
+                self.probe_started = now
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        if not settings.LLM_CIRCUIT_FAILURES:
+            return
+
+        with self._lock:
+            self.failures += 1
+            if (
+                self.state == "half_open"
+                or self.failures >= settings.LLM_CIRCUIT_FAILURES
+            ):
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+
+# 성공한 호출의 최근 소요 시간으로 헤징 지연(p95)을 계산합니다.
+class LatencyTracker:
+    def __init__(self, size=200):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self.size = size
+
+    def add(self, kind, duration):
+        with self._lock:
+            self._samples.setdefault(kind, deque(maxlen=self.size)).append(duration)
+
+    def hedge_delay(self, kind):
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+
+        if len(samples) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return settings.LLM_HEDGE_DELAY
+
+        return samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+
+
+circuit_breaker = CircuitBreaker()
+latency_tracker = LatencyTracker()
+
+
+def get_deadline(kind):
+    return settings.LLM_DEADLINES.get(kind) or None
+
+
+async def timed_attempt(kind, factory):
+    started = time.monotonic()
+    result = await factory()
+    latency_tracker.add(kind, time.monotonic() - started)
+    return result
+
+
+# 첫 요청이 p95 지연 안에 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 성공한 결과를 사용합니다.
+async def hedged_call(kind, factory):
+    primary = asyncio.ensure_future(timed_attempt(kind, factory))
+    backup = None
+
+    try:
+        done, _ = await asyncio.wait(
+            {primary}, timeout=latency_tracker.hedge_delay(kind)
+        )
+        if done:
+            return primary.result()
+
+        llm_hedges.inc(kind=kind)
+        backup = asyncio.ensure_future(timed_attempt(kind, factory))
+        pending = {primary, backup}
+        error = None
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is backup:
+                        llm_hedge_wins.inc(kind=kind)
+                    return task.result()
+                error = task.exception()
+
+        raise error
+
+    finally:
+        for task in (primary, backup):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+# 비동기 LLM 호출에 서킷 브레이커, 마감 시간(LLM_DEADLINES), 헤징(LLM_HEDGING)을 적용합니다.
+# factory 는 호출할 때마다 새 코루틴을 반환해야 합니다.
+async def call_llm(kind, factory):
+    circuit_breaker.before_call()
+    deadline = get_deadline(kind)
+
+    if settings.LLM_HEDGING and kind in HEDGED_KINDS:
+        call = hedged_call(kind, factory)
+    else:
+        call = timed_attempt(kind, factory)
+
+    try:
+        result = await asyncio.wait_for(call, deadline)
+    except asyncio.TimeoutError:
+        circuit_breaker.record_failure()
+        llm_calls.inc(kind=kind, outcome="deadline")
+        raise DeadlineExceeded(
+            f"LLM 응답 시간이 초과되었습니다. ({deadline}초)",
+            retry_after=settings.LLM_CIRCUIT_RESET,
+        )
+    except Exception:
+        circuit_breaker.record_failure()
+        llm_calls.inc(kind=kind, outcome="error")
+        raise
+
+    circuit_breaker.record_success()
+    llm_calls.inc(kind=kind, outcome="success")
+    return result
+
+
+# 스트리밍 호출은 첫 조각이 마감 시간 안에 도착하는지만 확인합니다.
+async def stream_llm(kind, stream):
+    circuit_breaker.before_call()
+    iterator = stream.__aiter__()
+
+    try:
+        first = await asyncio.wait_for(iterator.__anext__(), get_deadline(kind))
+    except StopAsyncIteration:
+        circuit_breaker.record_success()
+        return
+    except asyncio.TimeoutError:
+        circuit_breaker.record_failure()
+        llm_calls.inc(kind=kind, outcome="deadline")
+        raise DeadlineExceeded(
+            "LLM 첫 응답 시간이 초과되었습니다.",
+            retry_after=settings.LLM_CIRCUIT_RESET,
+        )
+    except Exception:
+        circuit_breaker.record_failure()
+        llm_calls.inc(kind=kind, outcome="error")
+        raise
+
+    yield first
+
+    try:
+        async for chunk in iterator:
+            yield chunk
+    except Exception:
+        circuit_breaker.record_failure()
+        llm_calls.inc(kind=kind, outcome="error")
+        raise
+
+    circuit_breaker.record_success()
+    llm_calls.inc(kind=kind, outcome="success")
+
+
+# 동기 호출(작업 워커, 요약)은 클라이언트 timeout 으로 마감 시간을 적용하고 서킷 브레이커만 거칩니다.
+def call_llm_sync(kind, func):
+    circuit_breaker.before_call()
+
+    try:
+        result = func()
+    except Exception:
+        circuit_breaker.record_failure()
+        llm_calls.inc(kind=kind, outcome="error")
+        raise
+
+    circuit_breaker.record_success()
+    llm_calls.inc(kind=kind, outcome="success")
+    return result
+
+
+def collect_circuit_state():
+    return [
+        (
+            "beta_llm_circuit_open",
+            "LLM 서킷 브레이커 상태 (0: closed, 1: open, 0.5: half-open)",
+            "gauge",
+            {(): {"closed": 0, "half_open": 0.5, "open": 1}[circuit_breaker.state]},
+        )
+    ]
+
+
+metrics.register_collector(collect_circuit_state)
@@ -6,11 +6,12 @@ from django.utils import timezone
 from rest_framework import serializers
 
 # Local Apps
-from .models import Chat, Room
+from beta.timing import TimedSerializerMixin
+from .models import Chat, GenerationJob, Room
 from characters.models import ConversationHistory
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     room_id = serializers.CharField(source="uuid", read_only=True)
     character_id = serializers.SerializerMethodField()
     character_title = serializers.SerializerMethodField()
@@ -27,6 +28,8 @@ class RoomSerializer(serializers.ModelSerializer):
             "character_name",
             "character_image",
             "last_message",
+            "last_chat_at",
+            "chat_count",
             "fixation",
             "created_at",
             "updated_at",
@@ -47,10 +50,14 @@ class RoomSerializer(serializers.ModelSerializer):
         return None
 
     def get_last_message(self, obj):
-        if hasattr(obj, "latest_chat") and obj.latest_chat:
-            return obj.latest_chat[0].content
+        return obj.last_message_preview or "대화를 시작해보세요!"
 
-        return "대화를 시작해보세요!"
+
+# 채팅방 목록 한 페이지 (next 는 다음 페이지 커서)
+class RoomListSerializer(TimedSerializerMixin, serializers.Serializer):
+    rooms = RoomSerializer(many=True)
+    has_more = serializers.BooleanField()
+    next = serializers.CharField(allow_null=True)
 
 
 class RoomCreateSerializer(serializers.Serializer):
@@ -68,8 +75,11 @@ class RoomCreateResponseSerializer(RoomSerializer):
         ]
 
 
+# context 의 chats(한 페이지의 메시지), before(이전 페이지 커서)를 함께 출력합니다.
 class RoomDetailSerializer(RoomSerializer):
     chats = serializers.SerializerMethodField()
+    has_more = serializers.SerializerMethodField()
+    before = serializers.SerializerMethodField()
 
     class Meta(RoomSerializer.Meta):
         fields = [
@@ -80,11 +90,22 @@ class RoomDetailSerializer(RoomSerializer):
             "created_at",
             "updated_at",
             "chats",
+            "has_more",
+            "before",
         ]
 
     def get_chats(self, obj):
-        chats = Chat.objects.filter(room=obj).order_by("created_at")
-        return ChatDetailSerializer(chats, many=True).data
+        # 메시지 작성자 이름은 채팅방 단위로 한 번만 구합니다.
+        names = {"ai": obj.character.name, "user": obj.user.username}
+        return ChatDetailSerializer(
+            self.context["chats"], many=True, context={"names": names}
+        ).data
+
+    def get_has_more(self, obj):
+        return self.context["before"] is not None
+
+    def get_before(self, obj):
+        return self.context["before"]
 
 
 class RoomFixationSerializer(RoomSerializer):
@@ -98,7 +119,7 @@ class RoomFixationSerializer(RoomSerializer):
         ]
 
 
-class ChatDetailSerializer(serializers.ModelSerializer):
+class ChatDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     chat_id = serializers.CharField(source="id", read_only=True)
     name = serializers.SerializerMethodField()
 
@@ -107,6 +128,10 @@ class ChatDetailSerializer(serializers.ModelSerializer):
         fields = ["chat_id", "name", "content", "is_main", "created_at"]
 
     def get_name(self, obj):
+        names = self.context.get("names")
+        if names is not None:
+            return names["ai"] if obj.role == "ai" else names["user"]
+
         room = obj.room
         return room.character.name if obj.role == "ai" else room.user.username
 
@@ -115,7 +140,7 @@ class ChatRequestSerializer(serializers.Serializer):
     message = serializers.CharField(max_length=1000, allow_blank=True)
 
 
-class ChatResponseSerializer(serializers.ModelSerializer):
+class ChatResponseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     room_id = serializers.SerializerMethodField()
     user_id = serializers.SerializerMethodField()
     character_id = serializers.SerializerMethodField()
@@ -157,8 +182,24 @@ class ChatResponseSerializer(serializers.ModelSerializer):
         return input_user_message
 
 
-class ChatUpdateResponseSerializer(ChatDetailSerializer):
-    class Meta(ChatDetailSerializer.Meta):
+class GenerationJobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    job_id = serializers.CharField(source="uuid", read_only=True)
+
+    class Meta:
+        model = GenerationJob
+        fields = [
+            "job_id",
+            "status",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class ChatUpdateResponseSerializer(ChatResponseSerializer):
+    class Meta(ChatResponseSerializer.Meta):
         fields = [
             "room_id",
             "user_id",
@@ -171,7 +212,7 @@ class ChatUpdateResponseSerializer(ChatDetailSerializer):
         ]
 
 
-class HistoryListSerializer(serializers.ModelSerializer):
+class HistoryListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     saved_date = serializers.SerializerMethodField()
 
     class Meta:
@@ -192,7 +233,7 @@ class HistoryListSerializer(serializers.ModelSerializer):
             return obj.saved_at.strftime("%Y-%m-%d")
 
 
-class HistoryDetailSerializer(serializers.ModelSerializer):
+class HistoryDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     character_id = serializers.UUIDField(
         source="character.character_id", read_only=True
     )
@@ -1,60 +1,173 @@
 # Python Library
+import asyncio
+import json
 import logging
+from collections import namedtuple
 
 # Third-Party Packages
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains import LLMChain
-from langchain.memory import ConversationBufferWindowMemory
-from langchain.prompts import (
-    ChatPromptTemplate,
-    HumanMessagePromptTemplate,
-    MessagesPlaceholder,
-    SystemMessagePromptTemplate,
-)
+from django.db.models import F, Sum, Window
 
 # Local Apps
-from .models import Chat
+from .admission import admission
+from .background import create_background_task, run_in_background
+from .caches import prompt_cache, suggestion_cache, window_cache
+from .context_cache import context_cache
+from .llm import llm_registry
+from .metrics import llm_callbacks
+from .models import Chat, Room
+from .resilience import LLMUnavailable, call_llm, call_llm_sync, stream_llm
+from .tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# LangChain 은 불러오는 데 오래 걸리므로 모듈 수준이 아닌 처음 사용하는 메서드 안에서 불러옵니다.
+# (migrate, collectstatic 등 LLM을 사용하지 않는 명령과 워커 시작 시간 단축)
+
+# 캐릭터별로 컴파일된 프롬프트 (시스템 프롬프트 텍스트, ChatPromptTemplate, 추정 토큰 수, 시스템 메시지)
+CompiledPrompt = namedtuple(
+    "CompiledPrompt", ["text", "template", "tokens", "system_message"]
+)
+
 
 class ChatService:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.AI_MODEL,
-            temperature=settings.TEMPERATURE,
-            max_tokens=settings.MAX_TOKENS,
-            google_api_key=settings.GOOGLE_API_KEY,
+        # 요청마다 클라이언트를 새로 만들지 않고 프로세스 단위로 재사용합니다.
+        self.llm = llm_registry.get()
+
+    # CONVERSATION_TOKEN_BUDGET이 설정되면 시스템 프롬프트 토큰을 제외한 만큼을 대화 내역 예산으로 사용합니다.
+    def get_history_budget(self, character):
+        budget = settings.CONVERSATION_TOKEN_BUDGET
+        if not budget:
+            return None
+
+        budget -= self.get_compiled_prompt(character).tokens
+        if settings.CONVERSATION_SUMMARY:
+            budget -= settings.CONVERSATION_SUMMARY_MAX_TOKENS
+
+        return max(budget, 0)
+
+    def get_history_queryset(self, room, before_datetime=None, budget=None):
+        limit = getattr(settings, "CONVERSATION_HISTORY_LIMIT")
+
+        queryset = Chat.objects.filter(room=room, is_main=True)
+        if before_datetime:
+            queryset = queryset.filter(created_at__lt=before_datetime)
+
+        fields = ("id", "role", "content", "token_count")
+
+        if budget is None:
+            return queryset.order_by("-created_at").values_list(*fields)[:limit]
+
+        # 최신 메시지부터 토큰 누적합을 계산해 예산 안에 들어오는 메시지만 DB에서 가져옵니다.
+        return (
+            queryset.annotate(
+                running_tokens=Window(
+                    Sum("token_count"),
+                    order_by=[F("created_at").desc(), F("id").desc()],
+                )
+            )
+            .filter(running_tokens__lte=budget)
+            .order_by("-created_at")
+            .values_list(*fields)
         )
 
-    def create_memory_from_history(self, room, before_datetime=None):
+    # entries: 오래된 순으로 정렬된 (chat_id, role, content, token_count) 목록
+    # summary: 윈도우 밖 대화의 요약, 있으면 대화 내역 맨 앞에 추가합니다.
+    def build_history_messages(self, entries, summary=""):
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+        messages = []
+
+        if summary:
+            messages.append(SystemMessage(content=f"이전 대화 요약:\n{summary}"))
+
+        for _, role, content, _ in entries:
+            if role == "user":
+                messages.append(HumanMessage(content=content))
+            elif role == "ai":
+                messages.append(AIMessage(content=content))
+
+        return messages
+
+    # PROMPT_ASSEMBLY=langchain 에서 사용하는 메모리 (build_history_messages 와 같은 대화 내역)
+    def build_memory(self, entries, summary=""):
+        from langchain.memory import ConversationBufferWindowMemory
+
         limit = getattr(settings, "CONVERSATION_HISTORY_LIMIT")
 
         memory = ConversationBufferWindowMemory(
-            k=limit,
+            k=max(limit, len(entries) + 1),
             return_messages=True,
             memory_key="chat_history",
         )
+        memory.chat_memory.add_messages(self.build_history_messages(entries, summary))
 
-        queryset = Chat.objects.filter(room=room, is_main=True)
-        if before_datetime:
-            queryset = queryset.filter(created_at__lt=before_datetime)
+        return memory
+
+    def get_history(self, room, before_datetime=None):
+        # 최근 대화 윈도우는 캐시를 사용하고, 특정 시점 이전의 대화(재생성)는 DB에서 조회합니다.
+        if before_datetime is None:
+            # 버전은 DB 조회 전에 받아 두어, 조회하는 동안 저장된 메시지가 빠진 윈도우를 캐시하지 않습니다.
+            entries, version = window_cache.get(room.pk)
+            if entries is not None:
+                return entries
+
+        budget = self.get_history_budget(room.character)
+        entries = list(
+            reversed(self.get_history_queryset(room, before_datetime, budget))
+        )
 
-        chats = queryset.order_by("-created_at")[:limit]
-        recent_chats = list(reversed(chats))
+        if before_datetime is None:
+            window_cache.set(room.pk, entries, budget, version)
 
-        for chat in recent_chats:
-            if chat.role == "user":
-                memory.chat_memory.add_user_message(chat.content)
-            elif chat.role == "ai":
-                memory.chat_memory.add_ai_message(chat.content)
+        return entries
 
-        return memory
+    async def aget_history(self, room, before_datetime=None):
+        if before_datetime is None:
+            entries, version = await window_cache.aget(room.pk)
+            if entries is not None:
+                return entries
+
+        budget = self.get_history_budget(room.character)
+        entries = [
+            entry
+            async for entry in self.get_history_queryset(room, before_datetime, budget)
+        ]
+        entries.reverse()
+
+        if before_datetime is None:
+            await window_cache.aset(room.pk, entries, budget, version)
+
+        return entries
+
+    def get_history_messages(self, room, before_datetime=None):
+        return self.build_history_messages(
+            self.get_history(room, before_datetime), room.summary
+        )
+
+    async def aget_history_messages(self, room, before_datetime=None):
+        return self.build_history_messages(
+            await self.aget_history(room, before_datetime), room.summary
+        )
+
+    def create_memory_from_history(self, room, before_datetime=None):
+        return self.build_memory(self.get_history(room, before_datetime), room.summary)
+
+    async def acreate_memory_from_history(self, room, before_datetime=None):
+        return self.build_memory(
+            await self.aget_history(room, before_datetime), room.summary
+        )
 
     def recreate_memory_from_history(self, room, last_user_message):
         return self.create_memory_from_history(room, last_user_message.created_at)
 
+    async def arecreate_memory_from_history(self, room, last_user_message):
+        return await self.acreate_memory_from_history(
+            room, last_user_message.created_at
+        )
+
     def get_system_prompt(self, character):
         prompt = f"당신은 '{character.name}'입니다.\n"
         prompt += f"제목: {character.title}\n"
@@ -96,16 +209,159 @@ class ChatService:
 
         return prompt
 
-    def create_conversation_chain(self, character, memory):
-        prompt = ChatPromptTemplate.from_messages(
+    def compile_prompt(self, character):
+        from langchain.prompts import (
+            ChatPromptTemplate,
+            HumanMessagePromptTemplate,
+            MessagesPlaceholder,
+            SystemMessagePromptTemplate,
+        )
+
+        system_prompt = self.get_system_prompt(character)
+        template = ChatPromptTemplate.from_messages(
             [
-                SystemMessagePromptTemplate.from_template(
-                    self.get_system_prompt(character)
-                ),
+                SystemMessagePromptTemplate.from_template(system_prompt),
                 MessagesPlaceholder(variable_name="chat_history"),
                 HumanMessagePromptTemplate.from_template("{input}"),
             ]
         )
+        return CompiledPrompt(
+            system_prompt,
+            template,
+            estimate_tokens(system_prompt),
+            self.format_system_message(template),
+        )
+
+    # 시스템 메시지는 변수가 없으므로 템플릿으로 한 번만 만들어 두고 재사용합니다.
+    # 캐릭터 설정에 중괄호가 있어 템플릿 변수로 해석되면 None 을 반환하고 매번 템플릿으로 만듭니다.
+    def format_system_message(self, template):
+        try:
+            return template.messages[0].format()
+        except (KeyError, ValueError):
+            return None
+
+    # 같은 캐릭터(버전)의 프롬프트는 다시 만들지 않고 캐시에서 가져옵니다.
+    def get_compiled_prompt(self, character):
+        key = ("chat", character.pk, character.updated_at)
+        return prompt_cache.get_or_create(key, lambda: self.compile_prompt(character))
+
+    def get_chat_prompt(self, character):
+        return self.get_compiled_prompt(character).template
+
+    # 시스템 메시지 + 대화 내역 + 입력 메시지 목록을 템플릿/메모리 객체 없이 바로 만듭니다.
+    # get_chat_prompt(character).format_messages(chat_history=history, input=user_message) 와 같은 결과입니다.
+    def build_chat_messages(self, character, history, user_message):
+        from langchain_core.messages import HumanMessage
+
+        compiled = self.get_compiled_prompt(character)
+
+        if compiled.system_message is None:
+            return compiled.template.format_messages(
+                chat_history=history, input=user_message
+            )
+
+        return [compiled.system_message, *history, HumanMessage(content=user_message)]
+
+    # 시스템 프롬프트가 컨텍스트 캐시에 등록되어 있으면 메시지에서 빼고 캐시 이름을 함께 전달합니다.
+    # (첫 번째 메시지는 build_chat_messages 가 만든 시스템 메시지입니다.)
+    def apply_context_cache(self, character, messages):
+        name = context_cache.get_handle(character, self.get_compiled_prompt(character))
+        if name is None:
+            return messages, {}
+        return self.fold_system_messages(messages[1:]), {"cached_content": name}
+
+    # Gemini 는 cached_content 와 system_instruction 을 함께 받지 않으므로,
+    # 남은 시스템 메시지 (대화 요약)는 다음 사용자 메시지 앞에 붙이거나 사용자 메시지로 바꿉니다.
+    def fold_system_messages(self, messages):
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        folded = []
+        pending = []
+
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                pending.append(str(message.content))
+                continue
+
+            if pending and isinstance(message, HumanMessage):
+                message = HumanMessage(
+                    content="\n\n".join([*pending, str(message.content)])
+                )
+            elif pending:
+                folded.append(HumanMessage(content="\n\n".join(pending)))
+            pending = []
+            folded.append(message)
+
+        if pending:
+            folded.append(HumanMessage(content="\n\n".join(pending)))
+
+        return folded
+
+    async def aapply_context_cache(self, character, messages):
+        if not settings.CONTEXT_CACHE:
+            return messages, {}
+        # 캐시 등록/연장은 제공자 API를 호출하므로 스레드에서 실행합니다.
+        return await sync_to_async(self.apply_context_cache, thread_sensitive=False)(
+            character, messages
+        )
+
+    # 캐시를 사용한 호출이 실패하면 (만료/삭제 등) 다음 호출에서 다시 등록합니다.
+    def discard_context_cache(self, character, options):
+        if "cached_content" in options:
+            context_cache.discard(character, options["cached_content"])
+
+    def invoke_chat(self, kind, character, messages):
+        cached_messages, options = self.apply_context_cache(character, messages)
+
+        def invoke(messages, **options):
+            return call_llm_sync(
+                kind,
+                lambda: self.llm.invoke(
+                    messages, config={"callbacks": llm_callbacks(kind)}, **options
+                ).content,
+            )
+
+        if not options:
+            return invoke(messages)
+
+        try:
+            return invoke(cached_messages, **options)
+        except LLMUnavailable:
+            raise
+        except Exception as e:
+            # 캐시 없이 전체 프롬프트로 한 번 더 호출합니다.
+            logger.warning(f"컨텍스트 캐시 사용 호출 실패: {e}")
+            self.discard_context_cache(character, options)
+            return invoke(messages)
+
+    async def ainvoke_chat(self, kind, character, messages):
+        cached_messages, options = await self.aapply_context_cache(character, messages)
+
+        async def ainvoke(messages, **options):
+            response = await call_llm(
+                kind,
+                lambda: self.llm.ainvoke(
+                    messages, config={"callbacks": llm_callbacks(kind)}, **options
+                ),
+            )
+            return response.content
+
+        if not options:
+            return await ainvoke(messages)
+
+        try:
+            return await ainvoke(cached_messages, **options)
+        except LLMUnavailable:
+            raise
+        except Exception as e:
+            logger.warning(f"컨텍스트 캐시 사용 호출 실패: {e}")
+            self.discard_context_cache(character, options)
+            return await ainvoke(messages)
+
+    def create_conversation_chain(self, character, memory):
+        from langchain.chains import LLMChain
+
+        prompt = self.get_chat_prompt(character)
 
         chain = LLMChain(
             llm=self.llm, prompt=prompt, memory=memory, verbose=settings.VERBOSE
@@ -114,34 +370,159 @@ class ChatService:
         return chain
 
     def save_chat(self, room, content, role):
-        return Chat.objects.create(room=room, content=content, role=role)
+        chat = Chat.objects.create(room=room, content=content, role=role)
+        room.record_chat(chat)
+        window_cache.append(
+            room.pk,
+            (chat.id, chat.role, chat.content, chat.token_count),
+            self.get_history_budget(room.character),
+        )
+        return chat
+
+    async def asave_chat(self, room, content, role):
+        chat = await Chat.objects.acreate(room=room, content=content, role=role)
+        await room.arecord_chat(chat)
+        await window_cache.aappend(
+            room.pk,
+            (chat.id, chat.role, chat.content, chat.token_count),
+            self.get_history_budget(room.character),
+        )
+        return chat
 
     def get_ai_response(self, room, user_message=None, last_user_message=None):
         try:
             character = room.character
 
-            if last_user_message:
-                memory = self.recreate_memory_from_history(room, last_user_message)
+            if user_message == None:
+                # TODO: 메시지 이어서 생성 프롬프트
+                user_message = ""
+
+            kind = "regenerate" if last_user_message else "chat"
+
+            if settings.PROMPT_ASSEMBLY == "langchain":
+                if last_user_message:
+                    memory = self.recreate_memory_from_history(room, last_user_message)
+                else:
+                    memory = self.create_memory_from_history(room)
+
+                chain = self.create_conversation_chain(character, memory)
+                response = call_llm_sync(
+                    kind,
+                    lambda: chain.predict(
+                        input=user_message, callbacks=llm_callbacks(kind)
+                    ),
+                )
             else:
-                memory = self.create_memory_from_history(room)
+                history = self.get_history_messages(
+                    room, last_user_message.created_at if last_user_message else None
+                )
+                messages = self.build_chat_messages(character, history, user_message)
+                response = self.invoke_chat(kind, character, messages)
+
+            return response.strip()
+
+        # 서킷 차단/마감 시간 초과는 호출한 쪽에서 503으로 응답하고 메시지로 저장하지 않습니다.
+        except LLMUnavailable:
+            raise
+
+        except Exception as e:
+            logger.error(f"AI 응답 생성 오류: {e}")
+            llm_registry.discard_on_error(self.llm, e)
+            return "죄송합니다. 현재 응답을 생성할 수 없습니다."
 
-            chain = self.create_conversation_chain(character, memory)
+    # room은 character가 select_related 된 상태로 전달되어야 합니다.
+    async def aget_ai_response(self, room, user_message=None, last_user_message=None):
+        try:
+            character = room.character
 
             if user_message == None:
                 # TODO: 메시지 이어서 생성 프롬프트
                 user_message = ""
 
-            response = chain.predict(input=user_message)
+            kind = "regenerate" if last_user_message else "chat"
+
+            if settings.PROMPT_ASSEMBLY == "langchain":
+                if last_user_message:
+                    memory = await self.arecreate_memory_from_history(
+                        room, last_user_message
+                    )
+                else:
+                    memory = await self.acreate_memory_from_history(room)
+
+                chain = self.create_conversation_chain(character, memory)
+                response = await call_llm(
+                    kind,
+                    lambda: chain.apredict(
+                        input=user_message, callbacks=llm_callbacks(kind)
+                    ),
+                )
+            else:
+                history = await self.aget_history_messages(
+                    room, last_user_message.created_at if last_user_message else None
+                )
+                messages = self.build_chat_messages(character, history, user_message)
+                response = await self.ainvoke_chat(kind, character, messages)
 
             return response.strip()
 
+        # 서킷 차단/마감 시간 초과는 호출한 쪽에서 503으로 응답하고 메시지로 저장하지 않습니다.
+        except LLMUnavailable:
+            raise
+
         except Exception as e:
             logger.error(f"AI 응답 생성 오류: {e}")
+            llm_registry.discard_on_error(self.llm, e)
             return "죄송합니다. 현재 응답을 생성할 수 없습니다."
 
-    def get_chat_suggestion(self, room):
-        character = room.character
-        memory = self.create_memory_from_history(room)
+    async def astream_ai_response(self, room, user_message=None):
+        # 모델이 생성하는 토큰을 도착하는 대로 반환합니다. (SSE 응답용)
+        has_output = False
+        options = {}
+
+        try:
+            messages = self.build_chat_messages(
+                room.character,
+                await self.aget_history_messages(room),
+                user_message or "",
+            )
+            messages, options = await self.aapply_context_cache(
+                room.character, messages
+            )
+
+            stream = self.llm.astream(
+                messages, config={"callbacks": llm_callbacks("chat")}, **options
+            )
+            async for chunk in stream_llm("stream", stream):
+                if chunk.content:
+                    has_output = True
+                    yield chunk.content
+
+        except LLMUnavailable as e:
+            logger.warning(f"AI 응답 스트리밍 불가: {e}")
+            # 아직 전송한 내용이 없으면 호출한 쪽에서 error 이벤트로 알리고 저장하지 않습니다.
+            if not has_output:
+                raise
+
+        except Exception as e:
+            logger.error(f"AI 응답 스트리밍 오류: {e}")
+            llm_registry.discard_on_error(self.llm, e)
+            self.discard_context_cache(room.character, options)
+            if not has_output:
+                yield "죄송합니다. 현재 응답을 생성할 수 없습니다."
+
+    def get_suggestion_prompt(self, character, count=1):
+        key = ("suggestion", character.pk, character.updated_at, count)
+        return prompt_cache.get_or_create(
+            key, lambda: self.compile_suggestion_prompt(character, count).template
+        )
+
+    def compile_suggestion_prompt(self, character, count=1):
+        from langchain.prompts import (
+            ChatPromptTemplate,
+            HumanMessagePromptTemplate,
+            MessagesPlaceholder,
+            SystemMessagePromptTemplate,
+        )
 
         suggestion_system_prompt = f"""당신은 '{character.name}' 캐릭터와 대화하는 사용자를 위한 추천 답변 생성기입니다.
 
@@ -161,26 +542,274 @@ class ChatService:
     1. 이전 대화 맥락을 고려하여 자연스럽게 이어질 수 있는 사용자 답변을 제안하세요
     2. 질문, 공감, 또는 새로운 주제 제안 등 다양한 형태로 구성하세요
     3. 한 문장으로 간결하게 작성하세요
+"""
 
+        if count == 1:
+            suggestion_system_prompt += """
     이전 대화를 참고하여 사용자가 다음에 할 수 있는 자연스러운 답변 하나를 생성해주세요."""
+            human_prompt = "위 대화를 바탕으로 사용자가 할 수 있는 자연스러운 답변을 하나 생성해주세요:"
+        else:
+            # 한 번의 호출로 여러 개의 답변을 받기 위해 JSON 배열 형식으로 응답을 요청합니다.
+            suggestion_system_prompt += f"""    4. 각 답변은 서로 다른 내용과 형태여야 합니다
+
+    이전 대화를 참고하여 사용자가 다음에 할 수 있는 자연스러운 답변 {count}개를 생성해주세요.
+    다른 설명 없이 JSON 문자열 배열 형식으로만 출력하세요. 예: ["답변1", "답변2"]"""
+            human_prompt = f"위 대화를 바탕으로 사용자가 할 수 있는 서로 다른 답변 {count}개를 JSON 배열로 생성해주세요:"
 
-        suggestion_prompt = ChatPromptTemplate.from_messages(
+        template = ChatPromptTemplate.from_messages(
             [
                 SystemMessagePromptTemplate.from_template(suggestion_system_prompt),
                 MessagesPlaceholder(variable_name="chat_history"),
-                HumanMessagePromptTemplate.from_template(
-                    "위 대화를 바탕으로 사용자가 할 수 있는 자연스러운 답변을 하나 생성해주세요:"
-                ),
+                HumanMessagePromptTemplate.from_template(human_prompt),
             ]
         )
+        return CompiledPrompt(
+            suggestion_system_prompt,
+            template,
+            estimate_tokens(suggestion_system_prompt),
+            self.format_system_message(template),
+        )
+
+    def parse_suggestions(self, text, count):
+        text = text.strip()
+        start, end = text.find("["), text.rfind("]")
+
+        if start == -1 or end < start:
+            return []
+
+        try:
+            items = json.loads(text[start : end + 1])
+        except json.JSONDecodeError:
+            return []
+
+        suggestions = []
+        for item in items:
+            if not isinstance(item, str):
+                continue
+
+            suggestion = item.strip()
+            if suggestion and suggestion not in suggestions:
+                suggestions.append(suggestion)
+
+        return suggestions[:count]
+
+    async def aget_single_suggestion(self, messages):
+        response = await call_llm(
+            "suggestion",
+            lambda: self.llm.ainvoke(
+                messages, config={"callbacks": llm_callbacks("suggestion")}
+            ),
+        )
+        return response.content.strip()
+
+    # 대화 내역은 요청당 한 번만 만들고, 추천 답변 N개를 한 번의 호출로 생성합니다.
+    # 응답이 부족하거나 SUGGESTION_MODE가 concurrent이면 부족한 개수만큼 개별 호출을 동시에 실행합니다.
+    async def aget_chat_suggestions(self, room, count, chat_history=None):
+        character = room.character
+
+        if chat_history is None:
+            chat_history = await self.aget_history_messages(room)
+
+        suggestions = []
+
+        try:
+            if count > 1 and settings.SUGGESTION_MODE == "batch":
+                messages = self.get_suggestion_prompt(character, count).format_messages(
+                    chat_history=chat_history
+                )
+                response = await call_llm(
+                    "suggestion",
+                    lambda: self.llm.ainvoke(
+                        messages, config={"callbacks": llm_callbacks("suggestion")}
+                    ),
+                )
+                suggestions = self.parse_suggestions(response.content, count)
+
+            if len(suggestions) < count:
+                messages = self.get_suggestion_prompt(character).format_messages(
+                    chat_history=chat_history
+                )
+                suggestions += await asyncio.gather(
+                    *[
+                        self.aget_single_suggestion(messages)
+                        for _ in range(count - len(suggestions))
+                    ]
+                )
+
+        except LLMUnavailable:
+            raise
+
+        except Exception as e:
+            llm_registry.discard_on_error(self.llm, e)
+            raise
+
+        return suggestions
+
+    def get_suggestion_cost(self):
+        # concurrent 모드는 추천 답변 개수만큼 호출합니다.
+        if settings.SUGGESTION_MODE == "batch":
+            return 1
+        return settings.SUGGESTIONS
+
+    # 채팅방의 메시지가 바뀔 때마다 갱신되는 Room.updated_at (미리 생성한 추천 답변의 버전)
+    async def aget_room_version(self, room):
+        return (
+            await Room.objects.filter(pk=room.pk)
+            .values_list("updated_at", flat=True)
+            .afirst()
+        )
 
-        suggestion_chain = LLMChain(
-            llm=self.llm,
-            prompt=suggestion_prompt,
-            memory=memory,
-            verbose=settings.VERBOSE,
+    # SUGGESTION_PREFETCH 이면 AI 응답을 저장한 직후 추천 답변 생성을 미리 시작합니다.
+    # WSGI(runserver 등)에서는 비동기 뷰가 요청마다 만든 이벤트 루프에서 실행되고
+    # 응답 후 루프가 닫히면서 작업이 취소되므로, 서버의 이벤트 루프가 계속 실행되는 ASGI 요청에서만 시작합니다.
+    def schedule_suggestion_prefetch(self, request, room):
+        from django.core.handlers.asgi import ASGIRequest
+
+        if not settings.SUGGESTION_PREFETCH:
+            return
+        if not isinstance(getattr(request, "_request", request), ASGIRequest):
+            return
+
+        create_background_task(self.aprefetch_suggestions(room))
+
+    # 생성하는 동안 채팅방이 바뀌지 않았을 때만 (생성 시작 시점의 버전 그대로일 때만) 저장합니다.
+    async def aprefetch_suggestions(self, room):
+        cost = self.get_suggestion_cost()
+        if not admission.try_acquire(cost):
+            return
+
+        try:
+            version = await self.aget_room_version(room)
+            if version is None:
+                return
+
+            suggestions = await self.aget_chat_suggestions(room, settings.SUGGESTIONS)
+
+            async def is_current():
+                return await self.aget_room_version(room) == version
+
+            if suggestions:
+                await suggestion_cache.aset(room.pk, version, suggestions, is_current)
+        except LLMUnavailable:
+            # 미리 생성하지 못하면 추천 답변 요청 시 새로 생성합니다.
+            pass
+        finally:
+            await admission.release(None, cost)
+
+    async def apop_prefetched_suggestions(self, room):
+        if not settings.SUGGESTION_PREFETCH:
+            return None
+
+        return await suggestion_cache.apop(room.pk, await self.aget_room_version(room))
+
+    def schedule_summary(self, room):
+        if settings.CONVERSATION_SUMMARY:
+            run_in_background(self.summarize_room, room.pk)
+
+    # 윈도우 밖으로 밀려났지만 아직 요약되지 않은 메시지가 충분히 쌓이면 기존 요약에 합칩니다.
+    # 요약 기능을 처음 켜거나 요약이 초기화된 긴 대화도 한 번에 모델의 컨텍스트를 넘지 않도록
+    # 오래된 메시지부터 CONVERSATION_SUMMARY_CHUNK_TOKENS 씩 나눠 요약하고 summarized_until 을 옮깁니다.
+    def summarize_room(self, room_id):
+        room = Room.objects.select_related("character").get(pk=room_id)
+
+        entries = self.get_history(room)
+        if not entries:
+            return
+
+        window_start = (
+            Chat.objects.filter(id=entries[0][0])
+            .values_list("created_at", flat=True)
+            .first()
         )
+        if window_start is None:
+            return
 
-        suggestion = suggestion_chain.predict(input="")
+        queryset = Chat.objects.filter(
+            room=room, is_main=True, created_at__lt=window_start
+        )
+        unsummarized = queryset
+        if room.summarized_until:
+            unsummarized = queryset.filter(created_at__gt=room.summarized_until)
+        remaining = unsummarized.count()
+
+        while remaining >= settings.CONVERSATION_SUMMARY_MIN_MESSAGES:
+            pending = self.get_summary_chunk(queryset, room.summarized_until)
+            if not pending:
+                return
+
+            summary = self.summarize_chunk(room, pending)
+            summarized_until = pending[-1][2]
+
+            # 요약하는 동안 대화가 초기화되거나 다른 작업이 먼저 요약했다면 저장하지 않고 멈춥니다.
+            updated = Room.objects.filter(
+                pk=room.pk, summarized_until=room.summarized_until
+            ).update(summary=summary, summarized_until=summarized_until)
+            if not updated:
+                return
+
+            room.summary = summary
+            room.summarized_until = summarized_until
+            remaining -= len(pending)
+
+    # summarized_until 이후의 가장 오래된 메시지부터 토큰 누적합이 CONVERSATION_SUMMARY_CHUNK_TOKENS 이내인 메시지
+    # created_at 만으로 정렬한 누적합은 같은 시각의 메시지가 같은 값을 가지므로, 같은 시각의 메시지가 나뉘지 않습니다.
+    # 첫 메시지만으로 예산을 넘으면 그 시각의 메시지만 요약합니다.
+    def get_summary_chunk(self, queryset, summarized_until=None):
+        if summarized_until:
+            queryset = queryset.filter(created_at__gt=summarized_until)
+
+        fields = ("role", "content", "created_at")
+        pending = list(
+            queryset.annotate(
+                running_tokens=Window(
+                    Sum("token_count"), order_by=F("created_at").asc()
+                )
+            )
+            .filter(running_tokens__lte=settings.CONVERSATION_SUMMARY_CHUNK_TOKENS)
+            .order_by("created_at", "id")
+            .values_list(*fields)
+        )
+        if pending:
+            return pending
 
-        return suggestion.strip()
+        first = queryset.order_by("created_at").values_list("created_at", flat=True)
+        return list(
+            queryset.filter(created_at=first[:1]).order_by("id").values_list(*fields)
+        )
+
+    def summarize_chunk(self, room, pending):
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        character_name = room.character.name
+        transcript = "\n".join(
+            f"{character_name if role == 'ai' else '사용자'}: {content}"
+            for role, content, _ in pending
+        )
+        max_length = int(settings.CONVERSATION_SUMMARY_MAX_TOKENS * 1.5)
+
+        messages = [
+            SystemMessage(
+                content=(
+                    f"당신은 '{character_name}' 캐릭터와 사용자의 대화를 요약하는 도우미입니다.\n"
+                    "기존 요약과 새 대화를 합쳐 하나의 요약으로 갱신하세요.\n"
+                    "인물, 관계, 사건, 약속, 감정 변화 등 이후 대화에 필요한 정보를 유지하고 "
+                    f"{max_length}자 이내로 작성하세요."
+                )
+            ),
+            HumanMessage(
+                content=f"기존 요약:\n{room.summary or '없음'}\n\n새 대화:\n{transcript}"
+            ),
+        ]
+
+        try:
+            return call_llm_sync(
+                "summary",
+                lambda: self.llm.invoke(
+                    messages, config={"callbacks": llm_callbacks("summary")}
+                ),
+            ).content.strip()
+        except LLMUnavailable:
+            raise
+        except Exception as e:
+            llm_registry.discard_on_error(self.llm, e)
+            raise
@@ -1,3 +1,1408 @@
-from django.test import TestCase
+# Python Library
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+# Third-Party Packages
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.utils import timezone
+from google.api_core import exceptions as google_exceptions
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+# Local Apps
+from accounts.models import User
+from .admission import AdmissionController, AdmissionRejected, admission
+from .background import create_background_task
+from .benchmarks import run_scenario
+from .caches import PromptCache, prompt_cache, suggestion_cache, window_cache
+from characters.models import Character
+from .context_cache import context_cache
+from .fake_llm import FakeChatModel, fake_cached_contents
+from .history import load_history
+from .llm import is_client_error, llm_registry
+from .metrics import Counter, Histogram, MetricsRegistry, metrics
+from .models import Chat, GenerationJob, Room
+from .pagination import chat_paginator, room_paginator
+from .resilience import CircuitBreaker, CircuitOpenError, call_llm, circuit_breaker
+from .services import ChatService
+from .views import RoomDetailAPIView
+from .tokens import estimate_tokens
+
+# 지연 없이 바로 응답하는 로컬 모델
+FAKE_LLM = {
+    "latency": "fixed",
+    "latency_ms": 0.0,
+    "jitter_ms": 0.0,
+    "tokens_per_second": 1_000_000.0,
+    "reply_tokens": 8,
+    "error_rate": 0.0,
+    "seed": 0,
+    "prefill_ms_per_1k_tokens": 0.0,
+}
+
+
+@override_settings(LLM_BACKEND="fake", FAKE_LLM=FAKE_LLM)
+class FakeLLMTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        llm_registry.reset()
+        self.user = User.objects.create_user(username="tester")
+        self.character = Character.objects.create(
+            user=self.user, title="테스트", name="테스터", intro=[]
+        )
+        self.room = Room.objects.create(user=self.user, character=self.character)
+        self.service = ChatService()
+
+
+@override_settings(
+    CONTEXT_CACHE=True, CONTEXT_CACHE_MIN_TOKENS=1, CONTEXT_CACHE_TTL=600
+)
+class ContextCacheTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        fake_cached_contents.reset()
+
+    def get_handle(self):
+        compiled = self.service.get_compiled_prompt(self.character)
+        return context_cache.get_handle(self.character, compiled)
+
+    def build_messages(self, summary=""):
+        history = self.service.build_history_messages(
+            [(1, "user", "안녕", 1), (2, "ai", "반가워", 1)], summary
+        )
+        return self.service.build_chat_messages(self.character, history, "뭐 해?")
+
+    def test_creates_then_reuses_handle(self):
+        name = self.get_handle()
+
+        self.assertIsNotNone(name)
+        self.assertIn("당신은 '테스터'입니다.", fake_cached_contents.get(name))
+        self.assertEqual(self.get_handle(), name)
+
+    def test_skips_short_prompts(self):
+        with override_settings(CONTEXT_CACHE_MIN_TOKENS=1_000_000):
+            self.assertIsNone(self.get_handle())
+
+    def test_refreshes_ttl_after_half_of_it(self):
+        name = self.get_handle()
+
+        with mock.patch.object(fake_cached_contents, "update") as update:
+            self.assertEqual(self.get_handle(), name)
+            update.assert_not_called()
+
+            with mock.patch("rooms.context_cache.time") as fake_time:
+                fake_time.time.return_value = (
+                    cache.get(context_cache.get_key(self.character))[2] + 301
+                )
+                self.assertEqual(self.get_handle(), name)
+
+            update.assert_called_once_with(name, 600)
+
+    def test_recreates_handle_when_character_changes(self):
+        name = self.get_handle()
+
+        self.character.description = "새로운 설정"
+        self.character.save()
+        new_name = self.get_handle()
+
+        self.assertNotEqual(new_name, name)
+        with self.assertRaises(RuntimeError):
+            fake_cached_contents.get(name)
+
+    def test_falls_back_to_full_prompt_when_cache_expired(self):
+        name = self.get_handle()
+        fake_cached_contents.delete(name)
+
+        reply = self.service.invoke_chat("chat", self.character, self.build_messages())
+
+        self.assertTrue(reply)
+        # 실패한 캐시는 지우고 다음 호출에서 새로 등록합니다.
+        self.assertNotEqual(self.get_handle(), name)
+
+    def test_summary_is_not_sent_as_system_message(self):
+        messages = self.build_messages(summary="이전에 인사를 나눴다.")
+        cached_messages, options = self.service.apply_context_cache(
+            self.character, messages
+        )
+
+        self.assertIn("cached_content", options)
+        self.assertFalse(
+            any(isinstance(message, SystemMessage) for message in cached_messages)
+        )
+        self.assertIsInstance(cached_messages[0], HumanMessage)
+        self.assertIn("이전에 인사를 나눴다.", cached_messages[0].content)
+        self.assertIn("안녕", cached_messages[0].content)
+
+        with mock.patch.object(context_cache, "discard") as discard:
+            self.service.invoke_chat("chat", self.character, messages)
+            discard.assert_not_called()
+
+    def test_fake_model_rejects_system_message_with_cached_content(self):
+        name = self.get_handle()
+        model = FakeChatModel(**FAKE_LLM)
+
+        with self.assertRaises(RuntimeError):
+            model.invoke(
+                [SystemMessage(content="요약"), HumanMessage(content="안녕")],
+                cached_content=name,
+            )
+
+        self.assertTrue(
+            model.invoke([HumanMessage(content="안녕")], cached_content=name).content
+        )
+
+
+@override_settings(LLM_BACKEND="fake", FAKE_LLM=FAKE_LLM)
+class FoldSystemMessagesTests(SimpleTestCase):
+    def test_summary_before_ai_message_becomes_user_message(self):
+        messages = ChatService().fold_system_messages(
+            [SystemMessage(content="요약"), AIMessage(content="반가워")]
+        )
+
+        self.assertEqual(
+            [type(message) for message in messages], [HumanMessage, AIMessage]
+        )
+        self.assertEqual(messages[0].content, "요약")
+
+
+@override_settings(LLM_CIRCUIT_FAILURES=3, LLM_CIRCUIT_RESET=30)
+class LLMUnavailableTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.base_url = f"/api/v1/rooms/{self.room.uuid}/"
+
+        # 서킷 브레이커 차단 상태
+        circuit_breaker.state = "open"
+        circuit_breaker.opened_at = time.monotonic()
+
+    def tearDown(self):
+        circuit_breaker.reset()
+
+    def assertUnavailable(self, response):
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(int(response["Retry-After"]) > 0)
+
+    def test_chat_is_not_saved_when_llm_unavailable(self):
+        response = self.client.post(
+            f"{self.base_url}messages/", {"message": "안녕"}, format="json"
+        )
+
+        self.assertUnavailable(response)
+        self.assertEqual(
+            list(Chat.objects.filter(room=self.room).values_list("role", flat=True)),
+            ["user"],
+        )
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.chat_count, 1)
+        self.assertEqual(self.room.last_message_preview, "안녕")
+
+    def test_regenerate_is_not_saved_when_llm_unavailable(self):
+        self.service.save_chat(self.room, "안녕", "user")
+        ai_chat = self.service.save_chat(self.room, "반가워", "ai")
+
+        response = self.client.post(f"{self.base_url}regenerate/")
+
+        self.assertUnavailable(response)
+        self.assertEqual(Chat.objects.filter(room=self.room).count(), 2)
+        ai_chat.refresh_from_db()
+        self.assertTrue(ai_chat.is_main)
+
+
+class GenerationJobTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_queue_mode_returns_absolute_status_url(self):
+        response = self.client.post(
+            f"/api/v1/rooms/{self.room.uuid}/messages/?mode=queue",
+            {"message": "안녕"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        job = GenerationJob.objects.get(room=self.room)
+        status_url = response.json()["status_url"]
+        self.assertEqual(
+            status_url,
+            f"http://testserver/api/v1/rooms/{self.room.uuid}/jobs/{job.uuid}/",
+        )
+
+        response = self.client.get(status_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "pending")
+
+
+@override_settings(
+    CONVERSATION_HISTORY_LIMIT=10,
+    CONVERSATION_TOKEN_BUDGET=0,
+    CONVERSATION_SUMMARY_MIN_MESSAGES=4,
+    CONVERSATION_SUMMARY_CHUNK_TOKENS=60,
+)
+class SummarizeRoomTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        started_at = timezone.now() - timedelta(hours=1)
+        load_history(
+            self.room,
+            [
+                {
+                    "content": f"{i}번째 메시지입니다. 오늘 있었던 일을 이야기해 줄게.",
+                    "role": "user" if i % 2 == 0 else "ai",
+                    "timestamp": started_at + timedelta(seconds=i),
+                }
+                for i in range(60)
+            ],
+        )
+        self.chats = list(Chat.objects.filter(room=self.room).order_by("created_at"))
+        self.chunks = []
+
+    def summarize_chunk(self, room, pending):
+        self.chunks.append(pending)
+        return f"{len(self.chunks)}번째 요약"
+
+    def test_summarizes_long_backlog_in_chunks(self):
+        with mock.patch.object(self.service, "summarize_chunk", self.summarize_chunk):
+            self.service.summarize_room(self.room.pk)
+
+        self.assertGreater(len(self.chunks), 1)
+        tokens = {chat.created_at: chat.token_count for chat in self.chats}
+        for pending in self.chunks:
+            self.assertLessEqual(
+                sum(tokens[created_at] for *_, created_at in pending), 60
+            )
+
+        # 윈도우(최근 10개) 밖의 메시지를 오래된 순서대로 빠짐없이 한 번씩 요약하고,
+        # 최소 개수(4개)보다 적게 남은 메시지는 다음에 요약합니다.
+        summarized = [
+            created_at for pending in self.chunks for *_, created_at in pending
+        ]
+        self.assertEqual(
+            summarized, [chat.created_at for chat in self.chats[: len(summarized)]]
+        )
+        self.assertLess(50 - len(summarized), 4)
+
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.summarized_until, summarized[-1])
+        self.assertEqual(self.room.summary, f"{len(self.chunks)}번째 요약")
+
+    def test_stops_when_summary_is_reset_meanwhile(self):
+        def summarize_chunk(room, pending):
+            # 두 번째 요약 중에 대화 내역을 다시 불러온 경우
+            if len(self.chunks) == 1:
+                self.room.reset_summary()
+            return self.summarize_chunk(room, pending)
+
+        with mock.patch.object(self.service, "summarize_chunk", summarize_chunk):
+            self.service.summarize_room(self.room.pk)
+
+        self.assertEqual(len(self.chunks), 2)
+        self.room.refresh_from_db()
+        self.assertIsNone(self.room.summarized_until)
+        self.assertEqual(self.room.summary, "")
+
+    def test_summary_is_generated_by_model(self):
+        self.service.summarize_room(self.room.pk)
+
+        self.room.refresh_from_db()
+        self.assertTrue(self.room.summary)
+        self.assertIsNotNone(self.room.summarized_until)
+
+
+@override_settings(LLM_BACKEND="fake", FAKE_LLM=FAKE_LLM)
+class LLMClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        llm_registry.reset()
+
+    def test_sync_callers_share_client(self):
+        self.assertIs(llm_registry.get(), llm_registry.get())
+
+    def test_async_clients_are_kept_per_event_loop(self):
+        async def get_twice():
+            return llm_registry.get(), llm_registry.get()
+
+        first, same_loop = asyncio.run(get_twice())
+        second, _ = asyncio.run(get_twice())
+
+        self.assertIs(first, same_loop)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, llm_registry.get())
+
+    def test_discards_only_on_client_errors(self):
+        client = llm_registry.get()
+
+        llm_registry.discard_on_error(client, KeyError("name"))
+        llm_registry.discard_on_error(
+            client, google_exceptions.InvalidArgument("bad request")
+        )
+        self.assertIs(llm_registry.get(), client)
+
+        llm_registry.discard_on_error(
+            client, google_exceptions.ServiceUnavailable("unavailable")
+        )
+        self.assertIsNot(llm_registry.get(), client)
+        self.assertEqual(llm_registry.stats()["discarded"], 1)
+
+    def test_client_errors(self):
+        self.assertTrue(is_client_error(ConnectionResetError()))
+        self.assertTrue(is_client_error(google_exceptions.Unauthenticated("key")))
+        self.assertFalse(is_client_error(KeyError("name")))
+        self.assertFalse(is_client_error(RuntimeError("FakeChatModel")))
+
+
+@override_settings(ROOMS_PAGE_SIZE=2, ROOMS_MAX_PAGE_SIZE=3)
+class RoomListTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        # 고정된 채팅방이 먼저, 나머지는 최근 대화 순이며 last_chat_at 이 같으면 uuid 역순입니다.
+        now = timezone.now()
+        self.rooms = []
+        for i, (fixation, minutes) in enumerate(
+            [(False, 1), (True, 30), (False, 5), (False, 5), (False, 10)]
+        ):
+            character = Character.objects.create(
+                user=self.user, title=f"테스트{i}", name=f"테스터{i}", intro=[]
+            )
+            self.rooms.append(
+                Room.objects.create(
+                    user=self.user,
+                    character=character,
+                    fixation=fixation,
+                    last_chat_at=now - timedelta(minutes=minutes),
+                )
+            )
+
+        tied = sorted(self.rooms[2:4], key=lambda room: room.uuid, reverse=True)
+        self.expected = [self.rooms[1], self.rooms[0], *tied, self.rooms[4]]
+
+    def get_uuids(self, rooms):
+        return [room["room_id"] for room in rooms]
+
+    def test_without_page_parameters_returns_all_rooms_as_array(self):
+        response = self.client.get("/api/v1/rooms/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(
+            self.get_uuids(response.data), [str(room.uuid) for room in self.expected]
+        )
+
+    def test_pages_follow_cursor_without_gaps_or_duplicates(self):
+        uuids = []
+        params = {"limit": 2}
+
+        while True:
+            response = self.client.get("/api/v1/rooms/", params)
+            self.assertEqual(response.status_code, 200)
+            uuids += self.get_uuids(response.data["rooms"])
+            if not response.data["has_more"]:
+                self.assertIsNone(response.data["next"])
+                break
+            params = {"limit": 2, "cursor": response.data["next"]}
+
+        self.assertEqual(uuids, [str(room.uuid) for room in self.expected])
+
+    def test_limit_is_clamped(self):
+        response = self.client.get("/api/v1/rooms/", {"limit": 100})
+        self.assertEqual(len(response.data["rooms"]), 3)
+
+        response = self.client.get("/api/v1/rooms/", {"limit": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ("not-a-cursor", "W3RydWVd", "WyJ4IiwgIjIwMjYiLCAiYSJd"):
+            response = self.client.get("/api/v1/rooms/", {"cursor": cursor})
+            self.assertEqual(response.status_code, 400)
+
+    def test_cursor_round_trip(self):
+        room = self.expected[2]
+        values = room_paginator.decode_cursor(room_paginator.encode_cursor(room))
+        self.assertEqual(values, (room.fixation, room.last_chat_at, room.uuid))
+
+    def test_unchanged_list_returns_304(self):
+        response = self.client.get("/api/v1/rooms/")
+        etag = response["ETag"]
+        self.assertIn("Cookie", response["Vary"])
+        self.assertIn("Authorization", response["Vary"])
+
+        response = self.client.get("/api/v1/rooms/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 메시지 저장은 Room.updated_at 을 갱신하므로 ETag 가 바뀝니다.
+        chat = Chat.objects.create(room=self.rooms[0], content="안녕", role="user")
+        self.rooms[0].record_chat(chat)
+        response = self.client.get("/api/v1/rooms/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_differs_per_user(self):
+        other = User.objects.create_user(username="other")
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+
+        # 채팅방이 없는 두 사용자의 목록도 ETag 가 같지 않아야 공유된 응답이 재사용되지 않습니다.
+        Room.objects.filter(user=self.user).delete()
+        etag = self.client.get("/api/v1/rooms/")["ETag"]
+
+        self.assertNotEqual(other_client.get("/api/v1/rooms/")["ETag"], etag)
+
+    def test_fixation_toggle_keeps_concurrent_activity(self):
+        room = self.rooms[0]
+        loaded = Room.objects.get(pk=room.pk)
+
+        # 고정 상태를 바꾸는 요청이 채팅방을 읽은 뒤 메시지가 저장된 경우
+        chat = Chat.objects.create(room=room, content="안녕", role="user")
+        room.record_chat(chat)
+        with mock.patch.object(RoomDetailAPIView, "get_room", return_value=loaded):
+            response = self.client.patch(f"/api/v1/rooms/{room.uuid}/")
+
+        self.assertEqual(response.status_code, 200)
+        room.refresh_from_db()
+        self.assertTrue(room.fixation)
+        self.assertEqual(room.chat_count, 1)
+        self.assertEqual(room.last_message_preview, "안녕")
+        self.assertEqual(room.last_chat_at, chat.created_at)
+
+    def test_other_users_rooms_are_excluded(self):
+        other = User.objects.create_user(username="other")
+        Room.objects.create(user=other, character=self.rooms[0].character)
+
+        response = self.client.get("/api/v1/rooms/")
+        self.assertEqual(
+            self.get_uuids(response.data),
+            [str(room.uuid) for room in self.expected],
+        )
+
+    def test_new_message_moves_room_to_top_of_unfixed_rooms(self):
+        room = self.rooms[4]
+        chat = Chat.objects.create(room=room, content="안녕", role="user")
+        room.record_chat(chat)
+
+        response = self.client.get("/api/v1/rooms/", {"limit": 2})
+        self.assertEqual(
+            self.get_uuids(response.data["rooms"]),
+            [str(self.rooms[1].uuid), str(room.uuid)],
+        )
+
+    def test_unchanged_list_is_answered_in_one_query(self):
+        etag = self.client.get("/api/v1/rooms/", {"limit": 2})["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/v1/rooms/", {"limit": 2}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+
+        # 다른 페이지, 캐릭터 이름 변경은 ETag 가 달라집니다.
+        self.assertNotEqual(
+            self.client.get("/api/v1/rooms/", {"limit": 3})["ETag"], etag
+        )
+        character = self.rooms[0].character
+        character.name = "새이름"
+        character.save()
+        response = self.client.get(
+            "/api/v1/rooms/", {"limit": 2}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SUGGESTION_PREFETCH=True, SUGGESTION_PREFETCH_TIMEOUT=600)
+class SuggestionPrefetchTests(FakeLLMTestCase):
+    async def is_current(self):
+        return True
+
+    async def is_stale(self):
+        return False
+
+    async def test_newer_version_is_not_overwritten(self):
+        now = timezone.now()
+        newer = now + timedelta(seconds=1)
+
+        self.assertTrue(await suggestion_cache.aset(1, newer, ["새"], self.is_current))
+        self.assertFalse(await suggestion_cache.aset(1, now, ["옛"], self.is_current))
+        self.assertEqual(await suggestion_cache.apop(1, newer), ["새"])
+
+    async def test_stale_version_is_not_stored(self):
+        now = timezone.now()
+
+        self.assertFalse(await suggestion_cache.aset(1, now, ["옛"], self.is_stale))
+        self.assertIsNone(await suggestion_cache.apop(1, now))
+
+    async def test_concurrent_writer_skips(self):
+        now = timezone.now()
+        await cache.aadd(suggestion_cache.get_lock_key(1), 1)
+
+        self.assertFalse(await suggestion_cache.aset(1, now, ["옛"], self.is_current))
+
+    async def test_pop_returns_only_matching_version_once(self):
+        now = timezone.now()
+        await suggestion_cache.aset(1, now, ["추천"], self.is_current)
+
+        self.assertIsNone(await suggestion_cache.apop(1, now + timedelta(seconds=1)))
+        await suggestion_cache.aset(1, now, ["추천"], self.is_current)
+        self.assertEqual(await suggestion_cache.apop(1, now), ["추천"])
+        self.assertIsNone(await suggestion_cache.apop(1, now))
+
+    def test_prefetch_is_stored_for_unchanged_room(self):
+        self.service.save_chat(self.room, "안녕", "user")
+        self.service.save_chat(self.room, "반가워", "ai")
+
+        async_to_sync(self.service.aprefetch_suggestions)(self.room)
+
+        suggestions = async_to_sync(self.service.apop_prefetched_suggestions)(self.room)
+        self.assertEqual(len(suggestions), 3)
+
+    def test_prefetch_is_dropped_when_room_changes_meanwhile(self):
+        self.service.save_chat(self.room, "안녕", "user")
+        self.service.save_chat(self.room, "반가워", "ai")
+
+        async def aget_chat_suggestions(room, count, chat_history=None):
+            await self.service.asave_chat(room, "또 왔어", "user")
+            return ["추천"]
+
+        with mock.patch.object(
+            self.service, "aget_chat_suggestions", aget_chat_suggestions
+        ):
+            async_to_sync(self.service.aprefetch_suggestions)(self.room)
+
+        self.assertIsNone(cache.get(suggestion_cache.get_key(self.room.pk)))
+
+    def test_prefetch_is_scheduled_only_for_asgi_requests(self):
+        with mock.patch("rooms.services.create_background_task") as create_task:
+            self.service.schedule_suggestion_prefetch(
+                RequestFactory().post("/"), self.room
+            )
+            create_task.assert_not_called()
+
+            self.service.schedule_suggestion_prefetch(
+                AsyncRequestFactory().post("/"), self.room
+            )
+            create_task.assert_called_once()
+            create_task.call_args.args[0].close()
+
+    def test_background_task_needs_running_loop(self):
+        async def task():
+            pass
+
+        self.assertIsNone(create_background_task(task()))
+
+
+@override_settings(CONVERSATION_WINDOW_CACHE=True, CONVERSATION_HISTORY_LIMIT=3)
+class ConversationWindowCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.entries = [(1, "user", "안녕", 1), (2, "ai", "반가워", 1)]
+
+    def fill(self):
+        _, version = window_cache.get(1)
+        window_cache.set(1, self.entries, version=version)
+
+    def test_append_extends_cached_window(self):
+        self.fill()
+        window_cache.append(1, (3, "user", "뭐 해?", 2))
+        window_cache.append(1, (4, "ai", "쉬는 중", 2))
+
+        entries, _ = window_cache.get(1)
+        self.assertEqual([entry[0] for entry in entries], [2, 3, 4])
+
+    def test_append_without_window_does_not_create_one(self):
+        window_cache.append(1, (3, "user", "뭐 해?", 2))
+        self.assertIsNone(window_cache.get(1)[0])
+
+    def test_fill_started_before_append_is_not_used(self):
+        # 조회를 시작한 뒤 다른 프로세스가 메시지를 저장하고 나서 DB 결과로 채우는 경우
+        _, version = window_cache.get(1)
+        window_cache.append(1, (3, "user", "뭐 해?", 2))
+        window_cache.set(1, self.entries, version=version)
+
+        self.assertIsNone(window_cache.get(1)[0])
+
+    def test_concurrent_append_invalidates(self):
+        self.fill()
+        cache.add(window_cache.get_lock_key(1), 1)
+
+        window_cache.append(1, (3, "user", "뭐 해?", 2))
+
+        self.assertIsNone(window_cache.get(1)[0])
+
+    def test_out_of_order_or_duplicate_append_invalidates(self):
+        self.fill()
+        window_cache.append(1, (2, "ai", "반가워", 1))
+        self.assertIsNone(window_cache.get(1)[0])
+
+        self.fill()
+        window_cache.append(1, (1, "user", "안녕", 1))
+        self.assertIsNone(window_cache.get(1)[0])
+
+    def test_invalidate(self):
+        self.fill()
+        window_cache.invalidate(1)
+        self.assertIsNone(window_cache.get(1)[0])
+
+        # 무효화 전에 받은 버전으로는 다시 채울 수 없습니다.
+        _, version = window_cache.get(1)
+        window_cache.set(1, self.entries, version=version)
+        self.assertEqual(window_cache.get(1)[0], self.entries)
+
+    def test_async_append(self):
+        self.fill()
+        async_to_sync(window_cache.aappend)(1, (3, "user", "뭐 해?", 2))
+        window_cache.append(1, (4, "ai", "쉬는 중", 2))
+
+        entries, _ = async_to_sync(window_cache.aget)(1)
+        self.assertEqual([entry[0] for entry in entries], [2, 3, 4])
+
+    def test_disabled(self):
+        with override_settings(CONVERSATION_WINDOW_CACHE=False):
+            self.fill()
+            self.assertEqual(window_cache.get(1), (None, None))
+
+
+class ChatStreamTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/rooms/{self.room.uuid}/messages/stream/"
+
+    def tearDown(self):
+        circuit_breaker.reset()
+
+    # 스트림을 끝까지 읽어 (이벤트, 데이터) 목록으로 나눕니다.
+    def read_events(self, response):
+        async def read():
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        body = async_to_sync(read)().decode()
+        events = []
+        for block in body.strip().split("\n\n"):
+            event, data = block.split("\n")
+            events.append((event[len("event: ") :], json.loads(data[len("data: ") :])))
+        return events
+
+    def test_tokens_then_saved_message(self):
+        response = self.client.post(self.url, {"message": "안녕"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = self.read_events(response)
+
+        names = [event for event, _ in events]
+        self.assertEqual(names[-1], "done")
+        self.assertEqual(set(names[:-1]), {"token"})
+
+        content = "".join(data["content"] for _, data in events[:-1]).strip()
+        ai_chat = Chat.objects.get(room=self.room, role="ai")
+        self.assertEqual(ai_chat.content, content)
+        self.assertEqual(events[-1][1]["ai_response"], content)
+        self.assertEqual(events[-1][1]["user_message"], "안녕")
+        self.assertEqual(admission.in_flight, 0)
+
+    def test_unread_response_holds_no_slot(self):
+        response = self.client.post(self.url, {"message": "안녕"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(admission.in_flight, 0)
+        self.assertEqual(admission.per_user, {})
+        self.assertFalse(Chat.objects.filter(room=self.room).exists())
+
+    @override_settings(LLM_USER_CONCURRENCY=1)
+    def test_error_event_when_user_limit_exceeded(self):
+        admission.per_user[self.user.pk] = 1
+        try:
+            response = self.client.post(self.url, {"message": "안녕"}, format="json")
+            events = self.read_events(response)
+        finally:
+            admission.per_user.clear()
+
+        self.assertEqual([event for event, _ in events], ["error"])
+        self.assertEqual(events[0][1]["status"], 429)
+        self.assertFalse(Chat.objects.filter(room=self.room).exists())
+
+    def test_disconnect_saves_partial_reply_and_releases_slot(self):
+        response = self.client.post(self.url, {"message": "안녕"}, format="json")
+
+        async def read_first_token_then_disconnect():
+            stream = response.streaming_content
+            first = await anext(stream)
+            await stream.aclose()
+            return first
+
+        first = async_to_sync(read_first_token_then_disconnect)().decode()
+
+        content = json.loads(first.split("data: ", 1)[1])["content"]
+        ai_chat = Chat.objects.get(room=self.room, role="ai")
+        self.assertEqual(ai_chat.content, content.strip())
+        self.assertEqual(admission.in_flight, 0)
+        self.assertEqual(admission.per_user, {})
+
+    @override_settings(LLM_CIRCUIT_FAILURES=3, LLM_CIRCUIT_RESET=30)
+    def test_error_event_when_llm_unavailable(self):
+        circuit_breaker.state = "open"
+        circuit_breaker.opened_at = time.monotonic()
+
+        response = self.client.post(self.url, {"message": "안녕"}, format="json")
+
+        events = self.read_events(response)
+        self.assertEqual([event for event, _ in events], ["error"])
+        self.assertEqual(events[0][1]["status"], 503)
+        self.assertTrue(events[0][1]["retry_after"] > 0)
+        self.assertFalse(Chat.objects.filter(room=self.room, role="ai").exists())
+        self.assertEqual(admission.in_flight, 0)
+
+
+@override_settings(LLM_BACKEND="fake", FAKE_LLM=FAKE_LLM)
+class ParseSuggestionsTests(SimpleTestCase):
+    def setUp(self):
+        self.service = ChatService()
+
+    def test_json_array(self):
+        self.assertEqual(
+            self.service.parse_suggestions('["안녕", "뭐 해?", "잘 자"]', 3),
+            ["안녕", "뭐 해?", "잘 자"],
+        )
+
+    def test_array_inside_text(self):
+        text = '```json\n["안녕", "뭐 해?"]\n```'
+        self.assertEqual(self.service.parse_suggestions(text, 3), ["안녕", "뭐 해?"])
+
+    def test_strips_dedupes_and_skips_non_strings(self):
+        text = '[" 안녕 ", "안녕", "", 1, null, "잘 자"]'
+        self.assertEqual(self.service.parse_suggestions(text, 3), ["안녕", "잘 자"])
+
+    def test_limits_count(self):
+        self.assertEqual(
+            self.service.parse_suggestions('["a", "b", "c"]', 2), ["a", "b"]
+        )
+
+    def test_invalid_json(self):
+        for text in ("", "추천 답변", '["안녕"', '["안녕",]', "] [", "[{"):
+            with self.subTest(text=text):
+                self.assertEqual(self.service.parse_suggestions(text, 3), [])
+
+
+class PromptCacheTests(SimpleTestCase):
+    def test_lru_eviction_and_stats(self):
+        prompt_cache = PromptCache(maxsize=2)
+        calls = []
+
+        def factory(key):
+            def create():
+                calls.append(key)
+                return key.upper()
+
+            return create
+
+        self.assertEqual(prompt_cache.get_or_create("a", factory("a")), "A")
+        prompt_cache.get_or_create("b", factory("b"))
+        # a 를 다시 사용했으므로 가장 오래 사용하지 않은 b 가 밀려납니다.
+        self.assertEqual(prompt_cache.get_or_create("a", factory("a")), "A")
+        prompt_cache.get_or_create("c", factory("c"))
+        prompt_cache.get_or_create("b", factory("b"))
+
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        self.assertEqual(
+            prompt_cache.stats(),
+            {"hits": 1, "misses": 4, "evictions": 2, "size": 2, "maxsize": 2},
+        )
+
+
+class CompiledPromptTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        prompt_cache.clear()
+
+    def test_compiled_once_per_character_version(self):
+        with mock.patch.object(
+            self.service, "compile_prompt", wraps=self.service.compile_prompt
+        ) as compile_prompt:
+            first = self.service.get_compiled_prompt(self.character)
+            self.assertIs(self.service.get_compiled_prompt(self.character), first)
+            self.assertEqual(compile_prompt.call_count, 1)
+
+            self.character.description = "새 설명"
+            self.character.save()
+            updated = self.service.get_compiled_prompt(self.character)
+
+        self.assertEqual(compile_prompt.call_count, 2)
+        self.assertIn("새 설명", updated.text)
+        self.assertNotIn("새 설명", first.text)
+
+    def test_suggestion_prompt_keyed_by_count(self):
+        self.assertIs(
+            self.service.get_suggestion_prompt(self.character, 3),
+            self.service.get_suggestion_prompt(self.character, 3),
+        )
+        self.assertIsNot(
+            self.service.get_suggestion_prompt(self.character, 1),
+            self.service.get_suggestion_prompt(self.character, 3),
+        )
+
+
+class TokenBudgetTests(FakeLLMTestCase):
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("abcde"), 2)
+        self.assertEqual(estimate_tokens("안녕하"), 2)
+        self.assertEqual(estimate_tokens("hi 안녕"), 3)
+
+    def test_trim_by_budget_keeps_latest_entries(self):
+        entries = [(1, "user", "a", 5), (2, "ai", "b", 3), (3, "user", "c", 4)]
+
+        self.assertEqual(window_cache.trim(entries, 7), entries[1:])
+        self.assertEqual(window_cache.trim(entries, 12), entries)
+        self.assertEqual(window_cache.trim(entries, 3), [])
+
+    @override_settings(CONVERSATION_HISTORY_LIMIT=2)
+    def test_trim_by_count_without_budget(self):
+        entries = [(1, "user", "a", 5), (2, "ai", "b", 3), (3, "user", "c", 4)]
+        self.assertEqual(window_cache.trim(entries), entries[1:])
+
+    def test_history_queryset_within_budget(self):
+        chats = [
+            self.service.save_chat(self.room, content, role)
+            for content, role in (
+                ("처음 인사", "user"),
+                ("반가워", "ai"),
+                ("오늘 뭐 했어?", "user"),
+                ("산책했어", "ai"),
+            )
+        ]
+        tokens = [chat.token_count for chat in chats]
+        budget = tokens[-1] + tokens[-2]
+
+        rows = list(self.service.get_history_queryset(self.room, budget=budget))
+        self.assertEqual([row[0] for row in rows], [chats[3].id, chats[2].id])
+
+        rows = list(self.service.get_history_queryset(self.room, budget=budget - 1))
+        self.assertEqual([row[0] for row in rows], [chats[3].id])
+
+    @override_settings(CONVERSATION_TOKEN_BUDGET=1000, CONVERSATION_SUMMARY=False)
+    def test_history_budget_excludes_system_prompt(self):
+        prompt_tokens = self.service.get_compiled_prompt(self.character).tokens
+        self.assertEqual(
+            self.service.get_history_budget(self.character), 1000 - prompt_tokens
+        )
+
+        with override_settings(CONVERSATION_TOKEN_BUDGET=1):
+            self.assertEqual(self.service.get_history_budget(self.character), 0)
+        with override_settings(CONVERSATION_TOKEN_BUDGET=0):
+            self.assertIsNone(self.service.get_history_budget(self.character))
+
+
+class FakeChatModelTests(SimpleTestCase):
+    def setUp(self):
+        self.model = FakeChatModel(**FAKE_LLM)
+        self.messages = [SystemMessage(content="테스트"), HumanMessage(content="안녕")]
+
+    def test_same_input_same_reply(self):
+        reply = self.model.invoke(self.messages).content
+
+        self.assertEqual(len(reply.split()), FAKE_LLM["reply_tokens"])
+        self.assertEqual(FakeChatModel(**FAKE_LLM).invoke(self.messages).content, reply)
+        self.assertNotEqual(
+            self.model.invoke([HumanMessage(content="잘 자")]).content, reply
+        )
+        self.assertNotEqual(
+            FakeChatModel(**{**FAKE_LLM, "seed": 1}).invoke(self.messages).content,
+            reply,
+        )
+
+    def test_stream_matches_invoke(self):
+        chunks = [chunk.content for chunk in self.model.stream(self.messages)]
+
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual("".join(chunks), self.model.invoke(self.messages).content)
+
+    def test_json_batch_returns_requested_count(self):
+        message = HumanMessage(content="추천 답변 5개를 JSON 배열로 작성하세요.")
+        reply = self.model.invoke([message]).content
+
+        self.assertEqual(len(json.loads(reply)), 5)
+
+    def test_usage_metadata(self):
+        message = self.model.invoke(self.messages)
+
+        self.assertEqual(
+            message.usage_metadata["input_tokens"],
+            estimate_tokens("테스트") + estimate_tokens("안녕"),
+        )
+        self.assertEqual(
+            message.usage_metadata["output_tokens"], estimate_tokens(message.content)
+        )
+
+    def test_injected_error(self):
+        model = FakeChatModel(**{**FAKE_LLM, "error_rate": 1.0})
+        with self.assertRaisesMessage(RuntimeError, "injected error"):
+            model.invoke(self.messages)
+
+    def test_latency_distributions(self):
+        model = FakeChatModel(latency="uniform", latency_ms=100, jitter_ms=20)
+        samples = [model.sample_latency() for _ in range(100)]
+        self.assertTrue(all(0.08 <= sample <= 0.12 for sample in samples))
+
+        model = FakeChatModel(latency="fixed", latency_ms=100, jitter_ms=20)
+        self.assertEqual(model.sample_latency(), 0.1)
+
+
+@override_settings(SUGGESTION_MODE="batch")
+class ChatSuggestionBatchTests(FakeLLMTestCase):
+    def test_single_call_returns_requested_count(self):
+        self.service.save_chat(self.room, "안녕", "user")
+        self.service.save_chat(self.room, "반가워", "ai")
+
+        with mock.patch.object(
+            self.service, "aget_single_suggestion"
+        ) as aget_single_suggestion:
+            suggestions = async_to_sync(self.service.aget_chat_suggestions)(
+                self.room, 3
+            )
+
+        self.assertEqual(len(suggestions), 3)
+        aget_single_suggestion.assert_not_called()
+
+
+class MetricsTests(SimpleTestCase):
+    def test_histogram_render_is_cumulative(self):
+        histogram = Histogram("test_seconds", "테스트", (0.1, 1), ("kind",))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value, kind="chat")
+
+        self.assertEqual(
+            histogram.render(),
+            [
+                "# HELP test_seconds 테스트",
+                "# TYPE test_seconds histogram",
+                'test_seconds_bucket{kind="chat",le="0.1"} 2',
+                'test_seconds_bucket{kind="chat",le="1"} 3',
+                'test_seconds_bucket{kind="chat",le="+Inf"} 4',
+                'test_seconds_sum{kind="chat"} 2.65',
+                'test_seconds_count{kind="chat"} 4',
+            ],
+        )
+
+    def test_counter_render(self):
+        counter = Counter("test_total", "테스트", ("result",))
+        counter.inc(result="ok")
+        counter.inc(2, result="ok")
+        counter.inc(result="error")
+        self.assertEqual(
+            counter.render()[2:],
+            ['test_total{result="error"} 1', 'test_total{result="ok"} 3'],
+        )
+
+        counter = Counter("test_plain_total", "테스트")
+        counter.inc()
+        self.assertEqual(counter.render()[2:], ["test_plain_total 1"])
+
+    def test_registry_renders_metrics_and_collectors(self):
+        registry = MetricsRegistry()
+        self.assertIs(
+            registry.counter("test_total", "테스트"),
+            registry.counter("test_total", "테스트"),
+        )
+        registry.counter("test_total", "테스트").inc()
+        registry.register_collector(
+            lambda: [("test_gauge", "게이지", "gauge", {(("state", "open"),): 1})]
+        )
+
+        text = registry.render()
+        self.assertIn("test_total 1\n", text)
+        self.assertIn("# TYPE test_gauge gauge\n", text)
+        self.assertIn('test_gauge{state="open"} 1\n', text)
+
+        registry.reset()
+        self.assertNotIn("test_total 1\n", registry.render())
+
+
+class LLMMetricsTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+
+    def test_llm_call_is_recorded(self):
+        self.service.get_ai_response(self.room, "안녕")
+
+        text = metrics.render()
+        self.assertIn(
+            'beta_llm_request_duration_seconds_count{kind="chat",outcome="success"} 1',
+            text,
+        )
+        self.assertIn('beta_llm_output_tokens_count{kind="chat"} 1', text)
+        self.assertIn('beta_llm_history_messages_count{kind="chat"} 1', text)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/api/v1/rooms/metrics/").status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = client.get("/api/v1/rooms/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "# TYPE beta_llm_request_duration_seconds histogram",
+            response.content.decode(),
+        )
+
+
+@override_settings(
+    LLM_CIRCUIT_FAILURES=2, LLM_CIRCUIT_RESET=30, LLM_DEADLINES={}, LLM_HEDGING=False
+)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker()
+        self.now = 1000.0
+        patcher = mock.patch("rooms.resilience.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.before_call()
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.now += 10
+        with self.assertRaises(CircuitOpenError) as context:
+            self.breaker.before_call()
+        self.assertEqual(context.exception.retry_after, 20)
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_half_open_probe_success_closes(self):
+        self.open()
+        self.now += 30
+
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, "half_open")
+        # 시험 호출 중에는 다른 호출이 바로 실패합니다.
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.before_call()
+
+    def test_half_open_probe_failure_reopens(self):
+        self.open()
+        self.now += 30
+        self.breaker.before_call()
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertEqual(self.breaker.opened_at, self.now)
+
+    def test_stuck_probe_is_replaced_after_reset_timeout(self):
+        self.open()
+        self.now += 30
+        self.breaker.before_call()
+
+        self.now += 30
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.probe_started, self.now)
+
+    def test_disabled(self):
+        with override_settings(LLM_CIRCUIT_FAILURES=0):
+            for _ in range(5):
+                self.breaker.record_failure()
+            self.breaker.before_call()
+        self.assertEqual(self.breaker.state, "closed")
+
+    def test_call_llm_records_outcomes(self):
+        async def fail():
+            raise RuntimeError("fail")
+
+        async def succeed():
+            return "ok"
+
+        with mock.patch("rooms.resilience.circuit_breaker", self.breaker):
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    async_to_sync(call_llm)("chat", fail)
+            with self.assertRaises(CircuitOpenError):
+                async_to_sync(call_llm)("chat", succeed)
+
+            self.now += 30
+            self.assertEqual(async_to_sync(call_llm)("chat", succeed), "ok")
+        self.assertEqual(self.breaker.state, "closed")
+
+
+@override_settings(
+    LLM_USER_CONCURRENCY=2,
+    LLM_GLOBAL_CONCURRENCY=2,
+    LLM_ADMISSION_QUEUE=1,
+    LLM_ADMISSION_TIMEOUT=1.0,
+    LLM_ADMISSION_POLL_INTERVAL=0.01,
+    LLM_ADMISSION_RETRY_AFTER=3,
+)
+class AdmissionControllerTests(SimpleTestCase):
+    def setUp(self):
+        self.admission = AdmissionController()
+
+    async def test_user_limit(self):
+        await self.admission.acquire(1)
+        await self.admission.acquire(1)
+
+        with self.assertRaises(AdmissionRejected) as context:
+            await self.admission.acquire(1)
+
+        self.assertEqual(context.exception.status_code, 429)
+        self.assertEqual(context.exception.retry_after, 3)
+        self.assertEqual(self.admission.per_user, {1: 2})
+        self.assertEqual(self.admission.in_flight, 2)
+
+    async def test_waits_for_global_slot(self):
+        await self.admission.acquire(1)
+        await self.admission.acquire(2)
+
+        waiter = asyncio.ensure_future(self.admission.acquire(3))
+        await asyncio.sleep(0)
+        self.assertEqual(self.admission.waiting, 1)
+        self.assertFalse(waiter.done())
+
+        await self.admission.release(1)
+        await waiter
+
+        self.assertEqual(self.admission.waiting, 0)
+        self.assertEqual(self.admission.in_flight, 2)
+        self.assertEqual(self.admission.per_user, {2: 1, 3: 1})
+
+    def test_waiter_on_another_loop_sees_released_slot(self):
+        async_to_sync(self.admission.acquire)(1)
+        async_to_sync(self.admission.acquire)(2)
+
+        # WSGI 처럼 요청마다 다른 이벤트 루프에서 기다리고 반환하는 경우
+        result = {}
+
+        def wait():
+            started = time.monotonic()
+            asyncio.run(self.admission.acquire(3))
+            result["waited"] = time.monotonic() - started
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        while not self.admission.waiting:
+            time.sleep(0.001)
+
+        async_to_sync(self.admission.release)(1)
+        waiter.join(timeout=5)
+
+        self.assertLess(result["waited"], 0.5)
+        self.assertEqual(self.admission.in_flight, 2)
+        self.assertEqual(self.admission.per_user, {2: 1, 3: 1})
+
+    async def test_queue_full(self):
+        await self.admission.acquire(1)
+        await self.admission.acquire(2)
+        waiter = asyncio.ensure_future(self.admission.acquire(3))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(AdmissionRejected) as context:
+            await self.admission.acquire(4)
+
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertNotIn(4, self.admission.per_user)
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(self.admission.waiting, 0)
+        self.assertNotIn(3, self.admission.per_user)
+
+    async def test_queue_timeout(self):
+        await self.admission.acquire(1)
+        await self.admission.acquire(2)
+
+        with override_settings(LLM_ADMISSION_TIMEOUT=0.01):
+            with self.assertRaisesMessage(AdmissionRejected, "요청이 많아") as context:
+                await self.admission.acquire(3)
+
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(self.admission.waiting, 0)
+        self.assertEqual(self.admission.in_flight, 2)
+        self.assertNotIn(3, self.admission.per_user)
+
+    async def test_admit_releases_on_error(self):
+        with self.assertRaises(RuntimeError):
+            async with self.admission.admit(1):
+                self.assertEqual(self.admission.in_flight, 1)
+                raise RuntimeError
+
+        self.assertEqual(self.admission.in_flight, 0)
+        self.assertEqual(self.admission.per_user, {})
+
+    async def test_cost_is_capped_by_limits(self):
+        # 전체 한도보다 큰 요청도 한도만큼 차지하고 사용자 한도 안에서 허용됩니다.
+        await self.admission.acquire(1, cost=5)
+        self.assertEqual(self.admission.in_flight, 2)
+
+        await self.admission.release(1, cost=5)
+        self.assertEqual(self.admission.in_flight, 0)
+        self.assertEqual(self.admission.per_user, {})
+
+    async def test_try_acquire_skips_when_busy(self):
+        self.assertTrue(self.admission.try_acquire())
+        self.assertEqual(self.admission.per_user, {})
+
+        await self.admission.acquire(1)
+        self.assertFalse(self.admission.try_acquire())
+
+        await self.admission.release(None)
+        self.assertTrue(self.admission.try_acquire())
+
+
+@override_settings(LLM_USER_CONCURRENCY=1)
+class AdmissionViewTests(FakeLLMTestCase):
+    def tearDown(self):
+        admission.per_user.clear()
+
+    def test_user_limit_returns_429(self):
+        admission.per_user[self.user.pk] = 1
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(
+            f"/api/v1/rooms/{self.room.uuid}/messages/",
+            {"message": "안녕"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertFalse(Chat.objects.filter(room=self.room).exists())
+
+
+class ChatKeysetPaginationTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/rooms/{self.room.uuid}/"
+
+        # 같은 시각의 메시지가 페이지 경계에 걸치도록 두 개씩 같은 created_at 을 사용합니다.
+        started = timezone.now() - timedelta(minutes=10)
+        self.chats = Chat.objects.bulk_create(
+            Chat(
+                room=self.room,
+                content=f"메시지 {i}",
+                role="user" if i % 2 == 0 else "ai",
+                created_at=started + timedelta(seconds=i // 2),
+            )
+            for i in range(7)
+        )
+
+    def test_cursor_round_trip(self):
+        chat = self.chats[3]
+        cursor = chat_paginator.encode_cursor(chat)
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(
+            chat_paginator.decode_cursor(cursor), (chat.created_at, chat.id)
+        )
+
+    def test_invalid_cursor(self):
+        for cursor in ("!!!", "bm90IGpzb24", "WzFd", "WyJ4IiwgMV0"):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValidationError):
+                    chat_paginator.decode_cursor(cursor)
+
+    def test_pages_cover_equal_timestamps_without_gaps(self):
+        queryset = Chat.objects.filter(room=self.room)
+        ids, before = [], None
+
+        while True:
+            chats, before = chat_paginator.paginate(queryset, before, 2)
+            # 각 페이지는 오래된 순이고, 이전 페이지는 더 오래된 메시지입니다.
+            ids = [chat.id for chat in chats] + ids
+            if before is None:
+                break
+
+        self.assertEqual(ids, [chat.id for chat in self.chats])
+
+    def test_room_detail_pages(self):
+        response = self.client.get(self.url, {"limit": 3})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            [chat["content"] for chat in data["chats"]],
+            ["메시지 4", "메시지 5", "메시지 6"],
+        )
+        self.assertTrue(data["has_more"])
+
+        response = self.client.get(self.url, {"limit": 3, "before": data["before"]})
+        data = response.json()
+        self.assertEqual(
+            [chat["content"] for chat in data["chats"]],
+            ["메시지 1", "메시지 2", "메시지 3"],
+        )
+
+        response = self.client.get(self.url, {"limit": 3, "before": data["before"]})
+        data = response.json()
+        self.assertEqual([chat["content"] for chat in data["chats"]], ["메시지 0"])
+        self.assertFalse(data["has_more"])
+        self.assertIsNone(data["before"])
+
+    @override_settings(ROOM_CHATS_PAGE_SIZE=2, ROOM_CHATS_MAX_PAGE_SIZE=4)
+    def test_room_detail_limit(self):
+        self.assertEqual(len(self.client.get(self.url).json()["chats"]), 2)
+        self.assertEqual(
+            len(self.client.get(self.url, {"limit": 100}).json()["chats"]), 4
+        )
+        self.assertEqual(self.client.get(self.url, {"limit": "abc"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"before": "!!!"}).status_code, 400)
+
+
+class RunScenarioTests(FakeLLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unexpected_status_codes_are_recorded(self):
+        missing = {"method": "get", "path": f"/api/v1/rooms/{uuid.uuid4()}/"}
+
+        result = run_scenario(self.client, lambda i: missing, 2, 1, 1)
+        self.assertEqual(result["status_codes"], {"404": 2})
+        self.assertEqual(result["unexpected_status_codes"], {"404": 4})
+
+        expected = {**missing, "expect": (404,)}
+        result = run_scenario(self.client, lambda i: expected, 2, 1, 1)
+        self.assertEqual(result["unexpected_status_codes"], {})
+
+    def test_success_is_expected(self):
+        detail = {"method": "get", "path": f"/api/v1/rooms/{self.room.uuid}/"}
+
+        result = run_scenario(self.client, lambda i: detail, 2, 1, 1)
+        self.assertEqual(result["unexpected_status_codes"], {})
@@ -0,0 +1,14 @@
+# Python Library
+import math
+
+
+# 모델 토크나이저를 호출하지 않고 토큰 수를 대략적으로 추정합니다.
+# 영문/숫자 등 ASCII 문자는 약 4자당 1토큰, 한글 등 그 외 문자는 약 1.5자당 1토큰으로 계산합니다.
+def estimate_tokens(text):
+    if not text:
+        return 0
+
+    ascii_count = sum(1 for char in text if char.isascii())
+    other_count = len(text) - ascii_count
+
+    return math.ceil(ascii_count / 4 + other_count / 1.5)
@@ -6,19 +6,30 @@ from .views import (
     RoomAPIView,
     RoomDetailAPIView,
     ChatAPIView,
+    ChatStreamAPIView,
+    GenerationJobAPIView,
     ChatMessageDetailView,
     ChatSuggestionAPIView,
     ChatRegenerateAPIView,
     HistoryAPIView,
     HistoryDetailAPIView,
+    LLMMetricsAPIView,
 )
 
 urlpatterns = [
     # 채팅방 관련 기능
     path("", RoomAPIView.as_view()),
     path("<uuid:room_uuid>/", RoomDetailAPIView.as_view()),
+    # 운영 메트릭 (관리자 전용)
+    path("metrics/", LLMMetricsAPIView.as_view()),
     # 메시지 관련 기능
     path("<uuid:room_uuid>/messages/", ChatAPIView.as_view()),
+    path("<uuid:room_uuid>/messages/stream/", ChatStreamAPIView.as_view()),
+    path(
+        "<uuid:room_uuid>/jobs/<uuid:job_id>/",
+        GenerationJobAPIView.as_view(),
+        name="generation-job",
+    ),
     path("<uuid:room_uuid>/messages/<int:chat_id>/", ChatMessageDetailView.as_view()),
     path("<uuid:room_uuid>/suggestions/", ChatSuggestionAPIView.as_view()),
     path("<uuid:room_uuid>/regenerate/", ChatRegenerateAPIView.as_view()),
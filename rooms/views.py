@@ -1,23 +1,47 @@
 # Python Library
+import asyncio
+import hashlib
+import json
 import uuid
 
 # Third-Party Package
 from django.conf import settings
-from django.db.models import Prefetch
-from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from django.urls import reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
-from drf_spectacular.utils import OpenApiResponse, extend_schema
+from adrf.views import APIView as AsyncAPIView
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    OpenApiResponse,
+    PolymorphicProxySerializer,
+    extend_schema,
+)
 
 # Local Apps
 from characters.models import Character, ConversationHistory
-from .models import Chat, Room
+from .admission import AdmissionRejected, admission
+from .caches import suggestion_cache, window_cache
+from .history import load_history
+from .metrics import metrics
+from .models import Chat, GenerationJob, Room
+from .pagination import chat_paginator, room_paginator
+from .resilience import LLMUnavailable
 from .serializers import (
     RoomSerializer,
+    RoomListSerializer,
     RoomCreateSerializer,
     RoomCreateResponseSerializer,
     RoomDetailSerializer,
@@ -26,6 +50,7 @@ from .serializers import (
     ChatResponseSerializer,
     ChatUpdateResponseSerializer,
     ChatDetailSerializer,
+    GenerationJobSerializer,
     HistoryListSerializer,
     HistoryDetailSerializer,
     HistoryTitleSerializer,
@@ -37,31 +62,99 @@ from .services import ChatService
 class RoomAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
+    # 사용자와 사용자의 채팅방 수, 채팅방/캐릭터의 마지막 변경 시각, 요청한 페이지로 만든 강한 ETag
+    # 메시지 저장/수정/삭제, 고정 변경은 Room.updated_at 을 갱신하고, 채팅방 삭제는 개수가 바뀝니다.
+    def get_list_etag(self, request):
+        stats = Room.objects.filter(user=request.user).aggregate(
+            count=Count("uuid"),
+            updated_at=Max("updated_at"),
+            character_updated_at=Max("character__updated_at"),
+        )
+        key = json.dumps(
+            [
+                request.user.pk,
+                stats["count"],
+                str(stats["updated_at"]),
+                str(stats["character_updated_at"]),
+                request.query_params.get("cursor"),
+                request.query_params.get("limit"),
+            ]
+        )
+        return f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+    # 클라이언트가 매번 ETag 로 재검증하도록 하고, 사용자별 응답이므로 공유 캐시에는 저장하지 않습니다.
+    # 인증은 Authorization 헤더 또는 JWT 쿠키로 하므로 둘 다 Vary 에 추가합니다.
+    def set_cache_headers(self, response, etag):
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Authorization", "Cookie"])
+        return response
+
     @extend_schema(
         summary="채팅방 리스트 조회",
-        description="현재 로그인 한 사용자의 채팅방의 목록을 조회합니다.",
+        description=(
+            "현재 로그인 한 사용자의 채팅방의 목록을 고정된 채팅방, 최근 대화한 순으로 조회합니다. "
+            "cursor, limit 파라미터가 없으면 기존과 같이 전체 채팅방 배열을 반환합니다. "
+            "limit 또는 cursor 를 전달하면 {rooms, has_more, next} 형식의 페이지를 반환하고, "
+            "has_more 가 true 이면 응답의 next 값을 cursor 파라미터로 전달해 다음 페이지를 조회합니다. "
+            "응답의 ETag 를 If-None-Match 헤더로 보내면 목록이 바뀌지 않은 경우 304를 반환합니다."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                location="query",
+                required=False,
+                description="다음 페이지 커서 (이전 응답의 next 값)",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                location="query",
+                required=False,
+                description="한 번에 조회할 채팅방 개수 (기본 ROOMS_PAGE_SIZE)",
+            ),
+        ],
         responses={
-            200: RoomSerializer(many=True),
+            200: PolymorphicProxySerializer(
+                component_name="RoomListResponse",
+                serializers=[RoomSerializer(many=True), RoomListSerializer()],
+                resource_type_field_name=None,
+                many=False,
+            ),
+            304: OpenApiResponse(description="변경 없음 (If-None-Match 일치)"),
+            400: OpenApiResponse(description="잘못된 커서 또는 limit"),
             401: OpenApiResponse(description="인증되지 않은 사용자"),
         },
         tags=["rooms/room"],
     )
     def get(self, request):
-        rooms = (
-            Room.objects.filter(user=request.user)
-            .select_related("character")
-            .prefetch_related(
-                Prefetch(
-                    "chats",
-                    queryset=Chat.objects.order_by("-created_at")[:1],
-                    to_attr="latest_chat",
-                )
+        etag = self.get_list_etag(request)
+
+        # 목록이 바뀌지 않았으면 채팅방 조회와 직렬화 없이 304를 반환합니다.
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self.set_cache_headers(not_modified, etag)
+
+        queryset = Room.objects.filter(user=request.user).select_related("character")
+        cursor = request.query_params.get("cursor")
+        limit = request.query_params.get("limit")
+
+        # 페이지 파라미터가 없는 기존 클라이언트에는 이전과 같은 형식 (전체 채팅방 배열)으로 응답합니다.
+        if cursor is None and limit is None:
+            rooms = queryset.order_by(*room_paginator.ordering)
+            response = Response(
+                RoomSerializer(rooms, many=True).data, status=status.HTTP_200_OK
             )
-            .order_by("-fixation", "-updated_at")
-        )
+            return self.set_cache_headers(response, etag)
 
-        serializer = RoomSerializer(rooms, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        rooms, next_cursor = room_paginator.paginate(queryset, cursor, limit)
+
+        serializer = RoomListSerializer(
+            {"rooms": rooms, "has_more": next_cursor is not None, "next": next_cursor}
+        )
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        return self.set_cache_headers(response, etag)
 
     @extend_schema(
         summary="채팅방 생성",
@@ -100,7 +193,9 @@ class RoomDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get_room(self, room_uuid, user):
-        room = get_object_or_404(Room, uuid=room_uuid)
+        room = get_object_or_404(
+            Room.objects.select_related("character", "user"), uuid=room_uuid
+        )
 
         if room.user != user:
             raise PermissionDenied("해당 채팅방에 대한 접근 권한이 없습니다.")
@@ -109,9 +204,30 @@ class RoomDetailAPIView(APIView):
 
     @extend_schema(
         summary="채팅방 상세 조회",
-        description="로그인한 사용자가 채팅방에서 나눈 대화 내역을 출력합니다.",
+        description=(
+            "로그인한 사용자가 채팅방에서 나눈 대화 내역을 출력합니다. "
+            "최신 메시지부터 limit 개를 오래된 순으로 반환하고, has_more 가 true 이면 "
+            "응답의 before 값을 before 파라미터로 전달해 이전 메시지를 조회합니다."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="before",
+                type=str,
+                location="query",
+                required=False,
+                description="이전 페이지 커서 (이전 응답의 before 값)",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                location="query",
+                required=False,
+                description="한 번에 조회할 메시지 개수 (기본 ROOM_CHATS_PAGE_SIZE)",
+            ),
+        ],
         responses={
             200: OpenApiResponse(description="채팅 내역 조회 성공"),
+            400: OpenApiResponse(description="잘못된 커서 또는 limit"),
             401: OpenApiResponse(description="인증되지 않은 사용자"),
             403: OpenApiResponse(description="접근 권한이 없음"),
             404: OpenApiResponse(description="존재하지 않는 채팅방"),
@@ -121,7 +237,17 @@ class RoomDetailAPIView(APIView):
     def get(self, request, room_uuid):
         room = self.get_room(room_uuid, request.user)
 
-        serializer = RoomDetailSerializer(room)
+        chats, before = chat_paginator.paginate(
+            Chat.objects.filter(room=room).only(
+                "id", "role", "content", "is_main", "created_at"
+            ),
+            request.query_params.get("before"),
+            request.query_params.get("limit"),
+        )
+
+        serializer = RoomDetailSerializer(
+            room, context={"chats": chats, "before": before}
+        )
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -140,7 +266,7 @@ class RoomDetailAPIView(APIView):
         room = self.get_room(room_uuid, request.user)
 
         room.fixation = not room.fixation
-        room.save()
+        room.save(update_fields=["fixation", "updated_at"])
 
         serializer = RoomFixationSerializer(room)
 
@@ -168,7 +294,7 @@ class RoomDetailAPIView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ChatAPIView(APIView):
+class ChatAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
@@ -176,17 +302,36 @@ class ChatAPIView(APIView):
         description="""
         채팅방에서 챗봇과 메시지를 주고받는 API입니다.
         user_message를 생략하면 이어서 AI가 응답만 생성합니다.
+        `?mode=queue`(또는 CHAT_GENERATION_MODE=queue)이면 응답 생성 작업을 대기열에 넣고
+        바로 job_id를 반환합니다. 결과는 작업 상태 조회 API로 확인합니다.
         """,
+        parameters=[
+            OpenApiParameter(
+                name="mode",
+                type=str,
+                location="query",
+                enum=["inline", "queue"],
+                required=False,
+                description="inline: 응답 생성 후 반환, queue: 작업 등록 후 바로 반환",
+            ),
+        ],
         request=ChatRequestSerializer,
         responses={
             200: ChatRequestSerializer,
+            202: OpenApiResponse(description="응답 생성 작업 등록"),
             400: OpenApiResponse(description="잘못된 요청"),
             401: OpenApiResponse(description="인증되지 않은 사용자"),
             404: OpenApiResponse(description="채팅방을 찾을 수 없음"),
+            429: OpenApiResponse(
+                description="사용자 동시 요청 한도 초과 (Retry-After)"
+            ),
+            503: OpenApiResponse(
+                description="서버 요청 한도 초과 또는 LLM 응답 지연/장애 (Retry-After)"
+            ),
         },
         tags=["rooms/message"],
     )
-    def post(self, request, room_uuid):
+    async def post(self, request, room_uuid):
         serializer = ChatRequestSerializer(data=request.data)
 
         if not serializer.is_valid():
@@ -194,17 +339,60 @@ class ChatAPIView(APIView):
 
         user_message = serializer.validated_data["message"]
 
-        room = get_object_or_404(Room, uuid=room_uuid, user=request.user)
+        room = await aget_object_or_404(
+            Room.objects.select_related("character", "user"),
+            uuid=room_uuid,
+            user=request.user,
+        )
 
         chat_service = ChatService()
 
-        if user_message:
-            user_chat_obj = chat_service.save_chat(room, user_message, "user")
-            ai_response = chat_service.get_ai_response(room, user_message)
-        else:
-            ai_response = chat_service.get_ai_response(room)
+        mode = request.query_params.get("mode", settings.CHAT_GENERATION_MODE)
 
-        ai_chat_obj = chat_service.save_chat(room, ai_response, "ai")
+        if mode == "queue":
+            if user_message:
+                await chat_service.asave_chat(room, user_message, "user")
+
+            job = await GenerationJob.objects.acreate(
+                room=room, user_message=user_message
+            )
+
+            return Response(
+                {
+                    "job_id": str(job.uuid),
+                    "status": job.status,
+                    "status_url": request.build_absolute_uri(
+                        reverse(
+                            "generation-job",
+                            kwargs={"room_uuid": room.uuid, "job_id": job.uuid},
+                        )
+                    ),
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        try:
+            await admission.acquire(request.user.pk)
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+
+        try:
+            if user_message:
+                await chat_service.asave_chat(room, user_message, "user")
+                ai_response = await chat_service.aget_ai_response(room, user_message)
+            else:
+                ai_response = await chat_service.aget_ai_response(room)
+        except LLMUnavailable as e:
+            # 사용자 메시지는 저장되어 있으므로 메시지 없이 다시 요청하면 응답만 생성합니다.
+            return llm_unavailable_response(
+                e, "응답을 생성할 수 없습니다. 잠시 후 다시 시도해주세요."
+            )
+        finally:
+            await admission.release(request.user.pk)
+
+        ai_chat_obj = await chat_service.asave_chat(room, ai_response, "ai")
+        chat_service.schedule_summary(room)
+        chat_service.schedule_suggestion_prefetch(request, room)
 
         response_serializer = ChatResponseSerializer(
             ai_chat_obj, context={"input_user_message": user_message}
@@ -212,6 +400,161 @@ class ChatAPIView(APIView):
         return Response(response_serializer.data, status=status.HTTP_200_OK)
 
 
+# 동시 요청 한도/대기열 초과 (429: 사용자 한도, 503: 서버 전체 한도)
+def admission_rejected_response(error):
+    return Response(
+        {"error": str(error)},
+        status=error.status_code,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+# 마감 시간 초과 또는 서킷 브레이커 차단 (응답을 저장하지 않고 다시 시도하도록 안내)
+def llm_unavailable_response(error, message):
+    return Response(
+        {"error": message},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(error.retry_after or 1)},
+    )
+
+
+def format_sse(event, data):
+    payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class ChatStreamAPIView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="채팅 메시지 전송 (스트리밍)",
+        description="""
+        채팅 메시지 전송 API의 스트리밍 버전입니다.
+        AI 응답을 server-sent events(text/event-stream)로 전송합니다.
+        - `token` 이벤트: 생성된 응답 조각 (`{"content": "..."}`)
+        - `done` 이벤트: 응답 생성이 끝난 뒤 저장된 메시지 (채팅 메시지 전송 API 응답과 동일)
+        - `error` 이벤트: 요청 한도 초과(status 429/503) 또는 LLM 응답 지연/장애(status 503)로 응답을 생성하지 못함
+          (`{"error": "...", "status": 429, "retry_after": 초}`, 응답을 저장하지 않음)
+        스트리밍 중 연결이 끊기면 그때까지 전송한 응답 조각을 AI 메시지로 저장합니다.
+        """,
+        request=ChatRequestSerializer,
+        responses={
+            200: OpenApiResponse(description="text/event-stream 응답"),
+            400: OpenApiResponse(description="잘못된 요청"),
+            401: OpenApiResponse(description="인증되지 않은 사용자"),
+            404: OpenApiResponse(description="채팅방을 찾을 수 없음"),
+        },
+        tags=["rooms/message"],
+    )
+    async def post(self, request, room_uuid):
+        serializer = ChatRequestSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user_message = serializer.validated_data["message"]
+
+        room = await aget_object_or_404(
+            Room.objects.select_related("character", "user"),
+            uuid=room_uuid,
+            user=request.user,
+        )
+
+        response = StreamingHttpResponse(
+            self.event_stream(request, ChatService(), room, user_message),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx 버퍼링 없이 바로 전달
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    # 호출 슬롯은 스트림 안에서 받고 반환합니다.
+    # 응답 본문을 읽지 않고 버리거나 첫 조각 전에 연결이 끊기면 슬롯을 받지 않으므로 새지 않습니다.
+    async def event_stream(self, request, chat_service, room, user_message):
+        try:
+            await admission.acquire(request.user.pk)
+        except AdmissionRejected as e:
+            yield format_sse(
+                "error",
+                {
+                    "error": str(e),
+                    "status": e.status_code,
+                    "retry_after": e.retry_after,
+                },
+            )
+            return
+
+        chunks = []
+
+        try:
+            if user_message:
+                await chat_service.asave_chat(room, user_message, "user")
+
+            async for chunk in chat_service.astream_ai_response(
+                room, user_message or None
+            ):
+                chunks.append(chunk)
+                yield format_sse("token", {"content": chunk})
+        except LLMUnavailable as e:
+            # 응답을 저장하지 않고 다시 시도하도록 안내합니다.
+            yield format_sse(
+                "error",
+                {
+                    "error": "응답을 생성할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                    "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+                    "retry_after": e.retry_after or 1,
+                },
+            )
+            return
+        except (asyncio.CancelledError, GeneratorExit):
+            # 스트리밍 중 연결이 끊기면 지금까지 전송한 응답을 저장해 대화가 사용자 메시지로 끝나지 않게 합니다.
+            partial = "".join(chunks).strip()
+            if partial:
+                await chat_service.asave_chat(room, partial, "ai")
+            raise
+        finally:
+            await admission.release(request.user.pk)
+
+        # 스트림이 끝난 뒤 전체 응답을 한 번에 저장
+        ai_chat_obj = await chat_service.asave_chat(room, "".join(chunks).strip(), "ai")
+        chat_service.schedule_summary(room)
+        chat_service.schedule_suggestion_prefetch(request, room)
+
+        response_serializer = ChatResponseSerializer(
+            ai_chat_obj, context={"input_user_message": user_message}
+        )
+        yield format_sse("done", response_serializer.data)
+
+
+class GenerationJobAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="응답 생성 작업 상태 조회",
+        description=(
+            "대기열에 등록한 응답 생성 작업의 상태를 조회합니다. "
+            "status가 done이면 result에 채팅 메시지 전송 API와 같은 형식의 응답이 담깁니다."
+        ),
+        responses={
+            200: GenerationJobSerializer,
+            401: OpenApiResponse(description="인증되지 않은 사용자"),
+            404: OpenApiResponse(description="존재하지 않는 채팅방 또는 작업"),
+        },
+        tags=["rooms/message"],
+    )
+    def get(self, request, room_uuid, job_id):
+        job = get_object_or_404(
+            GenerationJob,
+            uuid=job_id,
+            room__uuid=room_uuid,
+            room__user=request.user,
+        )
+
+        serializer = GenerationJobSerializer(job)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 class ChatMessageDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -251,6 +594,13 @@ class ChatMessageDetailView(APIView):
 
         chat.content = serializer.validated_data["message"]
         chat.save()
+        room.refresh_activity()
+        window_cache.invalidate(room.pk)
+        suggestion_cache.invalidate(room.pk)
+
+        # 이미 요약된 메시지가 수정되면 요약을 다시 만듭니다.
+        if room.summarized_until and chat.created_at <= room.summarized_until:
+            room.reset_summary()
 
         response_serializer = ChatUpdateResponseSerializer(chat)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -290,6 +640,12 @@ class ChatMessageDetailView(APIView):
 
         chat.is_main = True
         chat.save()
+        room.refresh_activity()
+        window_cache.invalidate(room.pk)
+        suggestion_cache.invalidate(room.pk)
+
+        if room.summarized_until and chat.created_at <= room.summarized_until:
+            room.reset_summary()
 
         serializer = ChatDetailSerializer(chat)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -308,7 +664,11 @@ class ChatMessageDetailView(APIView):
     )
     def delete(self, request, room_uuid, chat_id):
         room = get_object_or_404(Room, uuid=room_uuid, user=request.user)
-        target_chat = Chat.objects.filter(id=chat_id, room=room).first()
+        target_chat = (
+            Chat.objects.filter(id=chat_id, room=room)
+            .only("created_at", "regeneration_group")
+            .first()
+        )
 
         if not target_chat:
             return Response(
@@ -316,19 +676,23 @@ class ChatMessageDetailView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        base_queryset = Chat.objects.filter(room=room, id__gte=chat_id)
-        chat_ids = list(base_queryset.values_list("id", flat=True))
-
+        # chat_id 이후의 메시지와 같은 재생성 그룹의 메시지를 id 목록 없이 한 번의 DELETE 로 지웁니다.
+        condition = Q(id__gte=chat_id)
         if target_chat.regeneration_group is not None:
-            regeneration_queryset = Chat.objects.filter(
-                room=room, regeneration_group=target_chat.regeneration_group
-            )
-            regeneration_ids = list(regeneration_queryset.values_list("id", flat=True))
-            chat_ids += regeneration_ids
+            condition |= Q(regeneration_group=target_chat.regeneration_group)
+
+        with transaction.atomic():
+            deleted_count, _ = Chat.objects.filter(condition, room=room).delete()
+            room.refresh_activity()
 
-        chat_ids = list(set(chat_ids))
+            if (
+                room.summarized_until
+                and target_chat.created_at <= room.summarized_until
+            ):
+                room.reset_summary()
 
-        deleted_count, _ = Chat.objects.filter(id__in=chat_ids).delete()
+        window_cache.invalidate(room.pk)
+        suggestion_cache.invalidate(room.pk)
 
         return Response(
             {"message": f"{deleted_count}개의 채팅이 삭제되었습니다."},
@@ -336,7 +700,7 @@ class ChatMessageDetailView(APIView):
         )
 
 
-class ChatSuggestionAPIView(APIView):
+class ChatSuggestionAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
@@ -349,13 +713,19 @@ class ChatSuggestionAPIView(APIView):
             401: OpenApiResponse(description="인증되지 않은 사용자"),
             403: OpenApiResponse(description="접근 권한이 없음"),
             404: OpenApiResponse(description="존재하지 않는 채팅방"),
+            503: OpenApiResponse(description="LLM 응답 지연/장애로 생성 불가"),
+            429: OpenApiResponse(
+                description="사용자 동시 요청 한도 초과 (Retry-After)"
+            ),
         },
         tags=["rooms/message"],
     )
-    def post(self, request, room_uuid):
-        room = get_object_or_404(Room, uuid=room_uuid)
+    async def post(self, request, room_uuid):
+        room = await aget_object_or_404(
+            Room.objects.select_related("character"), uuid=room_uuid
+        )
 
-        if room.user != request.user:
+        if room.user_id != request.user.pk:
             return Response(
                 {"error": "해당 채팅방에 대한 접근 권한이 없습니다."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -363,23 +733,38 @@ class ChatSuggestionAPIView(APIView):
 
         chat_service = ChatService()
 
+        # AI 응답 직후 미리 생성해 둔 추천 답변이 있으면 바로 반환합니다.
+        suggestions = await chat_service.apop_prefetched_suggestions(room)
+        if suggestions:
+            return Response({"suggestions": suggestions}, status=status.HTTP_200_OK)
+
         try:
-            memory = chat_service.create_memory_from_history(room)
-            if not memory.chat_memory.messages:
+            chat_history = await chat_service.aget_history_messages(room)
+            if not chat_history:
                 return Response(
                     {"error": "추천 답변을 생성할 대화 내역이 없습니다."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            suggestions = []
-            for _ in range(settings.SUGGESTIONS):
-                suggestion = chat_service.get_chat_suggestion(room)
-                suggestions.append(suggestion)
+            # concurrent 모드는 추천 답변 개수만큼 호출하므로 그만큼 슬롯을 사용합니다.
+            cost = chat_service.get_suggestion_cost()
+            async with admission.admit(request.user.pk, cost):
+                suggestions = await chat_service.aget_chat_suggestions(
+                    room, settings.SUGGESTIONS, chat_history
+                )
 
             response_data = {"suggestions": suggestions}
 
             return Response(response_data, status=status.HTTP_200_OK)
 
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+
+        except LLMUnavailable as e:
+            return llm_unavailable_response(
+                e, "추천 답변을 생성할 수 없습니다. 잠시 후 다시 시도해주세요."
+            )
+
         except Exception:
             return Response(
                 {"error": "추천 답변 생성 중 오류가 발생했습니다."},
@@ -387,7 +772,7 @@ class ChatSuggestionAPIView(APIView):
             )
 
 
-class ChatRegenerateAPIView(APIView):
+class ChatRegenerateAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
@@ -400,19 +785,29 @@ class ChatRegenerateAPIView(APIView):
             401: OpenApiResponse(description="인증되지 않은 사용자"),
             403: OpenApiResponse(description="접근 권한이 없음"),
             404: OpenApiResponse(description="존재하지 않는 채팅방 또는 메시지가 없음"),
+            429: OpenApiResponse(
+                description="사용자 동시 요청 한도 초과 (Retry-After)"
+            ),
+            503: OpenApiResponse(
+                description="서버 요청 한도 초과 또는 LLM 응답 지연/장애 (Retry-After)"
+            ),
         },
         tags=["rooms/message"],
     )
-    def post(self, request, room_uuid):
-        room = get_object_or_404(Room, uuid=room_uuid)
+    async def post(self, request, room_uuid):
+        room = await aget_object_or_404(
+            Room.objects.select_related("character"), uuid=room_uuid
+        )
 
-        if room.user != request.user:
+        if room.user_id != request.user.pk:
             return Response(
                 {"error": "해당 채팅방에 대한 접근 권한이 없습니다."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        last_message = Chat.objects.filter(room=room).order_by("-created_at").first()
+        last_message = (
+            await Chat.objects.filter(room=room).order_by("-created_at").afirst()
+        )
 
         if not last_message:
             return Response(
@@ -427,7 +822,9 @@ class ChatRegenerateAPIView(APIView):
             )
 
         last_user_message = (
-            Chat.objects.filter(room=room, role="user").order_by("-created_at").first()
+            await Chat.objects.filter(room=room, role="user")
+            .order_by("-created_at")
+            .afirst()
         )
 
         if not last_user_message:
@@ -438,24 +835,34 @@ class ChatRegenerateAPIView(APIView):
 
         chat_service = ChatService()
 
-        ai_response = chat_service.get_ai_response(
-            room, last_user_message.content, last_user_message
-        )
+        try:
+            async with admission.admit(request.user.pk):
+                ai_response = await chat_service.aget_ai_response(
+                    room, last_user_message.content, last_user_message
+                )
+        except AdmissionRejected as e:
+            return admission_rejected_response(e)
+        except LLMUnavailable as e:
+            return llm_unavailable_response(
+                e, "응답을 재생성할 수 없습니다. 잠시 후 다시 시도해주세요."
+            )
 
         if last_message.regeneration_group:
             regeneration_group_id = last_message.regeneration_group
         else:
             regeneration_group_id = uuid.uuid4()
             last_message.regeneration_group = regeneration_group_id
-            last_message.save()
+            await last_message.asave()
 
-        Chat.objects.filter(regeneration_group=regeneration_group_id).update(
-            is_main=False
-        )
+        await Chat.objects.filter(
+            room=room, regeneration_group=regeneration_group_id
+        ).aupdate(is_main=False)
 
-        ai_chat_obj = chat_service.save_chat(room, ai_response, "ai")
+        ai_chat_obj = await chat_service.asave_chat(room, ai_response, "ai")
         ai_chat_obj.regeneration_group = regeneration_group_id
-        ai_chat_obj.save()
+        await ai_chat_obj.asave()
+        await window_cache.ainvalidate(room.pk)
+        chat_service.schedule_suggestion_prefetch(request, room)
 
         response_data = {
             "room_id": room.uuid,
@@ -671,27 +1078,43 @@ class HistoryDetailAPIView(APIView):
                 status=status.HTTP_409_CONFLICT,
             )
 
-        deleted_count = Chat.objects.filter(room=room).count()
-        Chat.objects.filter(room=room).delete()
-
-        loaded_chats = []
-        for chat_data in conversation_history.chat_history:
-            chat = Chat.objects.create(
-                room=room,
-                content=chat_data["content"],
-                role=chat_data["role"],
-                is_main=chat_data.get("is_main", True),
-                regeneration_group=chat_data.get("regeneration_group", None),
-                created_at=chat_data["timestamp"],
-            )
-            loaded_chats.append(chat)
+        deleted_count, loaded_count = load_history(
+            room, conversation_history.chat_history
+        )
+        window_cache.invalidate(room.pk)
+        suggestion_cache.invalidate(room.pk)
 
         return Response(
             {
                 "message": "대화 내역 불러오기 완료.",
                 "deleted_count": deleted_count,
-                "loaded_count": len(loaded_chats),
+                "loaded_count": loaded_count,
                 "history_title": conversation_history.title,
             },
             status=status.HTTP_200_OK,
         )
+
+
+class LLMMetricsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="LLM 호출 메트릭 조회",
+        description=(
+            "이 워커 프로세스에서 집계한 LLM 호출 메트릭(소요 시간, 첫 토큰 시간, 입출력 토큰 수, "
+            "대화 내역 길이, 시스템 프롬프트 크기, 결과)을 Prometheus 텍스트 형식으로 반환합니다. "
+            "관리자만 조회할 수 있습니다."
+        ),
+        responses={
+            200: OpenApiResponse(
+                description="text/plain (Prometheus exposition format)"
+            ),
+            401: OpenApiResponse(description="인증되지 않은 사용자"),
+            403: OpenApiResponse(description="관리자가 아님"),
+        },
+        tags=["rooms/metrics"],
+    )
+    def get(self, request):
+        return HttpResponse(
+            metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )